@@ -0,0 +1,172 @@
+# analytics/adjoint.py
+
+import numpy as np
+from pricers.cds_pricer import CDSPricer
+from pricers.index_cds_pricer import IndexCDSPricer
+from pricers.trs_pricer import TRSPricer
+from pricers.curves import HazardCurve
+
+
+def _interp_weights(nodes, t):
+    """
+    Linear interpolation (and extrapolation, as interp1d) weights: the value
+    at t is (1 - w) * y[idx] + w * y[idx + 1].
+    """
+    idx = np.clip(np.searchsorted(nodes, t, side="right") - 1, 0, len(nodes) - 2)
+    w = (t - nodes[idx]) / (nodes[idx + 1] - nodes[idx])
+    return idx, w
+
+
+def _scatter(idx, w, adjoint, size):
+    """Transpose of the interpolation: pushes adjoints at times back onto the nodes."""
+    return (np.bincount(idx, weights=(1 - w) * adjoint, minlength=size)
+            + np.bincount(idx + 1, weights=w * adjoint, minlength=size))
+
+
+def _leg_terms(pricer):
+    """
+    Writes the pricer's PV as
+        sum_a alpha_a * DF(u_a) * S(v_a) + sum_b beta_b * DF(w_b) + constant
+    using the same schedules as the pricer.
+
+    Returns: (alpha, u, v), (beta, w), constant
+    """
+    schedule = pricer._schedule()
+    maturity = schedule.maturity
+    pay = schedule.payment_times
+    accruals = schedule.accruals
+    grid = np.linspace(0, maturity, 100)
+    mid = (grid[:-1] + grid[1:]) / 2
+
+    if isinstance(pricer, TRSPricer):
+        n = pricer.notional
+        alpha = np.concatenate([n * pricer.coupon_rate * accruals, [n * (1 - pricer.recovery_rate)]])
+        u = np.append(pay, maturity)
+        beta = np.concatenate([-n * (pricer.financing_rate + pricer.spread) * accruals,
+                               [n * pricer.recovery_rate]])
+        w = np.append(pay, maturity)
+        return (alpha, u, u), (beta, w), 0.0
+
+    if isinstance(pricer, IndexCDSPricer):
+        if pricer.constituent_hazard_curves is not None:
+            raise ValueError("node sensitivities support the homogeneous IndexCDSPricer only")
+        scaling = (pricer.num_names - pricer.defaults) / pricer.num_names
+        constant = -pricer._accrued_losses()
+    elif isinstance(pricer, CDSPricer):
+        scaling = 1.0
+        constant = 0.0
+    else:
+        raise TypeError(f"node sensitivities are not available for {type(pricer).__name__}")
+
+    premium = pricer.notional * pricer.spread * accruals * scaling
+    protection = pricer.notional * (1 - pricer.recovery_rate) * scaling
+    alpha = np.concatenate([-premium, np.full(len(mid), protection), np.full(len(mid), -protection)])
+    u = np.concatenate([pay, mid, mid])
+    v = np.concatenate([pay, grid[:-1], grid[1:]])
+    return (alpha, u, v), (np.zeros(0), np.zeros(0)), constant
+
+
+def _hazard_adjoint(grid, hazards, t, adjoint):
+    """
+    Reverse pass through the cumulative hazard H(t) of a hazard curve that
+    is linear between `grid` nodes (flat beyond the last one): given dPV/dH
+    at times t, returns dPV/dh at the grid nodes in O(len(t) + len(grid)).
+    """
+    n = len(grid)
+    seg = np.clip(np.searchsorted(grid, t, side="right") - 1, 0, n - 1)
+    dt = t - grid[seg]
+    width = np.append(np.diff(grid), np.inf)
+    inside = seg < n - 1
+
+    # Within the segment: H = C_k + h_k * (dt - dt^2 / 2w) + h_{k+1} * dt^2 / 2w (flat: h_k * dt)
+    right = np.where(inside, dt**2 / (2 * width[seg]), 0.0)
+    grad = np.bincount(seg, weights=adjoint * (dt - right), minlength=n)
+    grad += np.bincount(np.minimum(seg + 1, n - 1), weights=adjoint * right, minlength=n)
+
+    # C_k = sum over earlier segments i < k of w_i * (h_i + h_{i+1}) / 2
+    node_adjoint = np.bincount(seg, weights=adjoint, minlength=n)
+    later = np.cumsum(node_adjoint[::-1])[::-1]
+    segment_adjoint = later[1:] * np.diff(grid) / 2
+    grad[:-1] += segment_adjoint
+    grad[1:] += segment_adjoint
+    return grad
+
+
+def node_sensitivities(pricer, discount_curve, hazard_rate_curve, discount_tenors=None, hazard_tenors=None):
+    """
+    Gradient of PV with respect to every discount and hazard curve node in
+    one forward and one backward pass (reverse-mode / adjoint), so the cost
+    does not grow with the number of buckets.
+
+    Both curves are represented by their values at the node tenors with
+    linear interpolation and extrapolation (as interp1d / Curve). Tenors
+    default to the curve's own knots (`.x`); for other callables pass them
+    explicitly and the curve is sampled there. An unbumped bootstrapped
+    HazardCurve keeps its piecewise-constant shape, and CS01 is per bucket
+    rate, keyed by the bucket's end tenor.
+
+    Returns: dict with
+    - pv: PV under the node representation
+    - IR01: {tenor: PV change for +1bp on that node's zero rate}
+    - CS01: {tenor: PV change for +1bp on that node's hazard rate}
+    - dPV_dDF, dPV_dh: raw gradients with respect to the node values
+    """
+    dc_nodes = np.asarray(getattr(discount_curve, "x", None) if discount_tenors is None else discount_tenors, dtype=float)
+    hc_nodes = np.asarray(getattr(hazard_rate_curve, "x", None) if hazard_tenors is None else hazard_tenors, dtype=float)
+    if dc_nodes.ndim == 0 or hc_nodes.ndim == 0:
+        raise ValueError("pass discount_tenors / hazard_tenors for curves without knots")
+    dc_values = np.asarray(discount_curve(dc_nodes), dtype=float)
+    hc_values = np.asarray(hazard_rate_curve(hc_nodes), dtype=float)
+
+    (alpha, u, v), (beta, w), constant = _leg_terms(pricer)
+
+    step = (isinstance(hazard_rate_curve, HazardCurve) and hazard_tenors is None
+            and not hazard_rate_curve.shift and hazard_rate_curve.scale is None)
+    if step:
+        hc_values = hazard_rate_curve.hazard_rates
+    else:
+        # Same hazard grid as the pricer's SurvivalCurve
+        maturity = pricer._schedule().maturity
+        grid = np.linspace(0.0, maturity, 101)
+        grid = np.unique(np.concatenate([grid, hc_nodes[(hc_nodes > 0) & (hc_nodes < maturity)]]))
+        h_idx, h_w = _interp_weights(hc_nodes, grid)
+        hazards = (1 - h_w) * hc_values[h_idx] + h_w * hc_values[h_idx + 1]
+
+    # Forward pass
+    u_idx, u_w = _interp_weights(dc_nodes, u)
+    w_idx, w_w = _interp_weights(dc_nodes, w)
+    df_u = (1 - u_w) * dc_values[u_idx] + u_w * dc_values[u_idx + 1]
+    df_w = (1 - w_w) * dc_values[w_idx] + w_w * dc_values[w_idx + 1]
+
+    if step:
+        # H(v) = sum_k lambda_k * time spent in bucket k before v
+        starts = np.concatenate([[0.0], hc_nodes[:-1]])
+        widths = np.append(np.diff(starts), np.inf)
+        overlap = np.clip(v[:, None] - starts, 0.0, widths)
+        sp_v = np.exp(-(overlap @ hc_values))
+    else:
+        seg = np.clip(np.searchsorted(grid, v, side="right") - 1, 0, len(grid) - 1)
+        dt = v - grid[seg]
+        slopes = np.append(np.diff(hazards) / np.diff(grid), 0.0)
+        cumulative = np.concatenate([[0.0], np.cumsum(0.5 * (hazards[:-1] + hazards[1:]) * np.diff(grid))])
+        sp_v = np.exp(-(cumulative[seg] + hazards[seg] * dt + 0.5 * slopes[seg] * dt**2))
+
+    pv = np.sum(alpha * df_u * sp_v) + np.sum(beta * df_w) + constant
+
+    # Backward pass
+    df_adjoint = _scatter(u_idx, u_w, alpha * sp_v, len(dc_nodes)) + _scatter(w_idx, w_w, beta, len(dc_nodes))
+    if step:
+        hazard_adjoint = overlap.T @ (-alpha * df_u * sp_v)
+    else:
+        grid_adjoint = _hazard_adjoint(grid, hazards, v, -alpha * df_u * sp_v)
+        hazard_adjoint = _scatter(h_idx, h_w, grid_adjoint, len(hc_nodes))
+
+    ir01 = df_adjoint * (-dc_nodes * dc_values) / 10000
+    cs01 = hazard_adjoint / 10000
+    return {
+        "pv": pv,
+        "IR01": dict(zip(dc_nodes.tolist(), ir01.tolist())),
+        "CS01": dict(zip(hc_nodes.tolist(), cs01.tolist())),
+        "dPV_dDF": df_adjoint,
+        "dPV_dh": hazard_adjoint,
+    }
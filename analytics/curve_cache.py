@@ -0,0 +1,134 @@
+# analytics/curve_cache.py
+
+from collections import OrderedDict
+import hashlib
+import os
+import pickle
+import tempfile
+import numpy as np
+from pricers.curves import Curve
+
+# Part of every fingerprint: bump it whenever the pickled layout of the cached
+# curve classes (Curve, HazardCurve) changes, so stale on-disk entries miss
+# instead of loading as broken objects
+CACHE_VERSION = 1
+
+
+def _canonical(value):
+    """Stable, type-tagged representation of quote inputs for hashing."""
+    if isinstance(value, dict):
+        return ("dict", tuple(sorted((_canonical(k), _canonical(v)) for k, v in value.items())))
+    if isinstance(value, (list, tuple)):
+        return ("seq", tuple(_canonical(v) for v in value))
+    if isinstance(value, Curve):
+        return ("Curve", value.kind, value.extrapolation, float(value.shift),
+                _canonical(value.times), _canonical(value.values))
+    if isinstance(value, np.ndarray):
+        return ("array", value.shape, tuple(float(v) for v in value.ravel()))
+    if isinstance(value, (bool, np.bool_)):
+        return ("bool", bool(value))
+    if isinstance(value, (int, float, np.integer, np.floating)):
+        # 1 and 1.0 are the same tenor / quote
+        return ("num", float(value).hex())
+    if value is None or isinstance(value, str):
+        return (type(value).__name__, value)
+    raise TypeError(f"cannot fingerprint {type(value).__name__}")
+
+
+def fingerprint(*parts):
+    """
+    Hex digest of the quote inputs of a curve build (quotes, recovery,
+    interpolation and solver settings), tagged with CACHE_VERSION. Dict
+    order does not matter, and int and float values that are equal hash the
+    same.
+    """
+    return hashlib.sha256(repr(_canonical((CACHE_VERSION,) + parts)).encode()).hexdigest()
+
+
+class CurveCache:
+    def __init__(self, maxsize=256, directory=None):
+        """
+        Memoizes curve construction on a fingerprint of its inputs.
+
+        The in-memory tier is an LRU that returns the same curve object on
+        every hit, so pricers downstream also hit the leg cache. With a
+        `directory`, curves are also pickled there and survive restarts
+        (e.g. across Streamlit sessions or backtest runs).
+
+        maxsize: int, curves kept in memory (0 disables the memory tier)
+        directory: optional path for the on-disk tier
+        """
+        self.maxsize = maxsize
+        self.directory = directory
+        self.hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+        self._entries = OrderedDict()
+        if directory is not None:
+            os.makedirs(directory, exist_ok=True)
+
+    def _path(self, key):
+        return os.path.join(self.directory, f"{key}.pkl")
+
+    def _remember(self, key, curve):
+        if self.maxsize <= 0:
+            return
+        self._entries[key] = curve
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.maxsize:
+            self._entries.popitem(last=False)
+
+    def get(self, key, build):
+        """
+        Returns the curve stored under `key` (see fingerprint()), calling
+        `build()` on a miss.
+        """
+        curve = self._entries.get(key)
+        if curve is not None:
+            self.hits += 1
+            self._entries.move_to_end(key)
+            return curve
+
+        if self.directory is not None:
+            try:
+                with open(self._path(key), "rb") as f:
+                    curve = pickle.load(f)
+            except (OSError, pickle.UnpicklingError, EOFError, AttributeError):
+                curve = None
+            if curve is not None:
+                self.disk_hits += 1
+                self._remember(key, curve)
+                return curve
+
+        self.misses += 1
+        curve = build()
+        self._remember(key, curve)
+        if self.directory is not None:
+            # Write then rename, so a concurrent reader never sees a partial file
+            fd, tmp = tempfile.mkstemp(dir=self.directory, suffix=".tmp")
+            with os.fdopen(fd, "wb") as f:
+                pickle.dump(curve, f)
+            os.replace(tmp, self._path(key))
+        return curve
+
+    def clear(self, disk=False):
+        """Empties the memory tier (and the on-disk tier if disk=True)."""
+        self._entries.clear()
+        if disk and self.directory is not None:
+            for name in os.listdir(self.directory):
+                if name.endswith(".pkl"):
+                    os.remove(os.path.join(self.directory, name))
+
+    def stats(self):
+        lookups = self.hits + self.disk_hits + self.misses
+        return {
+            "hits": self.hits,
+            "disk_hits": self.disk_hits,
+            "misses": self.misses,
+            "size": len(self._entries),
+            "hit_rate": (self.hits + self.disk_hits) / lookups if lookups else 0.0,
+        }
+
+
+# Shared by the dashboard and the backtester
+CURVE_CACHE = CurveCache()
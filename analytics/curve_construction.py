@@ -1,9 +1,8 @@
 import numpy as np
-import datetime
-from pandas_datareader.data import DataReader
-from scipy.interpolate import interp1d
-from scipy.optimize import minimize_scalar
 from scipy.interpolate import CubicSpline
+from data.fetch import fetch_treasury_curve
+from pricers.curves import Curve, HazardCurve, HazardCurveSet
+from analytics.curve_cache import fingerprint
 
 class DiscountCurveBuilder:
     def __init__(self, instruments = []):
@@ -13,52 +12,12 @@ class DiscountCurveBuilder:
         """
         self.instruments = sorted(instruments)
     
-    def fetch_discount_curve(self):
-        # Treasury yield FRED codes
-        tickers = {
-            '1M': 'DGS1MO',
-            '3M': 'DGS3MO',
-            '6M': 'DGS6MO',
-            '1Y': 'DGS1',
-            '2Y': 'DGS2',
-            '3Y': 'DGS3',
-            '5Y': 'DGS5',
-            '7Y': 'DGS7',
-            '10Y': 'DGS10',
-            '20Y': 'DGS20',
-            '30Y': 'DGS30'
-        }
-
-        tenor_years = {
-            '1M': 1 / 12,
-            '3M': 0.25,
-            '6M': 0.5,
-            '1Y': 1,
-            '2Y': 2,
-            '3Y': 3,
-            '5Y': 5,
-            '7Y': 7,
-            '10Y': 10,
-            '20Y': 20,
-            '30Y': 30
-        }
-
-        # Fetch latest yield data
-        end = datetime.datetime.today()
-        start = end - datetime.timedelta(days=7)
-
-        data = []
-        for label, fred_code in tickers.items():
-            try:
-                df = DataReader(fred_code, 'fred', start, end)
-                rate = df.ffill().iloc[-1, 0] / 100  # Convert to decimal
-                time = tenor_years[label]
-                discount = np.exp(-rate * time)
-                data.append({time, discount})
-            except Exception as e:
-                print(f"Warning: Could not fetch {label}: {e}")
-
-        return data
+    def fetch_discount_curve(self, fetcher=None):
+        """
+        Latest Treasury yields from FRED as (tenor, rate) instruments, fetched
+        concurrently through the data_store cache (see data.fetch).
+        """
+        return fetch_treasury_curve(fetcher)
 
     def build_curve(self):
         dfs = {}
@@ -67,84 +26,201 @@ class DiscountCurveBuilder:
         for t, r in self.instruments:
             df = 1 / (1 + r * t)  # simple discount factor from zero rate
             dfs[t] = df
-        return interp1d(list(dfs.keys()), list(dfs.values()), kind='linear', fill_value='extrapolate')
+        return Curve(list(dfs.keys()), list(dfs.values()), kind="discount")
 
 
 class HazardCurveBuilder:
-    def __init__(self, cds_spreads, discount_curve, recovery_rate=0.4):
+    def __init__(self, cds_spreads, discount_curve, recovery_rate=0.4, payment_frequency=0.25):
         """
         cds_spreads: list of tuples (tenor in years, spread in bps)
         discount_curve: callable discount curve (e.g., from DiscountCurveBuilder)
         recovery_rate: assumed recovery
+        payment_frequency: premium frequency of the quoted CDS (0.25 = quarterly)
         """
         self.cds_spreads = sorted(cds_spreads)
         self.discount_curve = discount_curve
         self.recovery_rate = recovery_rate
+        self.payment_frequency = payment_frequency
 
-    def _cds_pv(self, hazard_rate, maturity, spread):
+    def build_curve(self, tol=1e-8, max_iter=50):
         """
-        Calculate PV of CDS with flat hazard rate (used for bootstrapping).
+        Bootstraps a piecewise-constant hazard curve (see bootstrap_hazard_rates).
+        Iteration counts and residuals are stored in the curve's `diagnostics`.
         """
-        times = np.linspace(0, maturity, 100)
-        survival_probs = np.exp(-hazard_rate * times)
-        dt = maturity / 100
-
-        # Premium leg
-        premium = 0
-        for t in np.arange(0.25, maturity + 0.01, 0.25):
-            df = self.discount_curve(t)
-            sp = np.exp(-hazard_rate * t)
-            premium += df * sp * 0.25
-        premium *= spread / 10000
-
-        # Protection leg
-        prot = 0
-        for i in range(1, len(times)):
-            t0, t1 = times[i - 1], times[i]
-            sp0, sp1 = survival_probs[i - 1], survival_probs[i]
-            default_prob = sp0 - sp1
-            df = self.discount_curve((t0 + t1) / 2)
-            prot += df * default_prob
-        prot *= (1 - self.recovery_rate)
-
-        return prot - premium
-
-    def build_curve(self):
-        hazard_curve = {}
-        last_rate = 0.01  # Starting guess
-
-        for tenor, spread in self.cds_spreads:
-            def objective(h):
-                return abs(self._cds_pv(h, tenor, spread))
+        tenors = [tenor for tenor, _ in self.cds_spreads]
+        spreads = [spread for _, spread in self.cds_spreads]
+        return _bootstrapped_curve(tenors, spreads, self.discount_curve, self.recovery_rate,
+                                   self.payment_frequency, tol, max_iter)
 
-            res = minimize_scalar(objective, bounds=(0.0001, 0.5), method='bounded')
-            last_rate = res.x
-            hazard_curve[tenor] = last_rate
-
-        return interp1d(list(hazard_curve.keys()), list(hazard_curve.values()), kind='linear', fill_value='extrapolate')
-
-def build_discount_curve_from_yields(yield_curve: dict):
+def build_discount_curve_from_yields(yield_curve: dict, cache=None):
     """
     Build a discount factor curve from Treasury yields.
 
     Parameters:
         yield_curve (dict): {tenor_years: yield (as decimal)}
             Example: {1: 0.05, 2: 0.052, 5: 0.055}
+        cache (CurveCache): optional; identical yields return the cached curve
 
     Returns:
-        Callable: function t -> DF(t), using linear interpolation
+        Curve: function t -> DF(t), using linear interpolation
     """
+    if cache is not None:
+        key = fingerprint("discount_from_yields", yield_curve)
+        return cache.get(key, lambda: build_discount_curve_from_yields(yield_curve))
+
     tenors = np.array(sorted(yield_curve.keys()))
     yields = np.array([yield_curve[t] for t in tenors])
 
     # Convert yields to discount factors: DF(t) = exp(-y * t)
     discounts = np.exp(-yields * tenors)
 
-    return interp1d(tenors, discounts, kind="linear", fill_value="extrapolate")
+    return Curve(tenors, discounts, kind="discount")
+
+
 
+def bootstrap_hazard_rates(tenors, spreads, discount_curve, recovery_rates=0.4,
+                           payment_frequency=0.25, tol=1e-8, max_iter=50):
+    """
+    Sequential piecewise-constant hazard bootstrap.
+
+    Tenor by tenor, solves the hazard rate of the bucket (T_{k-1}, T_k] so a
+    CDS at the quoted spread prices at par, holding the earlier buckets at
+    their solved values. Legs use the CDSPricer conventions (premium every
+    `payment_frequency`, 100-step protection grid), so the resulting curve
+    reprices the quotes. Each root is found with Newton on the analytic
+    derivative, falling back to bisection whenever a step would leave the
+    current bracket. Rows of `spreads` are solved together.
+
+    Parameters:
+    - tenors: increasing tenors in years, shape (K,)
+    - spreads: spreads in bps, shape (K,) or (names, K)
+    - discount_curve: callable t -> DF(t); it may also return one row of
+      DFs per name, shape (names, len(t)), to solve each row on its own curve
+    - recovery_rates: float or per-name array
+    - payment_frequency: float
+    - tol: float, tolerance on the repriced spread error (bps)
+    - max_iter: int, iterations allowed per tenor
+
+    Returns: (hazard_rates, iterations, residuals), each shaped like `spreads`;
+    residuals are the repriced-minus-quoted spreads in bps.
+    """
+    tenors = np.asarray(tenors, dtype=float)
+    spreads = np.asarray(spreads, dtype=float)
+    single = spreads.ndim == 1
+    quotes = np.atleast_2d(spreads) / 10000
+    names = quotes.shape[0]
+    loss = np.broadcast_to(1 - np.asarray(recovery_rates, dtype=float), (names,))
+
+    starts = np.concatenate([[0.0], tenors[:-1]])
+    rates = np.zeros(quotes.shape)
+    iterations = np.zeros(quotes.shape, dtype=int)
+    residuals = np.zeros(quotes.shape)
+    for k, tenor in enumerate(tenors):
+        pay = np.arange(payment_frequency, tenor + 1e-6, payment_frequency)
+        grid = np.linspace(0, tenor, 100)
+        df_pay = np.asarray(discount_curve(pay), dtype=float) * payment_frequency
+        df_mid = np.asarray(discount_curve((grid[:-1] + grid[1:]) / 2), dtype=float)
+        # Shared curve: matrix-vector products; one curve per row: row-wise dot products
+        dot = np.matmul if df_pay.ndim == 1 else (lambda a, b: np.einsum("ij,ij->i", a, b))
+
+        def split(times):
+            # Hazard from solved buckets, and time spent in the bucket being solved
+            overlap = np.clip(times[:, None] - starts[:k], 0.0, tenors[:k] - starts[:k])
+            return rates[:, :k] @ overlap.T, np.maximum(times - starts[k], 0.0)
+
+        known_pay, exposure_pay = split(pay)
+        known_grid, exposure_grid = split(grid)
+        quote = quotes[:, k]
+
+        # Credit-triangle starting point, bracketed in [0, hi]
+        lam = quote / loss
+        lo = np.zeros(names)
+        hi = np.full(names, 5.0)
+        active = np.ones(names, dtype=bool)
+        for iteration in range(max_iter + 1):
+            sp_pay = np.exp(-(known_pay + lam[:, None] * exposure_pay))
+            sp_grid = np.exp(-(known_grid + lam[:, None] * exposure_grid))
+            rpv01 = dot(sp_pay, df_pay)
+            protection = dot(sp_grid[:, :-1] - sp_grid[:, 1:], df_mid)
+            value = loss * protection - quote * rpv01
+            residual = value / rpv01 * 10000
+
+            active &= np.abs(residual) >= tol
+            if not active.any() or iteration == max_iter:
+                break
+            iterations[active, k] += 1
+
+            d_sp_grid = -exposure_grid * sp_grid
+            slope = (loss * dot(d_sp_grid[:, :-1] - d_sp_grid[:, 1:], df_mid)
+                     + quote * dot(exposure_pay * sp_pay, df_pay))
+            lo = np.where(value < 0, lam, lo)
+            hi = np.where(value > 0, lam, hi)
+            with np.errstate(divide="ignore", invalid="ignore"):
+                newton = lam - value / slope
+            step = np.where((newton > lo) & (newton < hi), newton, 0.5 * (lo + hi))
+            lam = np.where(active, step, lam)
+
+        rates[:, k] = lam
+        residuals[:, k] = residual
+
+    if single:
+        return rates[0], iterations[0], residuals[0]
+    return rates, iterations, residuals
+
+
+def _bootstrapped_curve(tenors, spreads, discount_curve, recovery_rate, payment_frequency, tol, max_iter):
+    rates, iterations, residuals = bootstrap_hazard_rates(tenors, spreads, discount_curve, recovery_rate,
+                                                          payment_frequency, tol, max_iter)
+    curve = HazardCurve(tenors, rates)
+    curve.diagnostics = {
+        "iterations": dict(zip(tenors, iterations.tolist())),
+        "residuals": dict(zip(tenors, residuals.tolist())),
+        "converged": bool(np.all(np.abs(residuals) < tol)),
+    }
+    return curve
+
+
+def build_hazard_curve_set(spreads, tenors, discount_curve: callable, names=None, recovery_rates=0.4,
+                           payment_frequency: float = 0.25, tol: float = 1e-8, max_iter: int = 50):
+    """
+    Bootstrap hazard curves for many reference entities at once.
+
+    All names are solved together, tenor by tenor, with the vectorized
+    bootstrap of bootstrap_hazard_rates, so the cost is a handful of
+    (names x time) array evaluations per tenor instead of one root search per
+    name and tenor.
 
+    Parameters:
+        spreads (array): spread matrix in bps, shape (names, tenors)
+        tenors (array): increasing tenors in years, one per column
+        discount_curve (Callable): function t -> discount factor, shared by every name
+        names (list): reference entity identifiers, one per row (default: 0..n-1)
+        recovery_rates (float or array): assumed recovery, per name or shared
+        payment_frequency (float): premium frequency of the quoted CDS
+        tol (float): tolerance on the repriced spread error (bps)
+        max_iter (int): iterations allowed per tenor
 
-def build_hazard_curve_from_spreads(spread_curve: dict, discount_curve: callable, recovery_rate: float = 0.4):
+    Returns:
+        HazardCurveSet: curves indexable by name; `diagnostics` holds the
+        (names x tenors) iteration counts and residuals and a per-name
+        converged flag
+    """
+    spreads = np.atleast_2d(np.asarray(spreads, dtype=float))
+    names = range(len(spreads)) if names is None else names
+    rates, iterations, residuals = bootstrap_hazard_rates(tenors, spreads, discount_curve, recovery_rates,
+                                                          payment_frequency, tol, max_iter)
+    curves = HazardCurveSet(names, tenors, rates)
+    curves.diagnostics = {
+        "iterations": iterations,
+        "residuals": residuals,
+        "converged": np.all(np.abs(residuals) < tol, axis=1),
+    }
+    return curves
+
+
+def build_hazard_curve_from_spreads(spread_curve: dict, discount_curve: callable, recovery_rate: float = 0.4,
+                                    payment_frequency: float = 0.25, tol: float = 1e-8, max_iter: int = 50,
+                                    cache=None):
     """
     Build a hazard rate curve by bootstrapping from CDS spreads.
 
@@ -152,49 +228,23 @@ def build_hazard_curve_from_spreads(spread_curve: dict, discount_curve: callable
         spread_curve (dict): {tenor_years: spread in bps}
         discount_curve (Callable): function t -> discount factor
         recovery_rate (float): assumed recovery rate
+        payment_frequency (float): premium frequency of the quoted CDS
+        tol (float): tolerance on the repriced spread error (bps)
+        max_iter (int): iterations allowed per tenor
+        cache (CurveCache): optional; identical spreads, discount curve nodes,
+            recovery and settings return the cached curve. Only used when the
+            discount curve is a Curve (other callables cannot be fingerprinted).
 
     Returns:
-        Callable: hazard_rate(t)
+        HazardCurve: piecewise-constant hazard_rate(t); iteration counts and
+        residuals per tenor are in its `diagnostics`
     """
-    def cds_pv(hazard_rate, maturity, spread):
-        times = np.linspace(0, maturity, 100)
-        survival_probs = np.exp(-hazard_rate * times)
-        dt = maturity / 100
-
-        # Premium leg
-        premium_leg = 0
-        for t in np.arange(0.25, maturity + 0.01, 0.25):
-            df = discount_curve(t)
-            sp = np.exp(-hazard_rate * t)
-            premium_leg += df * sp * 0.25
-        premium_leg *= spread / 10_000
-
-        # Protection leg
-        protection_leg = 0
-        for i in range(1, len(times)):
-            t0, t1 = times[i - 1], times[i]
-            sp0, sp1 = survival_probs[i - 1], survival_probs[i]
-            default_prob = sp0 - sp1
-            df = discount_curve((t0 + t1) / 2)
-            protection_leg += df * default_prob
-        protection_leg *= (1 - recovery_rate)
-
-        return protection_leg - premium_leg
-
-    hazard_curve = {}
-    for tenor in sorted(spread_curve.keys()):
-        spread = spread_curve[tenor]
-
-        result = minimize_scalar(
-            lambda h: abs(cds_pv(h, tenor, spread)),
-            bounds=(0.0001, 0.5),
-            method="bounded"
-        )
-        hazard_curve[tenor] = result.x
-
-    return interp1d(
-        list(hazard_curve.keys()),
-        list(hazard_curve.values()),
-        kind="linear",
-        fill_value="extrapolate"
-    )
\ No newline at end of file
+    if cache is not None and isinstance(discount_curve, Curve):
+        key = fingerprint("hazard_from_spreads", spread_curve, discount_curve, recovery_rate,
+                          payment_frequency, tol, max_iter)
+        return cache.get(key, lambda: build_hazard_curve_from_spreads(
+            spread_curve, discount_curve, recovery_rate, payment_frequency, tol, max_iter))
+
+    tenors = sorted(spread_curve.keys())
+    return _bootstrapped_curve(tenors, [spread_curve[t] for t in tenors], discount_curve, recovery_rate,
+                               payment_frequency, tol, max_iter)
@@ -0,0 +1,217 @@
+# analytics/factor_model.py
+
+import numpy as np
+import pandas as pd
+from analytics.delta_gamma_var import DeltaGammaVaR
+from analytics.historical_var import historical_moves
+
+FACTOR_NAMES = ("level", "slope", "curvature")
+
+
+class PCAFactorModel:
+    def __init__(self, tenors, n_factors=3, decay=1.0):
+        """
+        Principal-component factors of daily curve moves.
+
+        The model keeps the running (optionally exponentially weighted)
+        sums of the moves and of their outer products, so appending a day is
+        an O(tenors^2) update followed by the eigendecomposition of the small
+        (tenors x tenors) covariance: no pass over the history. The top
+        `n_factors` eigenvectors are the loadings; for curves the first three
+        are the usual level, slope and curvature. Each loading is signed so
+        that its largest entry is positive.
+
+        Several curves on the same tenor grid (e.g. one per issuer) can be
+        fitted together: their moves are pooled into one covariance, giving
+        factors shared by all of them.
+
+        Parameters:
+        - tenors: tenor grid of the curves
+        - n_factors: number of factors kept
+        - decay: weight of each older day relative to the next (1.0 weighs
+          the whole history equally)
+        """
+        self.tenors = np.asarray(tenors, dtype=float)
+        self.n_factors = n_factors
+        self.decay = decay
+        self.last = None
+        self._weight = 0.0
+        self._sum = np.zeros(len(self.tenors))
+        self._outer = np.zeros((len(self.tenors), len(self.tenors)))
+
+    @property
+    def factor_names(self):
+        return list(FACTOR_NAMES[:self.n_factors]) + [f"pc{i + 1}" for i in range(len(FACTOR_NAMES), self.n_factors)]
+
+    def _accumulate(self, moves, weights):
+        # moves: (dates x curves x tenors), weights: one per date
+        rows = moves.reshape(len(moves), -1, len(self.tenors))
+        self._weight += float(weights.sum()) * rows.shape[1]
+        self._sum += np.einsum("d,dct->t", weights, rows)
+        self._outer += np.einsum("d,dcs,dct->st", weights, rows, rows)
+
+    def _refit(self):
+        mean = self._sum / self._weight
+        covariance = self._outer / self._weight - np.outer(mean, mean)
+        eigenvalues, eigenvectors = np.linalg.eigh(covariance)
+        order = np.argsort(eigenvalues)[::-1]
+        eigenvalues, eigenvectors = np.clip(eigenvalues[order], 0.0, None), eigenvectors[:, order]
+        largest = eigenvectors[np.argmax(np.abs(eigenvectors), axis=0), np.arange(len(order))]
+        eigenvectors = eigenvectors * np.where(largest < 0, -1.0, 1.0)
+
+        self.covariance = covariance
+        self.loadings = eigenvectors[:, :self.n_factors]
+        self.variances = eigenvalues[:self.n_factors]
+        self.explained_variance_ratio = self.variances / max(eigenvalues.sum(), np.finfo(float).tiny)
+
+    def fit(self, levels):
+        """
+        Fits the factors to a curve history: (dates x tenors), or (dates x
+        curves x tenors) for pooled curves.
+        """
+        levels = np.asarray(levels, dtype=float)
+        if len(levels) < 3:
+            raise ValueError("need at least three dates of history")
+        moves = historical_moves(levels)
+        self._weight = 0.0
+        self._sum[:] = 0.0
+        self._outer[:] = 0.0
+        self._accumulate(moves, self.decay ** np.arange(len(moves))[::-1])
+        self.last = levels[-1].copy()
+        self._refit()
+        return self
+
+    def append(self, level):
+        """
+        Adds one date's curve levels (same shape as one date of the fitted
+        history) and refits incrementally.
+
+        Returns: the new day's move
+        """
+        level = np.asarray(level, dtype=float)
+        move = level - self.last
+        self._weight *= self.decay
+        self._sum *= self.decay
+        self._outer *= self.decay
+        self._accumulate(move[None], np.ones(1))
+        self.last = level.copy()
+        self._refit()
+        return move
+
+    def scores(self, moves):
+        """Factor scores of curve moves (... x tenors) -> (... x factors)."""
+        return np.asarray(moves, dtype=float) @ self.loadings
+
+    def exposures(self, ladder):
+        """Factor exposures of tenor sensitivities (... x tenors) -> (... x factors)."""
+        return np.asarray(ladder, dtype=float) @ self.loadings
+
+    def key_rate_shifts(self, scores, unit=1.0):
+        """
+        The curve move of a set of factor scores as {tenor: move * unit},
+        e.g. ScenarioEngine key-rate shifts (unit=1e-4 for a model fitted on
+        yields in bps).
+        """
+        return dict(zip(self.tenors.tolist(), (unit * (self.loadings @ np.asarray(scores, dtype=float))).tolist()))
+
+
+class FactorVaR(DeltaGammaVaR):
+    def __init__(self, positions, market_data, n_factors=3, decay=1.0, **kwargs):
+        """
+        Delta-gamma VaR in factor space.
+
+        One PCAFactorModel is fitted on the yield history (in bps) and one
+        on the CDS spread histories of all the positions' issuers, pooled (in
+        bps), so every issuer shares the same credit factors. The bucket
+        ladders of DeltaGammaVaR are projected onto the loadings once: each
+        position is left with n_factors rates exposures and n_factors credit
+        exposures to its own issuer's factors, plus the matching diagonal
+        gammas. Scenario bucket shocks are projected onto the same loadings,
+        and scenario PnL is a product of (scenarios x factors) scores with
+        (factors x positions) exposures.
+
+        append_day() refits both models incrementally and adds the day's
+        move to the scenario set; the base market and the ladders stay at
+        the as-of date.
+
+        Parameters are those of DeltaGammaVaR, plus:
+        - n_factors: factors per curve family
+        - decay: PCAFactorModel day weighting
+        """
+        super().__init__(positions, market_data, **kwargs)
+        self.n_factors = n_factors
+        self.decay = decay
+        self.rates_model = None
+        self.credit_model = None
+        self._appended_dates = []
+        self._appended_shocks = []
+
+    def factor_models(self):
+        """(rates PCAFactorModel, credit PCAFactorModel), fitted on first use."""
+        if self.rates_model is None:
+            yields, spreads = self._histories()
+            self.rates_model = PCAFactorModel(self.market_data.yield_tenors, self.n_factors, self.decay).fit(10000 * yields)
+            self.credit_model = PCAFactorModel(self.market_data.spread_tenors, self.n_factors, self.decay).fit(spreads)
+        return self.rates_model, self.credit_model
+
+    def _projection(self):
+        """(buckets x factor buckets) block-diagonal loadings: rates, then one credit block per issuer."""
+        rates, credit = self.factor_models()
+        issuers = len(self._issuer_names)
+        return np.block([
+            [rates.loadings, np.zeros((len(rates.tenors), issuers * self.n_factors))],
+            [np.zeros((issuers * len(credit.tenors), self.n_factors)), np.kron(np.eye(issuers), credit.loadings)],
+        ])
+
+    def _expansion(self, yield_shocks, spread_shocks):
+        self.ladders()
+        delta, gamma = self._ladders
+        projection = self._projection()
+        scores = self.shocks(yield_shocks, spread_shocks) @ projection
+        return scores, projection.T @ delta, (projection ** 2).T @ gamma
+
+    def exposures(self):
+        """
+        Factor exposures per position (PV change per unit factor score):
+        the rates factors, then the factors of the position's own issuer.
+
+        Returns: DataFrame (positions x factors)
+        """
+        self.ladders()
+        rates, _ = self.factor_models()
+        delta = self._projection().T @ self._ladders[0]
+        k = self.n_factors
+        credit = delta[k:].reshape(len(self._issuer_names), k, -1)[self._issuer_rows, :, np.arange(len(self.positions))]
+        columns = pd.MultiIndex.from_tuples([(risk, name) for risk in ("IR", "CS") for name in rates.factor_names],
+                                            names=["risk", "factor"])
+        return pd.DataFrame(np.hstack([delta[:k].T, credit]), index=self.names, columns=columns)
+
+    def shocks(self, yield_shocks=None, spread_shocks=None):
+        x = super().shocks(yield_shocks, spread_shocks)
+        if yield_shocks is None and spread_shocks is None and self._appended_shocks:
+            x = np.vstack([x] + self._appended_shocks)
+        return x
+
+    def _scenario_index(self, scenarios, default):
+        if default:
+            return self.scenario_dates.append(pd.DatetimeIndex(self._appended_dates, name="date"))
+        return super()._scenario_index(scenarios, default)
+
+    def append_day(self, date, yields, spreads):
+        """
+        Appends one date of quotes: yields (yield tenors, decimal) and
+        spreads (issuers x spread tenors, bps, issuers in the order the
+        positions first reference them). Both factor models are refitted
+        incrementally and the day's move joins the historical scenarios.
+        """
+        rates, credit = self.factor_models()
+        base_yields, base_spreads = (quotes[0] for quotes in self.scenario_quotes())
+        spreads = np.asarray(spreads, dtype=float).reshape(base_spreads.shape)
+        previous = credit.last
+        yield_move = rates.append(10000 * np.asarray(yields, dtype=float))
+        spread_move = credit.append(spreads)
+        if self.spread_moves == "relative":
+            spread_move = base_spreads * (spreads / previous - 1)
+        spread_shock = np.maximum(base_spreads + spread_move, 0.01) - base_spreads
+        self._appended_dates.append(np.datetime64(date, "D"))
+        self._appended_shocks.append(np.concatenate([yield_move, spread_shock.ravel()])[None])
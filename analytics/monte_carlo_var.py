@@ -0,0 +1,373 @@
+# analytics/monte_carlo_var.py
+
+from copy import deepcopy
+import numpy as np
+import pandas as pd
+from analytics.historical_var import (HistoricalVaR, ScenarioMarket, bucket_overlap, build_scenario_market,
+                                      historical_moves, revalue)
+from pricers.curves import ShiftedHazardCurve, SurvivalCurve
+from pricers.leg_cache import leg_times, legs_from_samples
+
+
+class StreamingQuantile:
+    def __init__(self, compression=1000):
+        """
+        Constant-memory quantile and tail-mean estimator (a merging t-digest).
+
+        Values are kept as (mean, weight) centroids. After every update the
+        centroids are regrouped on the scale k(q) = compression / (2 pi) *
+        asin(2q - 1): a centroid covers about one unit of k, so there are at
+        most compression / 2 of them, and they are narrow in the tails where
+        VaR and ES are read. Digests of separate chunks merge exactly like
+        updates, so chunks can be summarized on different workers.
+        """
+        self.compression = compression
+        self.means = np.empty(0)
+        self.weights = np.empty(0)
+        self.count = 0
+        self.min = np.inf
+        self.max = -np.inf
+        self._sum_squares = 0.0
+
+    def _compress(self, means, weights):
+        order = np.argsort(means, kind="stable")
+        means, weights = means[order], weights[order]
+        cumulative = np.cumsum(weights)
+        q = (cumulative - weights / 2) / cumulative[-1]
+        # k rises monotonically with q, so each group is a run of neighbouring centroids
+        k = self.compression / (2 * np.pi) * np.arcsin(2 * q - 1) + self.compression / 4
+        group = np.floor(k).astype(np.int64)
+        totals = np.bincount(group, weights)
+        keep = totals > 0
+        self.means = np.bincount(group, weights * means)[keep] / totals[keep]
+        self.weights = totals[keep]
+
+    def update(self, values):
+        """Adds an array of observations."""
+        values = np.asarray(values, dtype=float).ravel()
+        if not len(values):
+            return
+        self.count += len(values)
+        self.min = min(self.min, float(values.min()))
+        self.max = max(self.max, float(values.max()))
+        self._sum_squares += float(values @ values)
+        self._compress(np.concatenate([self.means, values]), np.concatenate([self.weights, np.ones(len(values))]))
+
+    def merge(self, other):
+        """Adds the observations summarized by another StreamingQuantile."""
+        if not other.count:
+            return
+        self.count += other.count
+        self.min = min(self.min, other.min)
+        self.max = max(self.max, other.max)
+        self._sum_squares += other._sum_squares
+        self._compress(np.concatenate([self.means, other.means]), np.concatenate([self.weights, other.weights]))
+
+    def quantile(self, q):
+        """Estimated q-quantile, linear between centroid midpoints."""
+        cumulative = np.cumsum(self.weights)
+        mids = (cumulative - self.weights / 2) / self.count
+        return float(np.interp(q, np.concatenate([[0.0], mids, [1.0]]),
+                               np.concatenate([[self.min], self.means, [self.max]])))
+
+    def tail_mean(self, q):
+        """Estimated mean of the lowest fraction q of the observations."""
+        mass = q * self.count
+        before = np.cumsum(self.weights) - self.weights
+        taken = np.clip(mass - before, 0.0, self.weights)
+        return float(taken @ self.means / mass)
+
+    def mean(self):
+        return float(self.weights @ self.means / self.count)
+
+    def std(self):
+        return float(np.sqrt(max(self._sum_squares / self.count - self.mean() ** 2, 0.0)))
+
+
+class CurveShockSimulator:
+    def __init__(self, yield_tenors, spread_tenors, base_yields, base_hazard_rates, covariance, seed=0, issuers=None):
+        """
+        Correlated Gaussian shocks to zero yields and bucket hazard rates.
+
+        The state is the zero yield at each yield tenor followed by every
+        issuer's piecewise-constant hazard rates, flattened issuer by
+        issuer. Shocks are z @ loadings.T with z standard normal and
+        loadings from the eigendecomposition of `covariance` (negative
+        eigenvalues from a noisy estimate are dropped), so a singular
+        covariance is fine. Shocked hazard rates are floored at zero.
+
+        Paths are drawn in chunks, each from its own stream spawned from
+        np.random.SeedSequence(seed): results depend only on the seed, the
+        path count and the chunk size, not on which worker runs a chunk or
+        in what order.
+
+        Parameters:
+        - yield_tenors, spread_tenors: tenor grids of the two curve families
+        - base_yields: zero yields at yield_tenors (decimal)
+        - base_hazard_rates: (issuers x spread tenors) hazard rates
+        - covariance: covariance of the state moves over the horizon
+        - seed: root seed
+        - issuers: issuer names, in row order
+        """
+        self.yield_tenors = np.asarray(yield_tenors, dtype=float)
+        self.spread_tenors = np.asarray(spread_tenors, dtype=float)
+        self.base_yields = np.asarray(base_yields, dtype=float)
+        self.base_hazard_rates = np.atleast_2d(np.asarray(base_hazard_rates, dtype=float))
+        self.covariance = np.asarray(covariance, dtype=float)
+        self.seed = seed
+        self.issuers = list(range(len(self.base_hazard_rates))) if issuers is None else list(issuers)
+
+        eigenvalues, eigenvectors = np.linalg.eigh(self.covariance)
+        self.loadings = eigenvectors * np.sqrt(np.clip(eigenvalues, 0.0, None))
+
+    @classmethod
+    def from_history(cls, yield_tenors, yields, spread_tenors, hazard_rates, horizon_days=1, seed=0, issuers=None):
+        """
+        Simulator around the last date of a curve history, with the
+        covariance of daily moves scaled to `horizon_days`.
+
+        yields: (dates x yield tenors) zero yields
+        hazard_rates: (dates x issuers x spread tenors) bucket hazard rates
+        """
+        yields = np.asarray(yields, dtype=float)
+        hazard_rates = np.asarray(hazard_rates, dtype=float)
+        states = np.hstack([yields, hazard_rates.reshape(len(hazard_rates), -1)])
+        covariance = np.atleast_2d(np.cov(historical_moves(states), rowvar=False)) * horizon_days
+        return cls(yield_tenors, spread_tenors, yields[-1], hazard_rates[-1], covariance, seed, issuers)
+
+    def streams(self, paths, chunk_size):
+        """[(SeedSequence, paths in chunk)] covering `paths` paths."""
+        sizes = [min(chunk_size, paths - start) for start in range(0, paths, chunk_size)]
+        return list(zip(np.random.SeedSequence(self.seed).spawn(len(sizes)), sizes))
+
+    def draw(self, stream, size, base_hazard_rates=None):
+        """
+        One chunk of shocks: yield shocks (size x yield tenors) and hazard
+        shocks (size x issuers x spread tenors), net of the zero floor.
+
+        The floor keeps the simulator's base hazard rates plus the shocks
+        non-negative; pass the (issuers x spread tenors) bucket rates of
+        other curves the shocks will be applied to, to floor against those.
+        """
+        base = self.base_hazard_rates if base_hazard_rates is None else np.asarray(base_hazard_rates, dtype=float)
+        rng = np.random.default_rng(stream)
+        shocks = rng.standard_normal((size, len(self.loadings))) @ self.loadings.T
+        ky = len(self.yield_tenors)
+        hazard_shocks = shocks[:, ky:].reshape((size,) + self.base_hazard_rates.shape)
+        hazard_shocks = np.maximum(base + hazard_shocks, 0.0) - base
+        return shocks[:, :ky], hazard_shocks
+
+    def market(self, stream, size):
+        """ScenarioMarket of one chunk of shocked curves."""
+        yield_shocks, hazard_shocks = self.draw(stream, size)
+        return ScenarioMarket(self.yield_tenors, np.exp(-(self.base_yields + yield_shocks) * self.yield_tenors),
+                              self.spread_tenors, self.base_hazard_rates + hazard_shocks)
+
+    def base_market(self):
+        """ScenarioMarket holding the unshocked curves as its only row."""
+        return ScenarioMarket(self.yield_tenors, np.exp(-self.base_yields * self.yield_tenors)[None],
+                              self.spread_tenors, self.base_hazard_rates[None])
+
+    def discount_factors(self, yield_shocks, t):
+        """exp(-dy(t) t) per path, with yield shocks linear between tenors and flat outside."""
+        t = np.asarray(t, dtype=float)
+        weights = np.array([np.interp(t, self.yield_tenors, row) for row in np.eye(len(self.yield_tenors))])
+        return np.exp(-(yield_shocks @ weights) * t)
+
+    def survival_factors(self, hazard_shocks, t):
+        """exp(-dΛ(t)) per path, for one issuer's (paths x spread tenors) hazard shocks."""
+        return np.exp(-(hazard_shocks @ bucket_overlap(self.spread_tenors, t).T))
+
+    def issuer_row(self, issuer):
+        return issuer if isinstance(issuer, (int, np.integer)) else self.issuers.index(issuer)
+
+
+def _portfolio_digests(model, chunks):
+    positions, simulator, base, compression = model
+    digests = []
+    for stream, size in chunks:
+        market = simulator.market(stream, size)
+        total = np.zeros(size)
+        for pricer, issuer in positions:
+            total += revalue(pricer, issuer, market)
+        digest = StreamingQuantile(compression)
+        digest.update(total - base)
+        digests.append(digest)
+    return digests
+
+
+def summarize_digest(digest, confidence):
+    """VaR and ES at `confidence` (positive losses) from a PnL digest."""
+    return {
+        "VaR": -digest.quantile(1 - confidence),
+        "ES": -digest.tail_mean(1 - confidence),
+        "mean": digest.mean(),
+        "std": digest.std(),
+        "paths": digest.count,
+    }
+
+
+def bucket_hazard_rates(hazard_rate_curve, tenors):
+    """
+    Average hazard rate of a curve over each bucket (T_{k-1}, T_k]: the
+    bucket rates themselves for a bootstrapped HazardCurve on `tenors`.
+    """
+    nodes = np.concatenate([[0.0], np.asarray(tenors, dtype=float)])
+    cumulative = SurvivalCurve(hazard_rate_curve, horizon=nodes[-1]).cumulative_hazard(nodes)
+    return np.diff(cumulative) / np.diff(nodes)
+
+
+def _trade_digests(trade, chunks):
+    pricer, base_dc, base_hc, simulator, issuer, compression = trade
+    row = simulator.issuer_row(issuer)
+    # Shocks shift base_hc, so the zero floor applies to its bucket rates
+    floors = simulator.base_hazard_rates.copy()
+    floors[row] = bucket_hazard_rates(base_hc, simulator.spread_tenors)
+    batched = hasattr(pricer, "_price_legs") and getattr(pricer, "constituent_hazard_curves", None) is None
+    if batched:
+        schedule = pricer._schedule()
+        discount_times, survival_times = leg_times(schedule)
+        df = np.asarray(base_dc(discount_times), dtype=float)
+        sp = SurvivalCurve(base_hc, horizon=schedule.maturity)(survival_times)
+        base = pricer._price_legs(legs_from_samples(df[None], sp[None], schedule))[0]
+    else:
+        base_pricer = deepcopy(pricer)
+        base_pricer.discount_curve, base_pricer.hazard_rate_curve = base_dc, base_hc
+        base = base_pricer.price()
+
+    digests = []
+    for stream, size in chunks:
+        yield_shocks, hazard_shocks = simulator.draw(stream, size, floors)
+        hazard_shocks = hazard_shocks[:, row]
+        if batched:
+            prices = pricer._price_legs(legs_from_samples(df * simulator.discount_factors(yield_shocks, discount_times),
+                                                          sp * simulator.survival_factors(hazard_shocks, survival_times),
+                                                          schedule))
+        else:
+            prices = np.empty(size)
+            for path in range(size):
+                dy = yield_shocks[path:path + 1]
+                scenario_pricer = deepcopy(pricer)
+                scenario_pricer.discount_curve = lambda t, dy=dy: base_dc(t) * np.reshape(
+                    simulator.discount_factors(dy, np.atleast_1d(t))[0], np.shape(t))
+                scenario_pricer.hazard_rate_curve = ShiftedHazardCurve(base_hc, simulator.spread_tenors,
+                                                                       hazard_shocks[path])
+                prices[path] = scenario_pricer.price()
+        digest = StreamingQuantile(compression)
+        digest.update(np.asarray(prices, dtype=float) - base)
+        digests.append(digest)
+    return digests
+
+
+def simulate_trade_var(pricer, base_discount_curve, base_hazard_curve, simulator, paths, confidence=0.99,
+                       chunk_size=10_000, issuer=0, compression=1000, executor=None):
+    """
+    VaR and ES of one pricer under simulated curve moves (the engine of
+    ScenarioEngine.run_monte_carlo).
+
+    Each path's zero-yield shocks scale the base discount curve and the
+    hazard bucket shocks of `issuer` (row or name) shift the base hazard
+    curve. Paths are drawn and repriced `chunk_size` at a time, in one
+    vectorized pass for pricers that price from UnitLegs and one deep copy
+    per path otherwise, on the executor's process pool if one is given.
+    Only a StreamingQuantile of the PnL is kept.
+
+    Returns: dict as summarize_digest
+    """
+    trade = (pricer, base_discount_curve, base_hazard_curve, simulator, issuer, compression)
+    chunks = simulator.streams(paths, chunk_size)
+    if executor is not None:
+        chunk_digests = executor.map(_trade_digests, [trade], chunks)[0]
+    else:
+        chunk_digests = _trade_digests(trade, chunks)
+    digest = StreamingQuantile(compression)
+    for chunk_digest in chunk_digests:
+        digest.merge(chunk_digest)
+    return summarize_digest(digest, confidence)
+
+
+class MonteCarloVaR(HistoricalVaR):
+    def __init__(self, positions, market_data, paths=100_000, path_chunk=10_000, horizon_days=1, seed=0,
+                 compression=1000, **kwargs):
+        """
+        Monte Carlo VaR and ES with full revaluation.
+
+        The history's CDS spreads are bootstrapped into hazard curves date
+        by date, and the covariance of daily moves of the zero yields and
+        bucket hazard rates (every issuer the positions reference) drives a
+        CurveShockSimulator around the as-of curves. Paths are generated and
+        repriced `path_chunk` at a time: each chunk is a ScenarioMarket, every
+        position is repriced over it in one vectorized pass, and only the
+        chunk's portfolio PnL is formed, which is folded into a
+        StreamingQuantile. Memory does not grow with the number of paths, and
+        no (paths x positions) matrix is held. With an executor the chunks
+        are spread over its process pool; the seeding makes the result the
+        same either way.
+
+        Parameters are those of HistoricalVaR (history, issuers, bootstrap
+        conventions, executor), plus:
+        - paths: number of simulated paths
+        - path_chunk: paths repriced per chunk
+        - horizon_days: VaR horizon, scaling the daily covariance
+        - seed: root seed of the path streams
+        - compression: StreamingQuantile compression
+        """
+        super().__init__(positions, market_data, **kwargs)
+        self.paths = paths
+        self.path_chunk = path_chunk
+        self.horizon_days = horizon_days
+        self.seed = seed
+        self.compression = compression
+        self._simulator = None
+
+    def simulator(self):
+        """CurveShockSimulator estimated on the history, built on first use."""
+        if self._simulator is None:
+            yields, spreads = self._histories()
+            history, self.diagnostics = build_scenario_market(
+                self.market_data.yield_tenors, yields, self.market_data.spread_tenors, spreads,
+                self.recovery_rate, self.payment_frequency, self.chunk_size, self.tol, self.max_iter)
+            self._simulator = CurveShockSimulator.from_history(
+                self.market_data.yield_tenors, yields, self.market_data.spread_tenors, history.hazard_rates,
+                self.horizon_days, self.seed, self._issuer_names)
+        return self._simulator
+
+    def _model(self):
+        simulator = self.simulator()
+        positions = list(zip(self.positions, self._issuer_rows))
+        base_market = simulator.base_market()
+        base = sum(revalue(pricer, issuer, base_market)[0] for pricer, issuer in positions)
+        return positions, simulator, base, self.compression
+
+    def pnl(self, paths=1000):
+        """
+        PnL per position of the first `paths` simulated paths, for
+        inspection; run() never forms this matrix.
+
+        Returns: DataFrame (paths x positions)
+        """
+        positions, simulator, _, _ = self._model()
+        market = simulator.market(*simulator.streams(paths, paths)[0])
+        base_market = simulator.base_market()
+        values = [revalue(pricer, issuer, market) - revalue(pricer, issuer, base_market)[0]
+                  for pricer, issuer in positions]
+        return pd.DataFrame(np.array(values).reshape(len(positions), -1).T,
+                            index=pd.RangeIndex(paths, name="path"), columns=self.names)
+
+    def run(self, confidence=0.99):
+        """
+        Portfolio VaR and ES at `confidence`, as positive losses.
+
+        Returns: dict with VaR, ES, the mean and standard deviation of
+        portfolio PnL, and the number of paths
+        """
+        model = self._model()
+        chunks = model[1].streams(self.paths, self.path_chunk)
+        digest = StreamingQuantile(self.compression)
+        if self.executor is not None:
+            for chunk_digest in self.executor.map(_portfolio_digests, [model], chunks)[0]:
+                digest.merge(chunk_digest)
+        else:
+            for chunk in chunks:
+                digest.merge(_portfolio_digests(model, [chunk])[0])
+        return summarize_digest(digest, confidence)
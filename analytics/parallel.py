@@ -0,0 +1,247 @@
+# analytics/parallel.py
+
+from concurrent.futures import ProcessPoolExecutor, as_completed
+import io
+import math
+import multiprocessing
+import os
+import pickle
+import types
+from multiprocessing import shared_memory
+import numpy as np
+from pricers.curves import Curve, HazardCurve
+
+
+def _is_curve(obj):
+    return isinstance(obj, (Curve, HazardCurve))
+
+
+def _is_local(obj):
+    # Lambdas and closures cannot be pickled by reference
+    return isinstance(obj, types.FunctionType) and "<" in obj.__qualname__
+
+
+class _CurveRegistry:
+    """
+    Curves met while pickling work, packed into one shared-memory block, and
+    lambda or closure callables, which are handed to forked workers as they are.
+    """
+
+    def __init__(self):
+        self._index = {}
+        self.curves = []
+        self.local = []
+
+    def add(self, obj, objects):
+        entry = self._index.get(id(obj))
+        if entry is None:
+            entry = self._index[id(obj)] = len(objects)
+            objects.append(obj)
+        return entry
+
+    def persistent_id(self, obj):
+        if _is_curve(obj):
+            return "curve", self.add(obj, self.curves)
+        if _is_local(obj):
+            return "local", self.add(obj, self.local)
+        return None
+
+    def dumps(self, obj):
+        buffer = io.BytesIO()
+        pickler = pickle.Pickler(buffer, protocol=pickle.HIGHEST_PROTOCOL)
+        pickler.persistent_id = self.persistent_id
+        pickler.dump(obj)
+        return buffer.getvalue()
+
+    def pack(self):
+        """
+        Returns: (SharedMemory, layout); layout[i] describes curve i as
+        offsets into the block, which is a flat float64 array.
+        """
+        arrays, layout = [], []
+        offset = 0
+
+        def put(array):
+            nonlocal offset
+            array = np.asarray(array, dtype=float)
+            arrays.append(array)
+            offset += len(array)
+            return offset - len(array), len(array)
+
+        def describe(curve):
+            if isinstance(curve, HazardCurve):
+                scale = None if curve.scale is None else describe(curve.scale)
+                return ("hazard", put(curve.tenors), put(curve.hazard_rates), curve.shift, scale)
+            return ("curve", put(curve.times), put(curve.values), curve.kind, curve.shift, curve.extrapolation)
+
+        for curve in self.curves:
+            layout.append(describe(curve))
+        shm = shared_memory.SharedMemory(create=True, size=max(8, 8 * offset))
+        block = np.ndarray((offset,), dtype=float, buffer=shm.buf)
+        if arrays:
+            block[:] = np.concatenate(arrays)
+        return shm, layout
+
+
+def _rebuild(spec, block):
+    view = lambda span: block[span[0]:span[0] + span[1]]
+    if spec[0] == "hazard":
+        _, tenors, rates, shift, scale = spec
+        return HazardCurve(view(tenors), view(rates), shift, None if scale is None else _rebuild(scale, block))
+    _, times, values, kind, shift, extrapolation = spec
+    return Curve(view(times), view(values), kind, shift, extrapolation)
+
+
+_WORKER = {}
+
+
+def _init_worker(shm_name, layout, local, function, trades, items):
+    # Pool workers share the parent's resource tracker, so attaching does not
+    # take ownership: the parent unlinks the block when the run ends
+    shm = shared_memory.SharedMemory(name=shm_name)
+    block = np.ndarray((shm.size // 8,), dtype=float, buffer=shm.buf)
+    objects = {"curve": [_rebuild(spec, block) for spec in layout], "local": local}
+    _WORKER.update(shm=shm, objects=objects, function=function, payloads=trades, trades={}, items=items)
+
+
+def _load(payload, objects):
+    unpickler = pickle.Unpickler(io.BytesIO(payload))
+    unpickler.persistent_load = lambda key: objects[key[0]][key[1]]
+    return unpickler.load()
+
+
+def _run_unit(trade, start, stop):
+    trades = _WORKER["trades"]
+    if trade not in trades:
+        trades[trade] = _load(_WORKER["payloads"][trade], _WORKER["objects"])
+    return trade, start, _WORKER["function"](trades[trade], _WORKER["items"][start:stop])
+
+
+def _scenario_prices(pricer, scenarios):
+    from analytics.scenario_analysis import ScenarioEngine
+
+    engine = ScenarioEngine(pricer, pricer.discount_curve, pricer.hazard_rate_curve)
+    for i, scenario in enumerate(scenarios):
+        engine.run_scenario(i, **scenario)
+    return [engine.results[i] for i in range(len(scenarios))]
+
+
+def _bump_prices(trade, bumps):
+    from analytics.sensitivity import SensitivityEngine
+
+    pricer, base_dc, base_hc = trade
+    engine = SensitivityEngine(pricer, base_dc, base_hc, batched=False)
+    return [engine._bumped_price(target, tenor, bump_bp) for target, tenor, bump_bp in bumps]
+
+
+def _trade_sensitivities(pricer, requests):
+    from analytics.sensitivity import SensitivityEngine
+
+    engine = SensitivityEngine(pricer, pricer.discount_curve, pricer.hazard_rate_curve)
+    return [engine.compute_pv01(bump_bp) if tenors is None else engine.compute_key_rate_sensitivities(tenors, bump_bp)
+            for tenors, bump_bp in requests]
+
+
+class ParallelExecutor:
+    def __init__(self, max_workers=None, chunk_size=None, progress=None, mp_context=None):
+        """
+        Runs (trade, scenario) work units on a process pool.
+
+        Trades (pricers, or tuples holding them) are pickled once per worker
+        with their curves left out: every Curve and HazardCurve they
+        reference is packed into one shared-memory block, which workers map
+        and rebuild from, so results are identical to an in-process run.
+        Lambda and closure curves cannot be pickled; they are handed to the
+        workers as they are, which needs the "fork" start method. Tasks carry
+        only indices.
+
+        Parameters:
+        - max_workers: processes (default os.cpu_count()); 1 runs in-process
+        - chunk_size: scenarios per work unit (default: about 8 units per worker)
+        - progress: optional callable(done, total) called as units complete
+        - mp_context: multiprocessing context or start method name
+        """
+        self.max_workers = max_workers or os.cpu_count() or 1
+        self.chunk_size = chunk_size
+        self.progress = progress
+        self.mp_context = multiprocessing.get_context(mp_context) if isinstance(mp_context, (str, type(None))) else mp_context
+
+    def _chunk(self, trades, items):
+        if self.chunk_size:
+            return self.chunk_size
+        return max(1, math.ceil(trades * items / (8 * self.max_workers)))
+
+    def map(self, function, trades, items):
+        """
+        Calls function(trade, chunk of items) for every trade and every
+        chunk of items, and returns results[trade][item] in input order,
+        whatever order the units finish in. `function` must be a module-level
+        function returning one result per item.
+        """
+        trades, items = list(trades), list(items)
+        if not trades or not items:
+            return [[] for _ in trades]
+        chunk = self._chunk(len(trades), len(items))
+        units = [(t, start, min(start + chunk, len(items))) for t in range(len(trades))
+                 for start in range(0, len(items), chunk)]
+        results = [[None] * len(items) for _ in trades]
+
+        if self.max_workers == 1:
+            for done, (t, start, stop) in enumerate(units, 1):
+                results[t][start:stop] = function(trades[t], items[start:stop])
+                if self.progress is not None:
+                    self.progress(done, len(units))
+            return results
+
+        registry = _CurveRegistry()
+        payloads = [registry.dumps(trade) for trade in trades]
+        if registry.local and self.mp_context.get_start_method() != "fork":
+            raise ValueError("lambda and closure curves need the 'fork' start method; "
+                             "use Curve or HazardCurve objects with other start methods")
+        shm, layout = registry.pack()
+        try:
+            with ProcessPoolExecutor(max_workers=min(self.max_workers, len(units)), mp_context=self.mp_context,
+                                     initializer=_init_worker,
+                                     initargs=(shm.name, layout, registry.local, function, payloads, items)) as pool:
+                futures = [pool.submit(_run_unit, *unit) for unit in units]
+                for done, future in enumerate(as_completed(futures), 1):
+                    t, start, values = future.result()
+                    results[t][start:start + len(values)] = values
+                    if self.progress is not None:
+                        self.progress(done, len(units))
+        finally:
+            shm.close()
+            shm.unlink()
+        return results
+
+    def price_scenarios(self, pricers, scenarios):
+        """
+        Full revaluation of every pricer under every scenario.
+
+        scenarios: list of ScenarioEngine.run_scenario keyword dicts
+            (dc_shift, hc_shift, dc_key_rate_shifts, hc_key_rate_shifts),
+            applied to each pricer's own curves
+        Returns: array of shape (len(pricers), len(scenarios))
+        """
+        return np.array(self.map(_scenario_prices, pricers, scenarios), dtype=float).reshape(len(pricers), len(scenarios))
+
+    def bumped_prices(self, pricer, base_discount_curve, base_hazard_curve, bumps):
+        """
+        Prices under SensitivityEngine bumps of the base curves, one work
+        unit per chunk of bumps.
+
+        bumps: list of (target, tenor, bump_bp); target "discount" or
+            "hazard", tenor None for a parallel bump
+        Returns: list of prices, one per bump
+        """
+        return self.map(_bump_prices, [(pricer, base_discount_curve, base_hazard_curve)], bumps)[0]
+
+    def sensitivities(self, pricers, tenors=None, bump_bp=1.0):
+        """
+        SensitivityEngine results for every pricer on its own curves:
+        compute_pv01 (tenors=None) or compute_key_rate_sensitivities.
+
+        Returns: list with one result dict per pricer
+        """
+        return [row[0] for row in self.map(_trade_sensitivities, pricers, [(tenors, bump_bp)])]
+
@@ -2,7 +2,13 @@
 
 from copy import deepcopy
 import numpy as np
+import pandas as pd
 from analytics.sensitivity import SensitivityEngine
+from pricers.curves import SurvivalCurve
+from pricers.leg_cache import UnitLegs, leg_times, legs_from_samples
+from pricers.schedule import age_schedule, stack_schedules
+
+COMPONENTS = ["IR_PnL", "CS_PnL", "Carry", "RollDown", "Residual"]
 
 
 class PnLTracker:
@@ -59,8 +65,8 @@ class PnLTracker:
 
         # Compute IR and CS shifts
         ts = np.linspace(0.01, 30.0, 100)
-        ir_shift = np.mean([dc(t) - self.base_dc(t) for t in ts])
-        cs_shift = np.mean([hc(t) - self.base_hc(t) for t in ts])
+        ir_shift = np.mean(np.asarray(dc(ts), dtype=float) - np.asarray(self.base_dc(ts), dtype=float))
+        cs_shift = np.mean(np.asarray(hc(ts), dtype=float) - np.asarray(self.base_hc(ts), dtype=float))
 
         # PnL attribution via linear approximation
         ir01 = sens["IR01"]
@@ -93,3 +99,183 @@ class PnLTracker:
 
     def last_price(self):
         return self.history[-1]["price"] if self.history else None
+
+
+def _parallel_moves(mids, old_df, new_df, old_sp, new_sp):
+    """
+    Parallel-equivalent zero-rate and hazard moves per row of a protection
+    grid: the changes in -log DF and -log S averaged over the grid with
+    DF * S weights, divided by the equally weighted times. mids holds the
+    grid midpoints (rows x intervals) and the survival samples the grid
+    points (rows x intervals + 1).
+    """
+    weights = old_df * np.sqrt(old_sp[:, :-1] * old_sp[:, 1:])
+    sp_change = -np.log(new_sp / old_sp)
+    duration = np.sum(weights * mids, axis=1)
+    ir = np.sum(weights * -np.log(new_df / old_df), axis=1)
+    cs = np.sum(weights * (sp_change[:, :-1] + sp_change[:, 1:]) / 2, axis=1)
+    moves = [np.divide(move, duration, out=np.zeros_like(move), where=duration > 0) for move in (ir, cs)]
+    return moves[0], moves[1]
+
+
+class IncrementalPnLTracker:
+    def __init__(self, pricers, issuers=None, names=None, bump_bp=1.0):
+        """
+        Daily PnL attribution for a book, carried forward from day to day.
+
+        Positions age with the calendar: each day, a position's schedule is
+        seen from the record date (times from its trade date, or from the
+        first record date when it has none), so payments drop out and
+        maturities shorten. Every position's legs are evaluated with the
+        other positions on stacked, padded schedules: one curve evaluation
+        per curve per day for the whole book. Each pricer then prices all of
+        the day's curve states in one _price_legs call:
+
+        - carry: yesterday's curves rolled forward to today (forwards
+          realized), on today's schedule
+        - roll-down: yesterday's curves unchanged in time-to-maturity, minus
+          the carry state
+        - IR, CS: yesterday's IR01 and CS01 (parallel zero-rate and hazard
+          bumps of `bump_bp`, cached when yesterday was recorded) times the
+          parallel-equivalent curve moves, averaged over the position's leg
+          times with DF * S * t weights
+        - residual: the rest of the price change
+
+        Today's IR01 and CS01 come from the same call and are cached for
+        tomorrow, so no day is ever re-risked. Pricers must price from
+        UnitLegs (CDSPricer, homogeneous IndexCDSPricer, TRSPricer).
+
+        Parameters:
+        - pricers: list of pricers
+        - issuers: issuer of each position, keys of record_day's
+          hazard_curves (default: one issuer)
+        - names: position labels (default: 0..n-1)
+        - bump_bp: sensitivity bump size
+        """
+        self.pricers = list(pricers)
+        for pricer in self.pricers:
+            if not hasattr(pricer, "_price_legs") or getattr(pricer, "constituent_hazard_curves", None) is not None:
+                raise ValueError("IncrementalPnLTracker needs pricers that price from UnitLegs")
+        self.issuers = [None] * len(self.pricers) if issuers is None else list(issuers)
+        self.names = list(range(len(self.pricers))) if names is None else list(names)
+        self.bump_bp = bump_bp
+        self.history = []
+
+        # Positions on the same issuer, schedule and trade date share their legs
+        keys = [(issuer, id(pricer._schedule()), pricer.trade_date) for pricer, issuer in zip(self.pricers, self.issuers)]
+        groups = list(dict.fromkeys(keys))
+        self._group_of = np.array([groups.index(key) for key in keys])
+        first = [keys.index(key) for key in groups]
+        self._schedules = stack_schedules([self.pricers[i]._schedule() for i in first])
+        self._group_issuers = [self.issuers[i] for i in first]
+        self._trade_dates = [self.pricers[i].trade_date for i in first]
+        self._issuer_groups = {issuer: np.flatnonzero([name == issuer for name in self._group_issuers])
+                               for issuer in dict.fromkeys(self._group_issuers)}
+        self._start = None
+        self._last = None
+
+    def _elapsed(self, date):
+        """Years from each group's trade date (or the first record date) to `date`."""
+        day = np.datetime64(date, "D")
+        starts = np.array([np.datetime64(self._start if trade_date is None else trade_date, "D")
+                           for trade_date in self._trade_dates])
+        return (day - starts).astype(np.int64) / 365.0
+
+    def _survival_curves(self, hazard_curves, horizon):
+        """{issuer: SurvivalCurve} of the day's hazard curves."""
+        return {issuer: SurvivalCurve(hazard_curves if callable(hazard_curves) else hazard_curves[issuer],
+                                      horizon=horizon)
+                for issuer in dict.fromkeys(self._group_issuers)}
+
+    def _samples(self, discount_curve, survival_curves, discount_times, survival_times):
+        """(DF, S) of one day's curves at each group's leg times."""
+        df = np.asarray(discount_curve(discount_times), dtype=float)
+        sp = np.empty(np.shape(survival_times))
+        for issuer, rows in self._issuer_groups.items():
+            sp[rows] = survival_curves[issuer](survival_times[rows])
+        return df, sp
+
+    def _prices(self, legs):
+        """(states x positions) prices from (states x groups) legs."""
+        prices = np.empty((len(legs.rpv01), len(self.pricers)))
+        fields = [np.asarray(field)[:, self._group_of] for field in legs]
+        for p, pricer in enumerate(self.pricers):
+            prices[:, p] = pricer._price_legs(UnitLegs(*(field[:, p] for field in fields)))
+        return prices
+
+    def record_day(self, date, discount_curve, hazard_curves):
+        """
+        Prices the book on the day's curves and attributes the change since
+        the previous record.
+
+        discount_curve: callable
+        hazard_curves: {issuer: hazard curve}, or one hazard curve for
+            every position
+        """
+        if self._start is None:
+            self._start = date
+        elapsed = self._elapsed(date)
+        schedule = age_schedule(self._schedules, elapsed)
+        discount_times, survival_times = leg_times(schedule)
+        survival_curves = self._survival_curves(hazard_curves, max(float(np.max(schedule.maturity)), 1e-6))
+        df, sp = self._samples(discount_curve, survival_curves, discount_times, survival_times)
+
+        bump = self.bump_bp / 10000
+        states_df = [df, df * np.exp(-bump * discount_times), df]
+        states_sp = [sp, sp, sp * np.exp(-bump * survival_times)]
+        if self._last is not None:
+            # Yesterday's curves on today's times: rolled forward (carry) and held static (roll-down)
+            last_dc, last_sc, last_elapsed, last_prices, last_ir01, last_cs01 = self._last
+            step = (elapsed - last_elapsed)[:, None]
+            static_df, static_sp = self._samples(last_dc, last_sc, discount_times, survival_times)
+            forward_df, forward_sp = self._samples(last_dc, last_sc, discount_times + step, survival_times + step)
+            origin_df, origin_sp = self._samples(last_dc, last_sc, step, step)
+            states_df += [forward_df / origin_df, static_df]
+            states_sp += [forward_sp / origin_sp, static_sp]
+
+        prices = self._prices(legs_from_samples(np.stack(states_df), np.stack(states_sp), schedule))
+        price, ir01, cs01 = prices[0], prices[1] - prices[0], prices[2] - prices[0]
+
+        record = {"date": date, "price": float(price.sum()), "daily_pnl": None, "pnl_attrib": None,
+                  "positions": pd.DataFrame({"price": price, "IR01": ir01, "CS01": cs01}, index=self.names)}
+        if self._last is not None:
+            n = schedule.payment_times.shape[-1]
+            ir_move, cs_move = _parallel_moves(discount_times[:, n:-1], static_df[:, n:-1], df[:, n:-1],
+                                               static_sp[:, n:-1], sp[:, n:-1])
+            ir_move, cs_move = ir_move[self._group_of] / bump, cs_move[self._group_of] / bump
+
+            total = price - last_prices
+            components = np.column_stack([
+                last_ir01 * ir_move,
+                last_cs01 * cs_move,
+                prices[3] - last_prices,
+                prices[4] - prices[3],
+            ])
+            components = np.column_stack([components, total - components.sum(axis=1)])
+            record["daily_pnl"] = float(total.sum())
+            record["pnl_attrib"] = dict(zip(COMPONENTS, components.sum(axis=0).tolist()))
+            record["positions"] = record["positions"].assign(
+                daily_pnl=total, **{name: components[:, i] for i, name in enumerate(COMPONENTS)})
+
+        self.history.append(record)
+        self._last = (discount_curve, survival_curves, elapsed, price, ir01, cs01)
+
+    def compute_pnl_series(self):
+        """Book-level records (date, price, daily_pnl, pnl_attrib), as PnLTracker.compute_pnl_series."""
+        return [{key: record[key] for key in ("date", "price", "daily_pnl", "pnl_attrib")} for record in self.history]
+
+    def attribution(self, by_position=False):
+        """
+        Attribution per day: DataFrame indexed by date with daily_pnl and
+        the components, or indexed by (date, position) with by_position=True.
+        """
+        columns = ["daily_pnl"] + COMPONENTS
+        records = self.history[1:]
+        if by_position:
+            return pd.concat([record["positions"][columns] for record in records],
+                             keys=[record["date"] for record in records], names=["date", "position"])
+        return pd.DataFrame([{"daily_pnl": record["daily_pnl"], **record["pnl_attrib"]} for record in records],
+                            index=pd.Index([record["date"] for record in records], name="date"), columns=columns)
+
+    def last_price(self):
+        return self.history[-1]["price"] if self.history else None
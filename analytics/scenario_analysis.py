@@ -1,24 +1,34 @@
-from copy import deepcopy
+from copy import copy, deepcopy
 import numpy as np
+import pandas as pd
+from pricers.curves import Curve, SurvivalCurve
+from pricers.leg_cache import leg_times, legs_from_samples
+from analytics.monte_carlo_var import simulate_trade_var
 
 class ScenarioEngine:
-    def __init__(self, pricer, base_discount_curve, base_hazard_curve):
+    def __init__(self, pricer, base_discount_curve, base_hazard_curve, executor=None):
         """
         Only supports shocks to base curve and discount curve as of now.
         
         pricer: a callable object with .price() method
         base_discount_curve: callable (e.g., from DiscountCurveBuilder)
         base_hazard_curve: callable (e.g., from HazardCurveBuilder)
+        executor: optional analytics.parallel.ParallelExecutor; run_scenarios
+            and the per-point fallback of run_grid then reprice on its
+            process pool
         """
         self.base_pricer = pricer
         self.base_dc = base_discount_curve
         self.base_hc = base_hazard_curve
+        self.executor = executor
         self.results = {}
 
     def _apply_parallel_shift(self, curve, shift):
         """
         Returns a new shifted curve (parallel bump).
         """
+        if hasattr(curve, "shifted"):
+            return curve.shifted(shift)
         return lambda t: curve(t) * np.exp(-shift * t)
 
     def _apply_key_rate_shift(self, curve, shifts_dict):
@@ -31,12 +41,16 @@ class ScenarioEngine:
 
         # Sample points from the original curve
         ts = np.linspace(0.01, max(tenors) + 5, 200)
-        orig = np.array([curve(t) for t in ts])
-
         shift_interp = np.interp(ts, tenors, [bump_factors[t] for t in tenors])
+        if hasattr(curve, "scaled"):
+            # Step hazard curves keep their buckets instead of being resampled
+            return curve.scaled(ts, shift_interp)
+
+        orig = np.asarray(curve(ts), dtype=float)
         new_values = orig * shift_interp
 
-        return lambda t: np.interp(t, ts, new_values)
+        kind = "hazard" if curve is self.base_hc else "discount"
+        return Curve(ts, new_values, kind=kind, extrapolation="flat")
 
     def run_scenario(self, name, dc_shift=0.0, hc_shift=0.0, 
                      dc_key_rate_shifts=None, hc_key_rate_shifts=None):
@@ -60,6 +74,115 @@ class ScenarioEngine:
 
         self.results[name] = pricer.price()
 
+    def _parallel_prices(self, scenarios):
+        """Prices of run_scenario keyword dicts on the executor, in order."""
+        trade = copy(self.base_pricer)
+        trade.discount_curve = self.base_dc
+        trade.hazard_rate_curve = self.base_hc
+        return self.executor.price_scenarios([trade], scenarios)[0]
+
+    def run_scenarios(self, scenarios):
+        """
+        Runs several scenarios, {name: run_scenario keyword arguments}, and
+        stores each result under its name. With an executor the scenarios
+        are spread over its process pool.
+        """
+        if self.executor is None:
+            for name, kwargs in scenarios.items():
+                self.run_scenario(name, **kwargs)
+            return
+        prices = self._parallel_prices(list(scenarios.values()))
+        self.results.update(zip(scenarios, prices))
+
+    def _grid_axis(self, curve, shifts, key_rate_shifts):
+        """(labels, scenario curves) for one axis of run_grid."""
+        if isinstance(key_rate_shifts, pd.DataFrame):
+            key_rate_shifts = {label: row.dropna().to_dict() for label, row in key_rate_shifts.iterrows()}
+        key_rate_shifts = key_rate_shifts or {}
+        if shifts is None:
+            shifts = [] if key_rate_shifts else [0.0]
+        shifts = [float(shift) for shift in np.atleast_1d(shifts)]
+        labels = shifts + list(key_rate_shifts)
+        specs = [(shift, None) for shift in shifts] + [(0.0, shifts_dict) for shifts_dict in key_rate_shifts.values()]
+        curves = ([self._apply_parallel_shift(curve, shift) for shift in shifts]
+                  + [self._apply_key_rate_shift(curve, shifts_dict) for shifts_dict in key_rate_shifts.values()])
+        return labels, specs, curves
+
+    def run_grid(self, dc_shifts=None, hc_shifts=None, dc_key_rate_shifts=None, hc_key_rate_shifts=None, name=None):
+        """
+        Prices every combination of a discount curve scenario and a hazard
+        curve scenario, e.g. a 50 x 50 rates-by-credit stress grid.
+
+        Each axis lists its parallel shifts first, then its key-rate
+        scenarios. The curves of each axis are built once. Pricers that
+        price from UnitLegs (CDSPricer, homogeneous IndexCDSPricer,
+        TRSPricer) then combine the two axes in one vectorized pass: premium
+        and protection legs are products of discount and survival samples,
+        so the grid costs len(dc axis) + len(hc axis) curve evaluations
+        instead of one reprice per point. Other pricers are repriced per point
+        (on the executor, if there is one).
+
+        Parameters:
+        - dc_shifts, hc_shifts: arrays of parallel shifts (as run_scenario);
+          default [0.0] unless key-rate scenarios are given
+        - dc_key_rate_shifts, hc_key_rate_shifts: {label: {tenor: shift}},
+          or a DataFrame with one row per scenario and one column per tenor
+        - name: if given, each point is also stored in `results` under
+          (name, dc label, hc label), so summarize() reports it
+
+        Returns: DataFrame of prices, indexed by discount scenario (the shift,
+        or the key-rate label) with one column per hazard scenario
+        """
+        dc_labels, dc_specs, dc_curves = self._grid_axis(self.base_dc, dc_shifts, dc_key_rate_shifts)
+        hc_labels, hc_specs, hc_curves = self._grid_axis(self.base_hc, hc_shifts, hc_key_rate_shifts)
+
+        pricer = self.base_pricer
+        if hasattr(pricer, "_price_legs") and getattr(pricer, "constituent_hazard_curves", None) is None:
+            schedule = pricer._schedule()
+            discount_times, survival_times = leg_times(schedule)
+            df = np.array([curve(discount_times) for curve in dc_curves], dtype=float)
+            sp = np.array([SurvivalCurve(curve, horizon=schedule.maturity)(survival_times) for curve in hc_curves])
+            prices = pricer._price_legs(legs_from_samples(df[:, None, :], sp[None, :, :], schedule))
+        elif self.executor is not None:
+            scenarios = [dict(dc_shift=dc_shift, hc_shift=hc_shift,
+                              dc_key_rate_shifts=dc_key_rates, hc_key_rate_shifts=hc_key_rates)
+                         for dc_shift, dc_key_rates in dc_specs for hc_shift, hc_key_rates in hc_specs]
+            prices = np.reshape(self._parallel_prices(scenarios), (len(dc_specs), len(hc_specs)))
+        else:
+            prices = np.empty((len(dc_curves), len(hc_curves)))
+            for i, new_dc in enumerate(dc_curves):
+                for j, new_hc in enumerate(hc_curves):
+                    scenario_pricer = deepcopy(pricer)
+                    scenario_pricer.discount_curve = new_dc
+                    scenario_pricer.hazard_rate_curve = new_hc
+                    prices[i, j] = scenario_pricer.price()
+
+        grid = pd.DataFrame(np.array(np.broadcast_to(prices, (len(dc_labels), len(hc_labels)))),
+                            index=pd.Index(dc_labels, name="dc_scenario"),
+                            columns=pd.Index(hc_labels, name="hc_scenario"))
+        if name is not None:
+            for (dc_label, hc_label), price in grid.stack().items():
+                self.results[(name, dc_label, hc_label)] = price
+        return grid
+
+    def run_monte_carlo(self, simulator, paths, confidence=0.99, chunk_size=10_000, issuer=0, compression=1000):
+        """
+        VaR and ES of the pricer under simulated curve moves.
+
+        `simulator` (an analytics.monte_carlo_var.CurveShockSimulator) is the
+        scenario source: each path's zero-yield shocks are applied to the
+        base discount curve and the hazard bucket shocks of `issuer` (row
+        or name) to the base hazard curve. Paths are drawn and repriced
+        `chunk_size` at a time, in one vectorized pass for pricers that
+        price from UnitLegs and on the executor if there is one, and only a
+        StreamingQuantile of the PnL is kept, so memory does not grow with
+        `paths` (see analytics.monte_carlo_var.simulate_trade_var).
+
+        Returns: dict with VaR, ES (positive losses), mean, std and paths
+        """
+        return simulate_trade_var(self.base_pricer, self.base_dc, self.base_hc, simulator, paths, confidence,
+                                  chunk_size, issuer, compression, self.executor)
+
     def summarize(self):
         base_price = self.results.get("base", None)
         summary = {}
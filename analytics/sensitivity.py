@@ -1,27 +1,51 @@
 from copy import deepcopy
 import numpy as np
+from pricers.curves import (BUMP_GRID, Curve, HazardCurve, SurvivalCurve, gaussian_bump_factors,
+                            key_rate_bumped, key_rate_survival)
+from pricers.leg_cache import leg_times, legs_from_samples
+from analytics.adjoint import node_sensitivities
 
 class SensitivityEngine:
-    def __init__(self, pricer, base_discount_curve, base_hazard_curve):
+    def __init__(self, pricer, base_discount_curve, base_hazard_curve, batched=True, executor=None):
         """
         pricer: pricing object with .price()
         base_discount_curve: callable
         base_hazard_curve: callable
+        batched: reprice every bump of a call in one vectorized pass over a
+            (bumps x times) stack of bumped curve values. Applies to pricers
+            that price from UnitLegs (CDSPricer, homogeneous IndexCDSPricer,
+            TRSPricer); other pricers, or batched=False, reprice a deep copy
+            of the pricer once per bump. Results are the same either way.
+        executor: optional analytics.parallel.ParallelExecutor; per-bump
+            reprices are then spread over its process pool
         """
         self.pricer = pricer
         self.base_dc = base_discount_curve
         self.base_hc = base_hazard_curve
+        self.batched = batched
+        self.executor = executor
         self.base_price = pricer.price()
+        self._samples = {}
+
+    def _sampled(self, curve):
+        """The curve on the bump grid, sampled once per engine."""
+        entry = self._samples.get(id(curve))
+        if entry is None or entry[0] is not curve:
+            entry = self._samples[id(curve)] = (curve, np.asarray(curve(BUMP_GRID), dtype=float))
+        return entry[1]
 
     def _bump_curve(self, curve, bump_bp, tenor=None):
         """
         Applies a bump to a curve. If tenor is None, bumps all points (parallel).
         Otherwise applies key rate bump using Gaussian bump at the target tenor.
         """
+        if hasattr(curve, "bumped"):
+            return curve.bumped(bump_bp, tenor)
+
         bump_decimal = bump_bp / 10000
 
-        ts = np.linspace(0.01, 30.0, 1000)
-        values = np.array([curve(t) for t in ts])
+        ts = BUMP_GRID
+        values = self._sampled(curve)
 
         if tenor is None:
             # Parallel bump
@@ -33,44 +57,116 @@ class SensitivityEngine:
             bump_factors = np.exp(-bump_decimal * ts * gauss)
             bumped = values * bump_factors
 
-        return lambda t: np.interp(t, ts, bumped)
+        kind = "hazard" if curve is self.base_hc else "discount"
+        return Curve(ts, bumped, kind=kind, extrapolation="flat")
 
-    def compute_pv01(self, bump_bp=1.0):
+    def _can_batch(self):
+        return (self.batched and hasattr(self.pricer, "_price_legs")
+                and getattr(self.pricer, "constituent_hazard_curves", None) is None)
+
+    def _bumped_rows(self, curve, tenors, bump_bp, evaluate, stack):
         """
-        Computes parallel PV01 (IR and credit).
-        Returns: dict with IR01, CS01
+        One row of curve values per bump (tenor None = parallel). Key-rate
+        bumps of Curve, HazardCurve and plain callables come from `stack`
+        as one array; other bumps are built with _bump_curve and evaluated.
+        """
+        rows = [None] * len(tenors)
+        key_rate = [i for i, tenor in enumerate(tenors) if tenor is not None]
+        if key_rate and (isinstance(curve, (Curve, HazardCurve)) or not hasattr(curve, "bumped")):
+            factors = gaussian_bump_factors(bump_bp / 10000, [tenors[i] for i in key_rate])
+            for i, row in zip(key_rate, stack(curve, factors)):
+                rows[i] = row
+        for i, tenor in enumerate(tenors):
+            if rows[i] is None:
+                rows[i] = evaluate(self._bump_curve(curve, bump_bp, tenor))
+        return np.array(rows)
+
+    def _bumped_prices(self, tenors, bump_bp):
+        """
+        Prices with the discount curve bumped at each tenor (None = parallel),
+        then with the hazard curve bumped, from a single vectorized reprice.
+
+        Returns: (IR-bumped prices, credit-bumped prices), arrays over tenors
+        """
+        pricer = self.pricer
+        schedule = pricer._schedule()
+        discount_times, survival_times = leg_times(schedule)
+        base_df = np.asarray(pricer.discount_curve(discount_times), dtype=float)
+        base_sp = np.asarray(pricer._survival_curve()(survival_times), dtype=float)
+
+        df_rows = self._bumped_rows(
+            self.base_dc, tenors, bump_bp,
+            lambda curve: curve(discount_times),
+            lambda curve, factors: key_rate_bumped(curve, factors, discount_times, self._sampled(curve)))
+        sp_rows = self._bumped_rows(
+            self.base_hc, tenors, bump_bp,
+            lambda curve: SurvivalCurve(curve, horizon=schedule.maturity)(survival_times),
+            lambda curve, factors: key_rate_survival(curve, factors, schedule.maturity, survival_times,
+                                                     self._sampled(curve)))
+
+        # IR rows on the base survival curve, then credit rows on the base discount curve
+        n = len(tenors)
+        df = np.concatenate([df_rows, np.broadcast_to(base_df, (n, len(base_df)))])
+        sp = np.concatenate([np.broadcast_to(base_sp, (n, len(base_sp))), sp_rows])
+        prices = pricer._price_legs(legs_from_samples(df, sp, schedule))
+        return prices[:n], prices[n:]
+
+    def _bumped_price(self, target, tenor, bump_bp):
+        """Reprices a copy of the pricer with the discount or hazard curve bumped."""
+        pricer = deepcopy(self.pricer)
+        if target == "discount":
+            pricer.discount_curve = self._bump_curve(self.base_dc, bump_bp, tenor=tenor)
+        else:
+            pricer.hazard_rate_curve = self._bump_curve(self.base_hc, bump_bp, tenor=tenor)
+        return pricer.price()
+
+    def _repriced(self, tenors, bump_bp):
         """
-        # Interest rate bump
-        bumped_dc = self._bump_curve(self.base_dc, bump_bp, tenor=None)
-        pricer_ir = deepcopy(self.pricer)
-        pricer_ir.discount_curve = bumped_dc
-        ir01 = pricer_ir.price() - self.base_price
+        Per-bump reprices for each tenor (None = parallel), on the executor
+        if there is one.
 
-        # Credit spread bump
-        bumped_hc = self._bump_curve(self.base_hc, bump_bp, tenor=None)
-        pricer_cs = deepcopy(self.pricer)
-        pricer_cs.hazard_rate_curve = bumped_hc
-        cs01 = pricer_cs.price() - self.base_price
+        Returns: (IR-bumped prices, credit-bumped prices)
+        """
+        bumps = [(target, t, bump_bp) for target in ("discount", "hazard") for t in tenors]
+        if self.executor is not None:
+            prices = self.executor.bumped_prices(self.pricer, self.base_dc, self.base_hc, bumps)
+        else:
+            prices = [self._bumped_price(*bump) for bump in bumps]
+        return prices[:len(tenors)], prices[len(tenors):]
 
-        return {"IR01": ir01, "CS01": cs01}
+    def compute_pv01(self, bump_bp=1.0):
+        """
+        Computes parallel PV01 (IR and credit). Both curves are shifted as
+        values * exp(-bump * t), so a positive CS01 bump lowers the hazard
+        rate; CDSPricer.greeks() reports the additive h + 1bp measure as HR01.
+        Returns: dict with IR01, CS01
+        """
+        if self._can_batch():
+            ir_prices, cs_prices = self._bumped_prices([None], bump_bp)
+        else:
+            ir_prices, cs_prices = self._repriced([None], bump_bp)
+        return {"IR01": ir_prices[0] - self.base_price, "CS01": cs_prices[0] - self.base_price}
 
     def compute_key_rate_sensitivities(self, tenors, bump_bp=1.0):
         """
         Computes key rate IR01 and CS01.
         Returns: dict of {tenor: (IR01, CS01)}
         """
-        results = {}
-        for t in tenors:
-            bumped_dc = self._bump_curve(self.base_dc, bump_bp, tenor=t)
-            bumped_hc = self._bump_curve(self.base_hc, bump_bp, tenor=t)
-
-            pricer_ir = deepcopy(self.pricer)
-            pricer_ir.discount_curve = bumped_dc
-            ir01 = pricer_ir.price() - self.base_price
+        if self._can_batch():
+            ir_prices, cs_prices = self._bumped_prices(list(tenors), bump_bp)
+        else:
+            ir_prices, cs_prices = self._repriced(list(tenors), bump_bp)
+        return {t: {"IR01": ir - self.base_price, "CS01": cs - self.base_price}
+                for t, ir, cs in zip(tenors, ir_prices, cs_prices)}
 
-            pricer_cs = deepcopy(self.pricer)
-            pricer_cs.hazard_rate_curve = bumped_hc
-            cs01 = pricer_cs.price() - self.base_price
+    def compute_node_sensitivities(self, discount_tenors=None, hazard_tenors=None):
+        """
+        Computes IR01 and CS01 for every discount and hazard curve node with
+        one adjoint (reverse-mode) pass instead of two reprices per tenor.
+        Supports CDSPricer, IndexCDSPricer (homogeneous) and TRSPricer.
 
-            results[t] = {"IR01": ir01, "CS01": cs01}
-        return results
+        Tenors default to the curves' own knots (interp1d curves); pass them
+        explicitly for other callables. See analytics.adjoint.node_sensitivities.
+        Returns: dict with IR01 {tenor: value}, CS01 {tenor: value}, pv and raw gradients
+        """
+        return node_sensitivities(self.pricer, self.base_dc, self.base_hc, discount_tenors, hazard_tenors)
@@ -8,6 +8,7 @@ from pricers.index_cds_pricer import IndexCDSPricer
 from pricers.trs_pricer import TRSPricer
 from pricers.credit_option_pricer import CreditOptionPricer
 from analytics.curve_construction import build_discount_curve_from_yields, build_hazard_curve_from_spreads
+from analytics.curve_cache import CurveCache
 from visualizations.pnl_plot import plot_pnl_series
 from visualizations.risk_report_plot import plot_risk_report
 from analytics.sensitivity import SensitivityEngine
@@ -17,6 +18,13 @@ from data.market_data import MarketDataProvider
 st.set_page_config(page_title="Credit Toolkit Dashboard", layout="wide")
 st.title("Credit Pricing & Risk Dashboard")
 
+
+@st.cache_resource
+def curve_cache():
+    # One cache per server process, kept across reruns; curves only rebuild when quotes change
+    return CurveCache(directory="data_store/curve_cache")
+
+
 instrument = st.sidebar.selectbox("Choose Instrument", ["CDS", "Index CDS", "TRS", "Credit Option"])
 
 # --- Common Inputs ---
@@ -29,14 +37,14 @@ treasury_yields = {
     int(k): float(st.sidebar.number_input(f"Yield {k}Y", value=rate))
     for k, rate in {1: 0.05, 3: 0.055, 5: 0.06, 10: 0.065}.items()
 }
-discount_curve = build_discount_curve_from_yields(treasury_yields)
+discount_curve = build_discount_curve_from_yields(treasury_yields, cache=curve_cache())
 
 st.sidebar.markdown("### CDS Spreads (bps)")
 cds_spreads = {
     int(k): float(st.sidebar.number_input(f"Spread {k}Y", value=spread))
     for k, spread in {1: 100, 3: 150, 5: 200}.items()
 }
-hazard_curve = build_hazard_curve_from_spreads(cds_spreads, discount_curve)
+hazard_curve = build_hazard_curve_from_spreads(cds_spreads, discount_curve, cache=curve_cache())
 
 print("discount_curve type:", type(discount_curve))
 print("hazard_curve type:", type(hazard_curve))
@@ -0,0 +1,74 @@
+import numpy as np
+from pricers.cds_pricer import CDSPricer
+from pricers.cds_book import CDSBook
+from analytics.curve_construction import DiscountCurveBuilder, HazardCurveBuilder
+
+# Build curves
+dc = DiscountCurveBuilder([(1, 0.05), (3, 0.055), (5, 0.06)]).build_curve()
+hc_ig = HazardCurveBuilder([(1, 60), (3, 80), (5, 100)], dc).build_curve()
+hc_hy = HazardCurveBuilder([(1, 300), (3, 350), (5, 400)], dc).build_curve()
+
+# A book of 10,000 trades on two issuers
+n = 10_000
+rng = np.random.default_rng(42)
+maturities = rng.choice([1, 3, 5, 7, 10], n)
+spreads = rng.uniform(50, 400, n)
+curves = [hc_ig if i % 2 == 0 else hc_hy for i in range(n)]
+
+book = CDSBook(
+    notional=1e7,
+    maturity=maturities,
+    spread=spreads,
+    recovery_rate=0.4,
+    discount_curve=dc,
+    hazard_rate_curves=curves
+)
+result = book.breakdown()
+print(f"Book PV: {result['pv'].sum():,.2f}")
+
+# Cross-check a few trades against the single-trade pricer
+for i in range(3):
+    pricer = CDSPricer(1e7, maturities[i], spreads[i], 0.4, dc, curves[i])
+    print(f"Trade {i}: book = {result['pv'][i]:,.2f}, pricer = {pricer.price():,.2f}, RPV01 = {result['rpv01'][i]:.4f}")
+
+# Par spread ladder for one name, 1Y-10Y in one call
+pricer = CDSPricer(1e7, 5, 100, 0.4, dc, hc_ig)
+ladder = np.arange(1, 11)
+for tenor, par in zip(ladder, pricer.par_spread(ladder)):
+    print(f"{tenor}Y par spread: {par:.2f} bps")
+print("5Y breakdown:", pricer.breakdown())
+
+# IMM-dated trade: the ladder and greeks use the same schedules as price()
+pricer = CDSPricer(1e7, 5, 100, 0.4, dc, hc_ig, trade_date="2025-05-27")
+ladder_pv = pricer.breakdown([1, 3, 5])["pv"]
+for tenor, pv in zip([1, 3, 5], ladder_pv):
+    single = CDSPricer(1e7, tenor, 100, 0.4, dc, hc_ig, trade_date="2025-05-27").price()
+    print(f"IMM {tenor}Y: ladder = {pv:,.2f}, pricer = {single:,.2f}")
+print("IMM 5Y greeks:", pricer.greeks())
+
+# Closed-form greeks against central bump-and-reprice, off the coupon grid (4.3Y)
+from pricers.curves import HazardCurve
+reprice = lambda maturity=4.3, spread=100, dc=dc, hc=hc_ig: CDSPricer(1e7, maturity, spread, 0.4, dc, hc).price()
+hazard = lambda e: HazardCurve(hc_ig.tenors, hc_ig.hazard_rates + e)
+day = 1 / 365
+bumped = {
+    "delta": (reprice(spread=101) - reprice(spread=99)) / 2,
+    "HR01": (reprice(hc=hazard(1e-4)) - reprice(hc=hazard(-1e-4))) / 2,
+    "gamma": reprice(hc=hazard(1e-4)) - 2 * reprice() + reprice(hc=hazard(-1e-4)),
+    "IR01": (reprice(dc=dc.shifted(1e-4)) - reprice(dc=dc.shifted(-1e-4))) / 2,
+    "theta": -(reprice(maturity=4.3 + day) - reprice(maturity=4.3 - day)) / 2,
+}
+greeks = CDSPricer(1e7, 4.3, 100, 0.4, dc, hc_ig).greeks()
+for name, value in bumped.items():
+    print(f"4.3Y {name}: closed form = {greeks[name]:.6f}, bump = {value:.6f}")
+
+# 100k trades: on standard tenors, and with every maturity distinct
+import time
+n = 100_000
+for label, book_maturities in (("standard tenors", rng.choice([1, 3, 5, 7, 10], n)),
+                               ("distinct maturities", rng.uniform(0.5, 10, n))):
+    book = CDSBook(1e7, book_maturities, rng.uniform(50, 400, n), 0.4, dc,
+                   [hc_ig if i % 2 == 0 else hc_hy for i in range(n)])
+    start = time.perf_counter()
+    pv = book.price()
+    print(f"100k trades, {label}: PV {pv.sum():,.0f} in {time.perf_counter() - start:.3f}s")
@@ -70,3 +70,8 @@ pricer = CreditOptionPricer(
 )
 
 print("CDS Option Price: ", round(pricer.price(), 2))
+
+# TRS on its own bond-style coupon schedule
+pricer = TRSPricer(1e7, 5.0, 100, 0.05, 0.4, discount_curve, hazard_curve, trade_date="2025-05-27")
+print("TRS schedule:", pricer._schedule().payment_dates[:3], pricer._schedule().accruals[:3])
+print(f"Dated TRS price: {pricer.price():,.2f}")
@@ -0,0 +1,35 @@
+import os
+import tempfile
+import numpy as np
+from data.curve_store import CurveHistoryStore
+
+store = CurveHistoryStore(tempfile.mkdtemp())
+tenors = [1.0, 3.0, 5.0]
+dates = np.arange(np.datetime64("2025-01-01"), np.datetime64("2025-01-11"))
+values = np.random.default_rng(0).uniform(0.9, 1.0, (len(dates), len(tenors)))
+
+# Round trip: two appends read back exactly
+store.append("discount_curve", dates[:6], values[:6], tenors)
+store.append("discount_curve", dates[6:8], values[6:8])
+stored_dates, stored_values = store.range("discount_curve")
+print("Round trip dates match:", np.array_equal(stored_dates, dates[:8]))
+print("Round trip values match:", np.array_equal(stored_values, values[:8]))
+print("2025-01-03:", store.get("discount_curve", "2025-01-03"))
+
+# Crash after the values were written but before the date: an orphan row
+path = os.path.join(store.directory, "discount_curve")
+with open(os.path.join(path, "values.f8"), "ab") as f:
+    f.write(np.full(len(tenors), -1.0).tobytes())
+print("Dates visible after crash:", len(CurveHistoryStore(store.directory).range("discount_curve")[0]))
+
+# Crash half way through a date as well
+with open(os.path.join(path, "dates.i8"), "ab") as f:
+    f.write(b"\x00" * 3)
+
+# The next append drops the leftovers, so later dates keep their own rows
+recovered = CurveHistoryStore(store.directory)
+recovered.append("discount_curve", dates[8:], values[8:])
+stored_dates, stored_values = CurveHistoryStore(store.directory).range("discount_curve")
+print("Recovered dates match:", np.array_equal(stored_dates, dates))
+print("Recovered values match:", np.array_equal(stored_values, values))
+print("File sizes:", os.path.getsize(os.path.join(path, "dates.i8")), os.path.getsize(os.path.join(path, "values.f8")))
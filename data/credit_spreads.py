@@ -1,49 +1,36 @@
-import yfinance as yf
 import pandas as pd
 import numpy as np
-from datetime import datetime
+from datetime import datetime, date, timedelta
 from scipy.interpolate import interp1d
+from data.fetch import FETCHER, TREASURY_SERIES, fetch_treasury_curve
 
 
-def fetch_treasury_yields():
+def fetch_treasury_yields(fetcher=None):
     """
-    Fetch U.S. Treasury yields from FRED via yfinance.
+    Fetch U.S. Treasury yields from FRED (all maturities concurrently,
+    cached in data_store; see data.fetch).
     Returns: DataFrame with maturities and yields
     """
-    treasury_symbols = {
-        "DGS1MO": 1/12,
-        "DGS3MO": 0.25,
-        "DGS6MO": 0.5,
-        "DGS1": 1,
-        "DGS2": 2,
-        "DGS3": 3,
-        "DGS5": 5,
-        "DGS7": 7,
-        "DGS10": 10,
-        "DGS20": 20,
-        "DGS30": 30
-    }
-
-    data = yf.download(list(treasury_symbols.keys()), period="5d", interval="1d")["Adj Close"]
-    latest = data.dropna().iloc[-1]
+    curve = fetch_treasury_curve(fetcher)
 
     yields = pd.DataFrame({
-        "Maturity": [treasury_symbols[sym] for sym in latest.index],
-        "Treasury_Yield": latest.values / 100  # convert % to decimal
+        "Maturity": [tenor for tenor, _ in curve],
+        "Treasury_Yield": [rate for _, rate in curve]  # already in decimal
     })
 
     return yields.sort_values(by="Maturity").reset_index(drop=True)
 
 
-def fetch_issuer_yields(issuer_ticker):
+def fetch_issuer_yields(issuer_ticker, fetcher=None):
     """
     Fetch historical YTM-like proxy from issuer ETF or bond index (e.g., LQD, JPM, AAPL).
     Returns a flat curve for demo purposes.
 
     You can expand this later using FINRA TRACE or actual bond yields.
     """
-    data = yf.download(issuer_ticker, period="5d", interval="1d")["Adj Close"]
-    price = data.dropna().iloc[-1]
+    fetcher = fetcher or FETCHER
+    end = date.today()
+    price = fetcher.fetch_latest("yahoo", [issuer_ticker], end - timedelta(days=7), end).get(issuer_ticker)
 
     # Simulated yield curve shape for issuer
     # Until we integrate real bond curve data, or direct CDS spreads, we need to make do with this
@@ -67,8 +54,15 @@ def build_credit_spread_curve(issuer_curve, treasury_curve):
     return issuer_curve
 
 
-def get_credit_spread_pipeline(issuer_ticker="LQD"):
-    treasury = fetch_treasury_yields()
-    issuer = fetch_issuer_yields(issuer_ticker)
+def get_credit_spread_pipeline(issuer_ticker="LQD", fetcher=None):
+    fetcher = fetcher or FETCHER
+    end = date.today()
+    start = end - timedelta(days=7)
+    # Issue the Treasury and issuer downloads as one concurrent batch; the loaders below then read the store
+    fetcher.fetch([("fred", code, start, end) for code, _ in TREASURY_SERIES.values()]
+                  + [("yahoo", issuer_ticker, start, end)])
+
+    treasury = fetch_treasury_yields(fetcher)
+    issuer = fetch_issuer_yields(issuer_ticker, fetcher)
     spread_df = build_credit_spread_curve(issuer, treasury)
     return spread_df
@@ -0,0 +1,169 @@
+# data/curve_store.py
+
+import glob
+import json
+import os
+import numpy as np
+import pandas as pd
+
+STORE_DIR = "data_store/curve_history"
+
+
+class CurveHistoryStore:
+    def __init__(self, directory=STORE_DIR):
+        """
+        Columnar history of daily curves, one (dates x tenors) array per curve.
+
+        Each curve lives in directory/<name>/ as three files:
+        - meta.json: the tenor grid
+        - dates.i8: int64 day numbers (datetime64[D]), strictly increasing
+        - values.f8: float64 rows, one per date, one column per tenor
+
+        Writes only ever append bytes to the two data files, and reads map
+        them with np.memmap, so a range query touches just the pages of the
+        requested rows and returns views into the mapping (no parsing, no
+        copies). A date whose row is incomplete (e.g. an interrupted write)
+        is ignored, and the next append truncates the leftover bytes.
+
+        Curve names may contain '/' to group curves, e.g. "cds/ACME".
+        """
+        self.directory = directory
+        self._maps = {}
+
+    def _dir(self, name):
+        return os.path.join(self.directory, *name.split("/"))
+
+    def names(self):
+        """Every stored curve name."""
+        paths = glob.glob(os.path.join(self.directory, "**", "meta.json"), recursive=True)
+        return sorted(os.path.relpath(os.path.dirname(p), self.directory).replace(os.sep, "/") for p in paths)
+
+    def __contains__(self, name):
+        return os.path.exists(os.path.join(self._dir(name), "meta.json"))
+
+    def tenors(self, name):
+        with open(os.path.join(self._dir(name), "meta.json")) as f:
+            return np.array(json.load(f)["tenors"], dtype=float)
+
+    def _load(self, name):
+        """(dates, values) memory maps, cached until the next append."""
+        maps = self._maps.get(name)
+        if maps is not None:
+            return maps
+        if name not in self:
+            raise KeyError(f"no curve history named {name!r}")
+        path = self._dir(name)
+        tenors = self.tenors(name)
+        rows = min(os.path.getsize(os.path.join(path, "dates.i8")) // 8,
+                   os.path.getsize(os.path.join(path, "values.f8")) // (8 * len(tenors)))
+        if rows == 0:
+            maps = (np.empty(0, dtype="datetime64[D]"), np.empty((0, len(tenors))))
+        else:
+            dates = np.memmap(os.path.join(path, "dates.i8"), dtype="<i8", mode="r", shape=(rows,))
+            values = np.memmap(os.path.join(path, "values.f8"), dtype="<f8", mode="r", shape=(rows, len(tenors)))
+            maps = (dates.view("datetime64[D]"), values)
+        self._maps[name] = maps
+        return maps
+
+    def append(self, name, dates, values, tenors=None):
+        """
+        Appends one or more dates to a curve.
+
+        dates: a date or a sequence of dates, later than the last stored date
+        values: array of shape (tenors,) or (len(dates), tenors)
+        tenors: required for a new curve; must match the stored grid otherwise
+        """
+        dates = np.atleast_1d(np.asarray(dates, dtype="datetime64[D]"))
+        values = np.asarray(values, dtype="<f8").reshape(len(dates), -1)
+        if len(dates) > 1 and np.any(np.diff(dates.astype(np.int64)) <= 0):
+            raise ValueError("dates must be strictly increasing")
+
+        path = self._dir(name)
+        if name not in self:
+            if tenors is None:
+                raise ValueError(f"tenors are required to create curve {name!r}")
+            os.makedirs(path, exist_ok=True)
+            for data_file in ("dates.i8", "values.f8"):
+                open(os.path.join(path, data_file), "wb").close()
+            with open(os.path.join(path, "meta.json"), "w") as f:
+                json.dump({"tenors": [float(t) for t in tenors]}, f)
+        stored_tenors = self.tenors(name)
+        if tenors is not None and not np.array_equal(np.asarray(tenors, dtype=float), stored_tenors):
+            raise ValueError(f"tenors do not match the stored grid for {name!r}")
+        if values.shape[1] != len(stored_tenors):
+            raise ValueError(f"expected {len(stored_tenors)} values per date, got {values.shape[1]}")
+
+        stored_dates, _ = self._load(name)
+        if len(stored_dates) and dates[0] <= stored_dates[-1]:
+            raise ValueError(f"{name!r} already has data up to {stored_dates[-1]}; history is append-only")
+
+        # Drop any tail left by an interrupted append (an orphan row or a partial
+        # date) so the new rows line up with the stored dates
+        rows = len(stored_dates)
+        os.truncate(os.path.join(path, "values.f8"), rows * len(stored_tenors) * 8)
+        os.truncate(os.path.join(path, "dates.i8"), rows * 8)
+
+        # Values first: a date is only visible once its full row is on disk
+        self._maps.pop(name, None)
+        with open(os.path.join(path, "values.f8"), "ab") as f:
+            f.write(values.tobytes())
+        with open(os.path.join(path, "dates.i8"), "ab") as f:
+            f.write(dates.astype("<i8").tobytes())
+
+    def range(self, name, start=None, end=None):
+        """
+        Rows with start <= date <= end (open-ended when None), as views into
+        the memory map.
+
+        Returns: (dates as datetime64[D], values of shape (dates, tenors))
+        """
+        dates, values = self._load(name)
+        lo = 0 if start is None else np.searchsorted(dates, np.datetime64(start, "D"), side="left")
+        hi = len(dates) if end is None else np.searchsorted(dates, np.datetime64(end, "D"), side="right")
+        return dates[lo:hi], values[lo:hi]
+
+    def get(self, name, date):
+        """Curve on `date` as {tenor: value}; KeyError if the date is not stored."""
+        dates, values = self.range(name, date, date)
+        if not len(dates):
+            raise KeyError(f"{name!r} has no data for {date}")
+        return dict(zip(self.tenors(name).tolist(), values[0].tolist()))
+
+    def frame(self, name, start=None, end=None):
+        """Range as a DataFrame indexed by date with one column per tenor."""
+        dates, values = self.range(name, start, end)
+        return pd.DataFrame(values, index=pd.DatetimeIndex(dates, name="date"), columns=self.tenors(name))
+
+
+def import_discount_curve_csvs(store, csv_dir="data_store/discount_curve", name="discount_curve"):
+    """
+    One-shot import of the daily YYYY-MM-DD.csv files written by
+    data.discount_curve.fetch_discount_curve into `store`.
+
+    Tenors are the union over all files; a tenor missing on a date is NaN.
+    Dates already in the store are skipped, so re-running only adds new files.
+
+    Returns: number of dates imported
+    """
+    frames = {}
+    for path in sorted(glob.glob(os.path.join(csv_dir, "*.csv"))):
+        day = np.datetime64(os.path.splitext(os.path.basename(path))[0], "D")
+        df = pd.read_csv(path, float_precision="round_trip")
+        frames[day] = df.set_index("time")["discount_factor"]
+    if not frames:
+        return 0
+
+    table = pd.DataFrame(frames).T.sort_index()
+    if name in store:
+        stored_tenors = store.tenors(name)
+        table = table.reindex(columns=stored_tenors)
+        last = store.range(name)[0]
+        if len(last):
+            table = table[table.index > last[-1]]
+        tenors = stored_tenors
+    else:
+        table = table.reindex(columns=sorted(table.columns))
+        tenors = table.columns.to_numpy(dtype=float)
+    if len(table):
+        store.append(name, table.index.to_numpy(dtype="datetime64[D]"), table.to_numpy(dtype=float), tenors)
+    return len(table)
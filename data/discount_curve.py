@@ -1,68 +1,37 @@
-import os
 import datetime
 import numpy as np
 import pandas as pd
 from scipy.interpolate import CubicSpline
-from pandas_datareader.data import DataReader
+from data.fetch import TREASURY_SERIES, fetch_treasury_curve
+from data.curve_store import CurveHistoryStore
 
 # Configuration
-DIR_PATH = "data_store/discount_curve"
-
-def fetch_discount_curve():
-    os.makedirs(DIR_PATH, exist_ok=True)
-    date_str = datetime.datetime.today().strftime("%Y-%m-%d")
-    path = os.path.join(DIR_PATH, f"{date_str}.csv")
-
-    if os.path.exists(path):
-        df = pd.read_csv(path)
-        return df
-
-    # Treasury yield FRED codes
-    tickers = {
-        '1M': 'DGS1MO',
-        '3M': 'DGS3MO',
-        '6M': 'DGS6MO',
-        '1Y': 'DGS1',
-        '2Y': 'DGS2',
-        '3Y': 'DGS3',
-        '5Y': 'DGS5',
-        '7Y': 'DGS7',
-        '10Y': 'DGS10',
-        '20Y': 'DGS20',
-        '30Y': 'DGS30'
-    }
-
-    tenor_years = {
-        '1M': 1 / 12,
-        '3M': 0.25,
-        '6M': 0.5,
-        '1Y': 1,
-        '2Y': 2,
-        '3Y': 3,
-        '5Y': 5,
-        '7Y': 7,
-        '10Y': 10,
-        '20Y': 20,
-        '30Y': 30
-    }
-
-    # Fetch latest yield data
-    end = datetime.datetime.today()
-    start = end - datetime.timedelta(days=7)
-
-    data = []
-    for label, fred_code in tickers.items():
-        try:
-            df = DataReader(fred_code, 'fred', start, end)
-            rate = df.ffill().iloc[-1, 0] / 100  # Convert to decimal
-            time = tenor_years[label]
-            discount = np.exp(-rate * time)
-            data.append({'time': time, 'discount_factor': discount})
-        except Exception as e:
-            print(f"Warning: Could not fetch {label}: {e}")
-
-    df_curve = pd.DataFrame(data).sort_values('time')
-
-    df_curve.to_csv(path, index=False)
-    return data
-
+DIR_PATH = "data_store/discount_curve"  # legacy one-CSV-per-day files (see curve_store.import_discount_curve_csvs)
+CURVE_NAME = "discount_curve"
+TENORS = sorted(tenor for _, tenor in TREASURY_SERIES.values())
+
+def fetch_discount_curve(fetcher=None, store=None):
+    store = store or CurveHistoryStore()
+    today = datetime.date.today()
+
+    # Only a complete row is served from the store; older partial rows are refetched
+    stored = False
+    if CURVE_NAME in store:
+        dates, values = store.range(CURVE_NAME, today, today)
+        stored = len(dates) > 0
+        if stored and not np.isnan(values[0]).any():
+            return pd.DataFrame({'time': store.tenors(CURVE_NAME), 'discount_factor': values[0]})
+
+    # All Treasury series are requested concurrently and cached under data_store/fred
+    data = [{'time': tenor, 'discount_factor': np.exp(-rate * tenor)}
+            for tenor, rate in fetch_treasury_curve(fetcher)]
+    if not data:
+        raise RuntimeError("no Treasury series could be fetched for the discount curve")
+
+    df_curve = pd.DataFrame(data).sort_values('time').reset_index(drop=True)
+
+    # One row per day in the columnar history, stored once every tenor has arrived:
+    # the store is append-only, and a partial curve is retried on the next call
+    if len(df_curve) == len(TENORS) and not stored:
+        store.append(CURVE_NAME, today, df_curve['discount_factor'].to_numpy(), tenors=TENORS)
+    return df_curve
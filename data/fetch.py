@@ -0,0 +1,174 @@
+# data/fetch.py
+
+import datetime
+import io
+import os
+import time
+import urllib.parse
+import urllib.request
+from concurrent.futures import ThreadPoolExecutor
+import pandas as pd
+
+STORE_DIR = "data_store"
+
+# Treasury constant-maturity yields on FRED: label -> (series code, tenor in years)
+TREASURY_SERIES = {
+    '1M': ('DGS1MO', 1 / 12),
+    '3M': ('DGS3MO', 0.25),
+    '6M': ('DGS6MO', 0.5),
+    '1Y': ('DGS1', 1),
+    '2Y': ('DGS2', 2),
+    '3Y': ('DGS3', 3),
+    '5Y': ('DGS5', 5),
+    '7Y': ('DGS7', 7),
+    '10Y': ('DGS10', 10),
+    '20Y': ('DGS20', 20),
+    '30Y': ('DGS30', 30),
+}
+
+
+def fred_transport(base_url="https://fred.stlouisfed.org/graph/fredgraph.csv"):
+    """
+    Transport for FRED's CSV download endpoint. Point `base_url` at a local
+    server speaking the same protocol (?id=&cosd=&coed=, CSV with a date
+    column and one value column, '.' for missing) to run without FRED.
+    """
+    def fetch(series, start, end, timeout):
+        query = urllib.parse.urlencode({"id": series, "cosd": start.isoformat(), "coed": end.isoformat()})
+        with urllib.request.urlopen(f"{base_url}?{query}", timeout=timeout) as response:
+            body = response.read().decode()
+        df = pd.read_csv(io.StringIO(body), index_col=0, parse_dates=True, na_values=".")
+        df.columns = [series]
+        df.index.name = "date"
+        return df
+    return fetch
+
+
+def yahoo_transport():
+    """Transport for Yahoo Finance daily adjusted closes (needs yfinance)."""
+    def fetch(series, start, end, timeout):
+        import yfinance as yf
+
+        data = yf.download(series, start=start, end=end + datetime.timedelta(days=1), interval="1d",
+                           auto_adjust=False, progress=False, timeout=timeout)
+        close = data["Adj Close"]
+        df = close.to_frame() if isinstance(close, pd.Series) else close.iloc[:, :1]
+        df.columns = [series]
+        df.index.name = "date"
+        return df
+    return fetch
+
+
+class MarketDataFetcher:
+    def __init__(self, transports=None, timeouts=10.0, retries=2, backoff=0.5,
+                 max_workers=8, store_dir=STORE_DIR):
+        """
+        Fetches market data series concurrently and caches them in data_store.
+
+        Every request is a (source, series, start, end) tuple. Requests found
+        in the store are read from disk; the rest are issued together on a
+        thread pool, each with its source's timeout and up to `retries`
+        retries with exponential backoff. Downloads are written to
+        store_dir/<source>/<series>/<start>_<end>.csv, so a warm start does
+        no network I/O.
+
+        transports: {source: callable(series, start, end, timeout) -> DataFrame
+            indexed by date with one column}; defaults to FRED and Yahoo
+        timeouts: float, or {source: seconds}
+        retries: int, extra attempts per series after a failure
+        backoff: float, seconds before the first retry (doubles each retry)
+        max_workers: int, concurrent downloads
+        store_dir: str, root of the on-disk cache (None disables it)
+        """
+        self.transports = transports if transports is not None else {
+            "fred": fred_transport(),
+            "yahoo": yahoo_transport(),
+        }
+        self.timeouts = timeouts
+        self.retries = retries
+        self.backoff = backoff
+        self.max_workers = max_workers
+        self.store_dir = store_dir
+        self.errors = {}
+        self.downloads = 0
+        self.cache_hits = 0
+
+    def _timeout(self, source):
+        return self.timeouts.get(source, 10.0) if isinstance(self.timeouts, dict) else self.timeouts
+
+    def _path(self, source, series, start, end):
+        return os.path.join(self.store_dir, source, series, f"{start:%Y-%m-%d}_{end:%Y-%m-%d}.csv")
+
+    def _download(self, source, series, start, end):
+        transport = self.transports[source]
+        for attempt in range(self.retries + 1):
+            try:
+                return transport(series, start, end, self._timeout(source))
+            except Exception:
+                if attempt == self.retries:
+                    raise
+                time.sleep(self.backoff * 2 ** attempt)
+
+    def fetch(self, requests):
+        """
+        requests: iterable of (source, series, start, end) with date or
+        datetime bounds.
+
+        Returns: {series: DataFrame}; series that could not be fetched are
+        left out and their exception is kept in `errors`.
+        """
+        results, pending = {}, []
+        for source, series, start, end in requests:
+            start, end = pd.Timestamp(start).date(), pd.Timestamp(end).date()
+            path = None if self.store_dir is None else self._path(source, series, start, end)
+            if path is not None and os.path.exists(path):
+                self.cache_hits += 1
+                results[series] = pd.read_csv(path, index_col=0, parse_dates=True)
+            else:
+                pending.append((source, series, start, end))
+
+        if pending:
+            with ThreadPoolExecutor(max_workers=min(self.max_workers, len(pending))) as pool:
+                futures = [(request, pool.submit(self._download, *request)) for request in pending]
+                for (source, series, start, end), future in futures:
+                    self.downloads += 1
+                    try:
+                        df = future.result()
+                    except Exception as e:
+                        print(f"Warning: Could not fetch {series} from {source}: {e}")
+                        self.errors[series] = e
+                        continue
+                    if self.store_dir is not None:
+                        path = self._path(source, series, start, end)
+                        os.makedirs(os.path.dirname(path), exist_ok=True)
+                        df.to_csv(path)
+                    results[series] = df
+        return results
+
+    def fetch_latest(self, source, series, start, end):
+        """Last available (forward-filled) value of each series in [start, end]: {series: value}."""
+        frames = self.fetch((source, name, start, end) for name in series)
+        latest = {}
+        for name, df in frames.items():
+            values = df.iloc[:, 0].ffill().dropna()
+            if len(values):
+                latest[name] = float(values.iloc[-1])
+        return latest
+
+
+def fetch_treasury_curve(fetcher=None, end=None, lookback_days=7):
+    """
+    Latest Treasury constant-maturity yields from FRED, all series fetched
+    concurrently.
+
+    Returns: list of (tenor in years, yield as decimal), sorted by tenor
+    """
+    fetcher = fetcher or FETCHER
+    end = end or datetime.date.today()
+    start = end - datetime.timedelta(days=lookback_days)
+    latest = fetcher.fetch_latest("fred", [code for code, _ in TREASURY_SERIES.values()], start, end)
+    return sorted((tenor, latest[code] / 100) for code, tenor in TREASURY_SERIES.values() if code in latest)
+
+
+# Shared by the curve and spread loaders
+FETCHER = MarketDataFetcher()
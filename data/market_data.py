@@ -2,6 +2,8 @@
 
 from datetime import date
 from typing import Dict
+import numpy as np
+import pandas as pd
 
 
 class MarketDataProvider:
@@ -32,3 +34,161 @@ class MarketDataProvider:
 
     def available_dates(self):
         return sorted(self.curves_by_date.keys())
+
+
+def _tenor_keys(tenors):
+    """Tenors as dict keys, integral ones as int (as MarketDataProvider callers use them)."""
+    return [int(t) if float(t).is_integer() else float(t) for t in tenors]
+
+
+class ArrayMarketDataProvider:
+    def __init__(self, dates, yield_tenors, yields, spread_tenors, spreads, issuers=None):
+        """
+        MarketDataProvider backed by dense arrays: yields are (dates x tenors)
+        and spreads (dates x tenors), or (dates x issuers x tenors) for
+        several reference entities. Dates are kept sorted, so a date lookup
+        is a binary search and a date range is a slice (a view, also of
+        memory-mapped inputs). Drop-in for Backtester.
+
+        Parameters:
+        - dates: market dates (any order, no duplicates)
+        - yield_tenors, yields: tenor grid (years) and yields as decimals
+        - spread_tenors, spreads: tenor grid (years) and spreads in bps
+        - issuers: names along the issuer axis of 3-D spreads; the first is
+          the default for get_cds_spreads
+        """
+        dates = np.asarray(dates, dtype="datetime64[D]")
+        order = np.argsort(dates, kind="stable")
+        if not np.all(order == np.arange(len(order))):
+            yields, spreads = np.asarray(yields)[order], np.asarray(spreads)[order]
+            dates = dates[order]
+        if len(dates) > 1 and np.any(dates[1:] == dates[:-1]):
+            raise ValueError("dates must be unique")
+
+        self.dates = dates
+        self.yield_tenors = np.asarray(yield_tenors, dtype=float)
+        self.spread_tenors = np.asarray(spread_tenors, dtype=float)
+        self.yields = yields
+        self.spreads = spreads
+        self.issuers = None if issuers is None else list(issuers)
+        if (np.ndim(spreads) == 3) != (issuers is not None):
+            raise ValueError("pass issuers exactly when spreads are (dates x issuers x tenors)")
+        self._issuer_rows = None if issuers is None else {name: i for i, name in enumerate(self.issuers)}
+        self._yield_keys = _tenor_keys(self.yield_tenors)
+        self._spread_keys = _tenor_keys(self.spread_tenors)
+        self._date_list = None
+
+    def _row(self, market_date):
+        day = np.datetime64(market_date, "D")
+        row = np.searchsorted(self.dates, day)
+        if row == len(self.dates) or self.dates[row] != day:
+            raise KeyError(market_date)
+        return row
+
+    def _window(self, start, end):
+        lo = 0 if start is None else np.searchsorted(self.dates, np.datetime64(start, "D"), side="left")
+        hi = len(self.dates) if end is None else np.searchsorted(self.dates, np.datetime64(end, "D"), side="right")
+        return slice(lo, hi)
+
+    def _issuer_spreads(self, spreads, issuer):
+        if self.issuers is None:
+            if issuer is not None:
+                raise ValueError("this provider holds a single spread curve")
+            return spreads
+        return spreads[..., self._issuer_rows[self.issuers[0] if issuer is None else issuer], :]
+
+    def get_treasury_yields(self, market_date: date) -> Dict[int, float]:
+        return dict(zip(self._yield_keys, np.asarray(self.yields[self._row(market_date)]).tolist()))
+
+    def get_cds_spreads(self, market_date: date, issuer=None) -> Dict[int, float]:
+        row = self._issuer_spreads(self.spreads[self._row(market_date)], issuer)
+        return dict(zip(self._spread_keys, np.asarray(row).tolist()))
+
+    def get_treasury_yields_range(self, start=None, end=None):
+        """Returns: (dates, yields of shape (dates, tenors)) for start <= date <= end."""
+        window = self._window(start, end)
+        return self.dates[window], self.yields[window]
+
+    def get_cds_spreads_range(self, start=None, end=None, issuer=None):
+        """
+        Returns: (dates, spreads) for start <= date <= end; spreads are
+        (dates, tenors) for one issuer, or (dates, issuers, tenors) with
+        issuer="all" on a multi-issuer provider.
+        """
+        window = self._window(start, end)
+        spreads = self.spreads[window]
+        return self.dates[window], spreads if issuer == "all" else self._issuer_spreads(spreads, issuer)
+
+    def available_dates(self):
+        if self._date_list is None:
+            self._date_list = self.dates.astype(object).tolist()
+        return self._date_list
+
+    def window(self, start=None, end=None):
+        """Provider restricted to start <= date <= end (views, no copies)."""
+        window = self._window(start, end)
+        return ArrayMarketDataProvider(self.dates[window], self.yield_tenors, self.yields[window],
+                                       self.spread_tenors, self.spreads[window], self.issuers)
+
+    @classmethod
+    def from_provider(cls, provider):
+        """Converts a dict-based MarketDataProvider (all dates must share one tenor grid)."""
+        dates = provider.available_dates()
+        yield_tenors = sorted(provider.get_treasury_yields(dates[0]))
+        spread_tenors = sorted(provider.get_cds_spreads(dates[0]))
+        yields = np.array([[provider.get_treasury_yields(d)[t] for t in yield_tenors] for d in dates], dtype=float)
+        spreads = np.array([[provider.get_cds_spreads(d)[t] for t in spread_tenors] for d in dates], dtype=float)
+        return cls(dates, yield_tenors, yields, spread_tenors, spreads)
+
+    @classmethod
+    def from_store(cls, store, yield_curve="treasury_yields", spread_curve="cds_spreads", start=None, end=None):
+        """
+        Loads from a data.curve_store.CurveHistoryStore. Only [start, end] is
+        mapped, and pages are read from disk as the backtest touches them.
+        Dates missing from either curve are dropped.
+        """
+        yield_dates, yields = store.range(yield_curve, start, end)
+        spread_dates, spreads = store.range(spread_curve, start, end)
+        if not np.array_equal(yield_dates, spread_dates):
+            common = np.intersect1d(yield_dates, spread_dates)
+            yields = yields[np.searchsorted(yield_dates, common)]
+            spreads = spreads[np.searchsorted(spread_dates, common)]
+            yield_dates = common
+        return cls(yield_dates, store.tenors(yield_curve), yields, store.tenors(spread_curve), spreads)
+
+    @classmethod
+    def _from_frames(cls, yields, spreads):
+        yields.index = pd.to_datetime(yields.index)
+        spreads.index = pd.to_datetime(spreads.index)
+        dates = yields.index.intersection(spreads.index).sort_values()
+        return cls(dates.to_numpy(dtype="datetime64[D]"),
+                   yields.columns.astype(float), yields.loc[dates].to_numpy(dtype=float),
+                   spreads.columns.astype(float), spreads.loc[dates].to_numpy(dtype=float))
+
+    @classmethod
+    def from_csv(cls, yields_path, spreads_path, start=None, end=None):
+        """
+        Loads wide CSVs: a date column, then one column per tenor (header is
+        the tenor in years). Rows outside [start, end] are dropped after parsing.
+        """
+        frames = []
+        for path in (yields_path, spreads_path):
+            df = pd.read_csv(path, index_col=0, parse_dates=True)
+            frames.append(df.loc[start:end])
+        return cls._from_frames(*frames)
+
+    @classmethod
+    def from_parquet(cls, yields_path, spreads_path, start=None, end=None, date_column="date"):
+        """
+        Loads wide Parquet files (a date column plus one column per tenor).
+        The date window is pushed down as a filter, so only the matching row
+        groups are read (needs pyarrow).
+        """
+        filters = []
+        if start is not None:
+            filters.append((date_column, ">=", pd.Timestamp(start)))
+        if end is not None:
+            filters.append((date_column, "<=", pd.Timestamp(end)))
+        frames = [pd.read_parquet(path, filters=filters or None).set_index(date_column)
+                  for path in (yields_path, spreads_path)]
+        return cls._from_frames(*frames)
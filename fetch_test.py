@@ -0,0 +1,72 @@
+import tempfile
+import threading
+import time
+from datetime import date
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import urlparse, parse_qs
+
+from data.fetch import MarketDataFetcher, fred_transport, fetch_treasury_curve
+
+
+# Local stand-in for FRED's CSV endpoint
+class StubFRED(BaseHTTPRequestHandler):
+    def do_GET(self):
+        series = parse_qs(urlparse(self.path).query)["id"][0]
+        time.sleep(0.2)  # simulated network latency
+        body = f"observation_date,{series}\n2025-05-26,4.50\n2025-05-27,.\n"
+        self.send_response(200)
+        self.end_headers()
+        self.wfile.write(body.encode())
+
+    def log_message(self, *args):
+        pass
+
+
+server = ThreadingHTTPServer(("127.0.0.1", 0), StubFRED)
+threading.Thread(target=server.serve_forever, daemon=True).start()
+url = f"http://127.0.0.1:{server.server_port}/fredgraph.csv"
+
+store = tempfile.mkdtemp()
+fetcher = MarketDataFetcher(transports={"fred": fred_transport(url)}, timeouts={"fred": 2.0}, store_dir=store)
+
+start = time.time()
+curve = fetch_treasury_curve(fetcher, end=date(2025, 5, 28))
+print(f"Cold fetch: {len(curve)} series in {time.time() - start:.2f}s (serial would be ~{0.2 * len(curve):.1f}s)")
+print("Curve:", curve[:3], "...")
+
+start = time.time()
+fetch_treasury_curve(fetcher, end=date(2025, 5, 28))
+print(f"Warm fetch: {time.time() - start:.3f}s")
+print("Downloads:", fetcher.downloads, "Cache hits:", fetcher.cache_hits)
+
+server.shutdown()
+
+# Discount curve: a day with failed series is not stored and the missing tenors are retried
+import pandas as pd
+from data.curve_store import CurveHistoryStore
+from data.discount_curve import fetch_discount_curve
+
+failing = {"DGS20", "DGS30"}
+
+def flaky(series, start, end, timeout):
+    if series in failing:
+        raise ConnectionError("stub outage")
+    return pd.DataFrame({series: [4.5]}, index=pd.DatetimeIndex([start], name="date"))
+
+fetcher = MarketDataFetcher(transports={"fred": flaky}, retries=0, store_dir=tempfile.mkdtemp())
+curves = CurveHistoryStore(tempfile.mkdtemp())
+partial = fetch_discount_curve(fetcher, curves)
+print(f"Partial fetch: {len(partial)} tenors, stored = {'discount_curve' in curves}")
+failing.clear()
+full = fetch_discount_curve(fetcher, curves)
+print(f"Retry: {len(full)} tenors, stored = {'discount_curve' in curves}, downloads = {fetcher.downloads}")
+print(f"Warm read: {len(fetch_discount_curve(fetcher, curves))} tenors, downloads = {fetcher.downloads}")
+
+def outage(series, start, end, timeout):
+    raise ConnectionError("stub outage")
+
+try:
+    fetch_discount_curve(MarketDataFetcher(transports={"fred": outage}, retries=0, store_dir=None),
+                         CurveHistoryStore(tempfile.mkdtemp()))
+except RuntimeError as e:
+    print("Nothing fetched:", e)
@@ -0,0 +1,19 @@
+from analytics.historical_var import HistoricalVaR
+from var_test_data import cds_positions, simulated_market
+
+# Two years of simulated yields and spreads for two issuers
+market_data = simulated_market()
+dc, positions, issuers, names = cds_positions(market_data)
+
+var = HistoricalVaR(positions, market_data, issuers=issuers, names=names)
+result = var.run(confidence=0.99)
+print(f"1-day 99% VaR: {result['VaR']:,.2f}")
+print(f"1-day 99% ES:  {result['ES']:,.2f}")
+print("Component VaR:")
+print(result["component_VaR"].round(2))
+print("Bootstrap diagnostics:", var.diagnostics)
+
+# Two iterations per tenor at a looser tolerance: "unconverged" is judged against the tolerance given
+loose = HistoricalVaR(positions, market_data, issuers=issuers, tol=3e-4, max_iter=2)
+loose.scenario_market()
+print("Bootstrap diagnostics at tol=3e-4, max_iter=2:", loose.diagnostics)
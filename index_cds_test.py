@@ -0,0 +1,33 @@
+import numpy as np
+from pricers.index_cds_pricer import IndexCDSPricer
+from analytics.curve_construction import DiscountCurveBuilder, HazardCurveBuilder
+
+# Index of 20 names on three credit levels
+dc = DiscountCurveBuilder([(1, 0.05), (3, 0.055), (5, 0.06)]).build_curve()
+def names(widening=0):
+    levels = [HazardCurveBuilder([(1, s + widening), (3, s + 20 + widening), (5, s + 40 + widening)], dc).build_curve()
+              for s in (60, 150, 300)]
+    return [levels[i % 3] for i in range(20)]
+
+curves = names()
+
+def index_pricer(constituents):
+    return IndexCDSPricer(1e7, 5.0, 60, 0.4, dc, None, num_names=20,
+                          constituent_hazard_curves=constituents)
+
+pricer = index_pricer(curves)
+print(f"Index PV: {pricer.price():,.2f}, intrinsic spread: {pricer.intrinsic_spread():.2f} bps")
+
+# Widen every constituent by 50bp: the cached legs must be rebuilt
+shocked = names(50)
+pricer.constituent_hazard_curves = shocked
+fresh = index_pricer(shocked)
+print(f"Shocked: cached pricer = {pricer.price():,.2f}, fresh pricer = {fresh.price():,.2f}")
+print(f"Shocked intrinsic spread: cached = {pricer.intrinsic_spread():.2f}, fresh = {fresh.intrinsic_spread():.2f} bps")
+
+# Replacing one name in place, then the weights, also invalidates the cache
+pricer.constituent_hazard_curves[0] = curves[0]
+fresh = index_pricer([curves[0]] + shocked[1:])
+print(f"One name reverted: cached = {pricer.price():,.2f}, fresh = {fresh.price():,.2f}")
+pricer.constituent_weights = np.full(20, 1 / 40)
+print(f"Half weights: {pricer.price():,.2f} (expected {fresh.price() / 2:,.2f})")
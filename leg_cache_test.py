@@ -0,0 +1,50 @@
+import numpy as np
+from pricers.cds_pricer import CDSPricer
+from pricers.trs_pricer import TRSPricer
+from pricers.leg_cache import LEG_CACHE, LegCache, unit_legs
+from pricers.schedule import schedule_for
+from pricers.curves import SurvivalCurve
+from analytics.curve_construction import DiscountCurveBuilder, HazardCurveBuilder
+
+dc = DiscountCurveBuilder([(1, 0.05), (3, 0.055), (5, 0.06)]).build_curve()
+hc = HazardCurveBuilder([(1, 100), (3, 150), (5, 200)], dc).build_curve()
+
+# Pricers on the same curves and schedule share one evaluation
+LEG_CACHE.invalidate()
+LEG_CACHE.hits = LEG_CACHE.misses = 0
+cds = CDSPricer(1e7, 5, 150, 0.4, dc, hc)
+trs = TRSPricer(1e7, 5, 100, 0.05, 0.4, dc, hc)
+cds.price(); cds.price(); trs.price()
+print("Same curves:", LEG_CACHE.stats())
+
+# Replacing a curve misses the cache and prices off the new curve
+cds.hazard_rate_curve = hc.shifted(0.01)
+print(f"Replaced curve: price = {cds.price():,.2f}, fresh pricer = "
+      f"{CDSPricer(1e7, 5, 150, 0.4, dc, hc.shifted(0.01)).price():,.2f}, stats = {LEG_CACHE.stats()}")
+
+# invalidate() drops the entries built on a curve
+LEG_CACHE.invalidate(dc)
+trs.price()
+print("After invalidate(dc):", LEG_CACHE.stats())
+
+# A recycled id: an entry filed under the id of a different (e.g. collected and
+# reallocated) curve object must not be returned for it
+cache = LegCache()
+schedule = schedule_for(None, 5, 0.25)
+other = hc.shifted(0.02)
+legs = cache.get(dc, hc, schedule, lambda: unit_legs(dc, SurvivalCurve(hc, 5), schedule))
+stale = cache._entries.pop((id(dc), id(hc), id(schedule)))
+cache._entries[(id(dc), id(other), id(schedule))] = stale
+fresh = cache.get(dc, other, schedule, lambda: unit_legs(dc, SurvivalCurve(other, 5), schedule))
+print(f"Recycled id: stale rpv01 = {stale[3].rpv01:.6f}, returned = {fresh.rpv01:.6f}, stats = {cache.stats()}")
+
+# Many short-lived curves: with ids reused as curves are freed and evicted,
+# every price still matches an uncached evaluation
+cache = LegCache(maxsize=4)
+errors = []
+for shift in np.linspace(-0.01, 0.01, 500):
+    curve = hc.shifted(shift)
+    cached = cache.get(dc, curve, schedule, lambda: unit_legs(dc, SurvivalCurve(curve, 5), schedule))
+    errors.append(abs(cached.rpv01 - unit_legs(dc, SurvivalCurve(curve, 5), schedule).rpv01))
+    del curve
+print(f"Short-lived curves: max rpv01 error = {max(errors):.2e}, stats = {cache.stats()}")
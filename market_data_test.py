@@ -14,3 +14,11 @@ yields = md.get_treasury_yields(date(2025, 5, 26))
 spreads = md.get_cds_spreads(date(2025, 5, 26))
 print("Treasury Yields:", yields)
 print("CDS Spreads:", spreads)
+
+# Dense array-backed provider
+from data.market_data import ArrayMarketDataProvider
+
+amd = ArrayMarketDataProvider.from_provider(md)
+print("Array provider dates:", amd.available_dates())
+print("Array provider CDS Spreads:", amd.get_cds_spreads(date(2025, 5, 26)))
+print("Spread history:", amd.get_cds_spreads_range(date(2025, 5, 1), date(2025, 5, 31)))
@@ -31,4 +31,17 @@ for row in tracker.compute_pnl_series():
     print(row)
 
 pnl_data = tracker.compute_pnl_series()
-plot_pnl_series(pnl_data, show_attribution=True)
\ No newline at end of file
+plot_pnl_series(pnl_data, show_attribution=True)
+# Incremental attribution for a book: sensitivities are carried from one day to the next
+from analytics.pnl_tracker import IncrementalPnLTracker
+
+book = [
+    CDSPricer(1e7, 5, 150, 0.4, dc1, hc1, trade_date="2025-05-26"),
+    CDSPricer(-5e6, 3, 100, 0.4, dc1, hc1, trade_date="2025-03-20"),
+    CDSPricer(2e7, 7, 150, 0.4, dc1, hc1, trade_date="2025-05-26"),
+]
+book_tracker = IncrementalPnLTracker(book, names=["5Y long", "3Y short", "7Y long"])
+book_tracker.record_day(date(2025, 5, 26), dc1, hc1)
+book_tracker.record_day(date(2025, 5, 27), dc2, hc2)
+print(book_tracker.attribution().round(2))
+print(book_tracker.attribution(by_position=True).round(2))
@@ -0,0 +1,252 @@
+# pricers/cds_book.py
+
+import numpy as np
+from pricers.curves import Curve, SurvivalCurveSet, HazardCurveSet
+from pricers.schedule import schedule_for, stack_schedules
+
+
+class CDSBook:
+    def __init__(self, notional, maturity, spread, recovery_rate,
+                 discount_curve, hazard_rate_curves, payment_frequency=0.25,
+                 chunk_size=10_000, reference_entities=None, trade_date=None, holidays=()):
+        """
+        Batch pricer for a book of single-name CDS sharing one discount curve.
+
+        Uses the same leg conventions as CDSPricer, but every leg is evaluated
+        for all trades at once on (trades x time) arrays instead of one pricer
+        object and one Python loop per trade.
+
+        Parameters:
+        - notional: float or array
+        - maturity: float or array (in years)
+        - spread: float or array (in bps, e.g. 100 = 1%)
+        - recovery_rate: float or array (0.4 = 40%)
+        - discount_curve: dict or callable {tenor: df}, shared by every trade
+        - hazard_rate_curves: one callable for the whole book, a list with one
+          callable per trade, a SurvivalCurveSet, or a HazardCurveSet
+        - payment_frequency: float or array (e.g., 0.25 = quarterly)
+        - chunk_size: int, trades priced per vectorized block (bounds memory)
+        - reference_entities: with a HazardCurveSet, the name each trade is on
+          (default: one trade per name, in the set's order)
+        - trade_date: optional date shared by the book; when given, premiums
+          follow the IMM-dated CDS schedule of each (maturity, frequency), as
+          CDSPricer with the same trade_date (see pricers.schedule.schedule_for)
+        - holidays: holiday dates for business-day adjustment of those schedules
+        """
+        if isinstance(hazard_rate_curves, HazardCurveSet):
+            hazard_rate_curves = hazard_rate_curves.curves(reference_entities)
+        # Per-trade curves also set the book size when every other input is a scalar
+        per_trade = isinstance(hazard_rate_curves, (list, tuple, SurvivalCurveSet))
+        trades = (len(hazard_rate_curves),) if per_trade else ()
+        *trade_inputs, _ = np.broadcast_arrays(
+            *(np.atleast_1d(np.asarray(x, dtype=float))
+              for x in (notional, maturity, spread, recovery_rate, payment_frequency)),
+            np.empty(trades)
+        )
+        notional, maturity, spread, recovery_rate, payment_frequency = trade_inputs
+        self.notional = notional
+        self.maturity = maturity
+        self.spread = spread / 10000  # Convert bps to decimal
+        self.recovery_rate = recovery_rate
+        self.payment_frequency = payment_frequency
+        self.chunk_size = chunk_size
+        self.trade_date = trade_date
+        self.holidays = tuple(holidays)
+
+        self.discount_curve = self._to_interp(discount_curve)
+        self.survival_curves = self._to_survival_set(hazard_rate_curves)
+
+    def __len__(self):
+        return len(self.notional)
+
+    def _to_interp(self, curve_input, kind="discount"):
+        if callable(curve_input):
+            return curve_input
+        else:
+            times = sorted(curve_input.keys())
+            values = [curve_input[t] for t in times]
+            return Curve(times, values, kind=kind)
+
+    def _to_survival_set(self, hazard_rate_curves):
+        if isinstance(hazard_rate_curves, SurvivalCurveSet):
+            return hazard_rate_curves
+        if callable(hazard_rate_curves) or isinstance(hazard_rate_curves, dict):
+            hazard_rate_curves = [hazard_rate_curves] * len(self)
+        curves = {}
+        hazard_rate_curves = [curves.setdefault(id(c), self._to_interp(c, kind="hazard")) for c in hazard_rate_curves]
+        horizon = float(self.maturity.max())
+        if self.trade_date is not None:
+            pairs = np.unique(np.column_stack([self.maturity, self.payment_frequency]), axis=0)
+            horizon = max(schedule.maturity for schedule in self._schedules(*pairs.T))
+        return SurvivalCurveSet(hazard_rate_curves, horizon=horizon)
+
+    def _schedules(self, maturity, freq):
+        """IMM schedule per (maturity, frequency) pair (memoized by schedule_for)."""
+        return [schedule_for(self.trade_date, m, f, self.holidays) for m, f in zip(maturity.tolist(), freq.tolist())]
+
+    def _unit_legs(self, rows, sensitivities=False):
+        """
+        Risky annuity (sum of DF * S * accrual) and protection leg per unit of
+        notional and loss for the trades in `rows`.
+
+        With sensitivities=True also returns, for both legs, the first
+        derivative under a parallel hazard shift h -> h + e ("_cs"), its second
+        derivative ("_cs2") and the first derivative under a parallel rate
+        shift DF -> DF * exp(-e t) ("_ir"), plus DF, S and h at maturity.
+        """
+        maturity = self.maturity[rows]
+        freq = self.payment_frequency[rows]
+
+        if self.trade_date is None:
+            legs = self._year_fraction_premium(rows, maturity, freq, sensitivities)
+        else:
+            # IMM schedules, padded to a common width; protection runs to the IMM maturity
+            schedule = stack_schedules(self._schedules(maturity, freq))
+            times, maturity = schedule.payment_times, schedule.maturity
+            flows = np.where(schedule.accruals > 0, self.discount_curve(times) * self.survival_curves(times, rows), 0.0)
+            flows = flows * schedule.accruals
+            legs = {"rpv01": np.sum(flows, axis=1)}
+            if sensitivities:
+                legs["rpv01_cs"] = -np.sum(times * flows, axis=1)
+                legs["rpv01_cs2"] = np.sum(times**2 * flows, axis=1)
+
+        # Protection leg: 100-point grid from 0 to maturity, discounted at mid-points;
+        # DF depends on the maturity alone, so it is read once per distinct maturity
+        grid = maturity[:, None] * np.linspace(0, 1, 100)[None, :]
+        mid = (grid[:, :-1] + grid[:, 1:]) / 2
+        sp_grid = self.survival_curves(grid, rows)
+        horizons, position = np.unique(maturity, return_inverse=True)
+        if len(horizons) < len(maturity):
+            df_mid = self.discount_curve(horizons[:, None] * ((np.arange(99) + 0.5) / 99))[position.ravel()]
+        else:
+            df_mid = self.discount_curve(mid)
+        legs["protection"] = np.sum(df_mid * (sp_grid[:, :-1] - sp_grid[:, 1:]), axis=1)
+
+        if sensitivities:
+            # dS/de = -t S and d2S/de2 = t^2 S under h -> h + e; dDF/de = -t DF under rates + e
+            t0, t1 = grid[:, :-1], grid[:, 1:]
+            s0, s1 = sp_grid[:, :-1], sp_grid[:, 1:]
+            legs["rpv01_ir"] = legs["rpv01_cs"]
+            legs["protection_cs"] = np.sum(df_mid * (t1 * s1 - t0 * s0), axis=1)
+            legs["protection_cs2"] = np.sum(df_mid * (t0**2 * s0 - t1**2 * s1), axis=1)
+            legs["protection_ir"] = -np.sum(mid * df_mid * (s0 - s1), axis=1)
+            legs["discount_factor"] = self.discount_curve(maturity)
+            legs["survival_probability"] = self.survival_curves(maturity[:, None], rows)[:, 0]
+            legs["hazard_rate"] = self.survival_curves.hazard_rate(maturity[:, None], rows)[:, 0]
+        return legs
+
+    def _year_fraction_premium(self, rows, maturity, freq, sensitivities):
+        """
+        Premium legs on year-fraction schedules (payments at freq, 2 freq, ...
+        as np.arange(freq, maturity + 1e-6, freq)) from running sums.
+
+        Every trade with the same frequency pays on a prefix of one shared
+        grid, so DF is read once on that grid and S once per curve, whatever
+        the maturities; a trade's annuity is the running sum of DF * S *
+        accrual up to its last payment.
+        """
+        num_payments = np.maximum(np.ceil((maturity + 1e-6 - freq) / freq), 0).astype(int)
+        curve = self.survival_curves.index[rows]
+        powers = (0, 1, 2) if sensitivities else (0,)
+        sums = np.zeros((len(powers), len(rows)))
+        for f in np.unique(freq):
+            members = np.flatnonzero(freq == f)
+            times = f + np.arange(num_payments[members].max(initial=0)) * f
+            _, first, position = np.unique(curve[members], return_index=True, return_inverse=True)
+            flows = self.discount_curve(times) * self.survival_curves(times, rows[members[first]]) * f
+            for i, power in enumerate(powers):
+                running = np.cumsum(times**power * flows, axis=1)
+                running = np.concatenate([np.zeros((len(first), 1)), running], axis=1)
+                sums[i, members] = running[position.ravel(), num_payments[members]]
+
+        legs = {"rpv01": sums[0]}
+        if sensitivities:
+            # dS/de = -t S and d2S/de2 = t^2 S under h -> h + e
+            legs["rpv01_cs"] = -sums[1]
+            legs["rpv01_cs2"] = sums[2]
+        return legs
+
+    def _evaluate(self, sensitivities=False):
+        """Unit legs per trade; trades on the same curve, maturity and frequency share one evaluation."""
+        # Sorted by curve, maturity and frequency (a lexsort is much cheaper than np.unique(axis=0))
+        keys = (self.payment_frequency, self.maturity, self.survival_curves.index)
+        order = np.lexsort(keys)
+        ordered = np.column_stack(keys)[order]
+        new = np.ones(len(order), dtype=bool)
+        new[1:] = np.any(ordered[1:] != ordered[:-1], axis=1)
+        first = order[new]
+        inverse = np.empty(len(order), dtype=int)
+        inverse[order] = np.cumsum(new) - 1
+
+        blocks = [self._unit_legs(first[start:start + self.chunk_size], sensitivities)
+                  for start in range(0, len(first), self.chunk_size)]
+        return {key: np.concatenate([block[key] for block in blocks])[inverse] for key in blocks[0]}
+
+    def unit_legs(self):
+        """
+        Returns: (rpv01, protection) arrays, one entry per trade, per unit of
+        notional and of loss given default.
+        """
+        legs = self._evaluate()
+        return legs["rpv01"], legs["protection"]
+
+    def breakdown(self):
+        """
+        Returns: dict of arrays (one entry per trade) with
+        - pv: protection leg minus premium leg
+        - premium_leg, protection_leg: leg PVs
+        - rpv01: risky annuity per unit notional (PV of 1 unit of running
+          spread paid until default or maturity)
+        - par_spread: spread (bps) at which the two legs are equal
+        - upfront: pv as a fraction of notional (x100 for points upfront)
+        """
+        rpv01, protection = self.unit_legs()
+        premium_leg = self.notional * self.spread * rpv01
+        protection_leg = self.notional * (1 - self.recovery_rate) * protection
+        return {
+            "pv": protection_leg - premium_leg,
+            "premium_leg": premium_leg,
+            "protection_leg": protection_leg,
+            "rpv01": rpv01,
+            "par_spread": (1 - self.recovery_rate) * protection / rpv01 * 10000,
+            "upfront": (protection_leg - premium_leg) / self.notional,
+        }
+
+    def price(self):
+        return self.breakdown()["pv"]
+
+    def par_spread(self):
+        return self.breakdown()["par_spread"]
+
+    def greeks(self):
+        """
+        Closed-form sensitivities of the protection buyer's PV, from one
+        evaluation of the legs.
+
+        Returns: dict of arrays (one entry per trade) with
+        - delta: PV change per +1bp of contractual spread (-notional * RPV01 * 1bp)
+        - HR01: PV change per additive +1bp shift of the hazard rate
+          (h -> h + 1bp). This is not SensitivityEngine's CS01, which shifts
+          the curve as h * exp(-1bp * t) (lower hazard, opposite sign)
+        - gamma: second-order PV change per (1bp)^2 additive hazard shift
+        - IR01: PV change per +1bp parallel shift of zero rates (DF * exp(-1bp * t))
+        - theta: PV change for one day less to maturity, curves unchanged:
+          the protection leg's roll -notional * (1 - R) * DF * S * h / 365 at
+          maturity. The premium schedule only changes at coupon dates, so it
+          does not contribute between them
+        """
+        legs = self._evaluate(sensitivities=True)
+        premium = self.notional * self.spread
+        protection = self.notional * (1 - self.recovery_rate)
+
+        def pv_change(key):
+            return protection * legs["protection" + key] - premium * legs["rpv01" + key]
+
+        roll = legs["discount_factor"] * legs["survival_probability"] * legs["hazard_rate"]
+        return {
+            "delta": -self.notional * legs["rpv01"] / 10000,
+            "HR01": pv_change("_cs") / 10000,
+            "gamma": pv_change("_cs2") / 10000**2,
+            "IR01": pv_change("_ir") / 10000,
+            "theta": -protection * roll / 365,
+        }
@@ -1,9 +1,12 @@
-import numpy as np
-from scipy.interpolate import interp1d
+from pricers.curves import Curve, SurvivalCurve
+from pricers.leg_cache import LEG_CACHE, unit_legs
+from pricers.schedule import schedule_for
+from pricers.cds_book import CDSBook
 
 class CDSPricer:
     def __init__(self, notional, maturity, spread, recovery_rate, 
-                 discount_curve, hazard_rate_curve, payment_frequency=0.25):
+                 discount_curve, hazard_rate_curve, payment_frequency=0.25,
+                 trade_date=None, holidays=()):
         """
         Parameters:
         - notional: float
@@ -13,57 +16,135 @@ class CDSPricer:
         - discount_curve: dict or callable {tenor: df}
         - hazard_rate_curve: dict or callable {tenor: hazard_rate}
         - payment_frequency: float (e.g., 0.25 = quarterly)
+        - trade_date: optional date; when given, premiums follow the IMM-dated
+          CDS schedule with ACT/360 accruals (see pricers.schedule.cds_schedule)
+          and curve times are measured from this date
+        - holidays: holiday dates for business-day adjustment of that schedule
         """
         self.notional = notional
         self.maturity = maturity
         self.spread = spread / 10000  # Convert bps to decimal
         self.recovery_rate = recovery_rate
         self.payment_frequency = payment_frequency
+        self.trade_date = trade_date
+        self.holidays = tuple(holidays)
 
         # Interpolate curves
         self.discount_curve = self._to_interp(discount_curve)
-        self.hazard_rate_curve = self._to_interp(hazard_rate_curve)
+        self.hazard_rate_curve = self._to_interp(hazard_rate_curve, kind="hazard")
+        self._survival = None
 
-    def _to_interp(self, curve_input):
+    def _to_interp(self, curve_input, kind="discount"):
         if callable(curve_input):
             return curve_input
         else:
             times = sorted(curve_input.keys())
             values = [curve_input[t] for t in times]
-            return interp1d(times, values, kind='linear', fill_value='extrapolate')
+            return Curve(times, values, kind=kind)
+
+    def _survival_curve(self):
+        """Survival curve for the current hazard curve, rebuilt only when that curve is replaced."""
+        if self._survival is None or self._survival.hazard_rate_curve is not self.hazard_rate_curve:
+            self._survival = SurvivalCurve(self.hazard_rate_curve, horizon=self._schedule().maturity)
+        return self._survival
 
     def _survival_probability(self, t):
         """S(t) = exp(-∫₀^t h(s) ds)"""
-        ts = np.linspace(0, t, 100)
-        hs = self.hazard_rate_curve(ts)
-        return np.exp(-np.trapz(hs, ts))
+        return self._survival_curve()(t)
 
     def _discount_factor(self, t):
         return self.discount_curve(t)
 
-    def _premium_leg(self):
-        times = np.arange(self.payment_frequency, self.maturity + 1e-6, self.payment_frequency)
-        premium_leg = 0.0
-        for t in times:
-            df = self._discount_factor(t)
-            sp = self._survival_probability(t)
-            premium_leg += df * sp * self.payment_frequency
-        return self.notional * self.spread * premium_leg
-
-    def _protection_leg(self):
-        times = np.linspace(0, self.maturity, 100)
-        prot_leg = 0.0
-        for i in range(1, len(times)):
-            t0, t1 = times[i-1], times[i]
-            dt = t1 - t0
-            sp0 = self._survival_probability(t0)
-            sp1 = self._survival_probability(t1)
-            default_prob = sp0 - sp1
-            df = self._discount_factor((t0 + t1) / 2)
-            prot_leg += df * default_prob
-        return self.notional * (1 - self.recovery_rate) * prot_leg
+    def _schedule(self):
+        """Premium schedule: IMM dates with ACT/360 accruals given a trade date, else year fractions (memoized)."""
+        return schedule_for(self.trade_date, self.maturity, self.payment_frequency, self.holidays)
 
-    def price(self):
-        prot_leg = self._protection_leg()
-        prem_leg = self._premium_leg()
+    def _unit_legs(self):
+        """Per-unit leg values for this schedule, shared through the leg cache."""
+        schedule = self._schedule()
+        return LEG_CACHE.get(
+            self.discount_curve, self.hazard_rate_curve, schedule,
+            lambda: unit_legs(self.discount_curve, self._survival_curve(), schedule)
+        )
+
+    def _premium_leg(self, legs=None):
+        legs = self._unit_legs() if legs is None else legs
+        return self.notional * self.spread * legs.rpv01
+
+    def _protection_leg(self, legs=None):
+        legs = self._unit_legs() if legs is None else legs
+        return self.notional * (1 - self.recovery_rate) * legs.protection
+
+    def _price_legs(self, legs):
+        """PV from UnitLegs; legs holding arrays (one entry per curve scenario) give an array of PVs."""
+        prot_leg = self._protection_leg(legs)
+        prem_leg = self._premium_leg(legs)
         return prot_leg - prem_leg
+
+    def price(self):
+        return self._price_legs(self._unit_legs())
+
+    def breakdown(self, maturities=None):
+        """
+        Leg PVs, RPV01, par spread and upfront from a single evaluation of the
+        two legs.
+
+        maturities: optional array of maturities (e.g. [1, 2, ..., 10]). When
+        given, the same trade is priced for every maturity in one vectorized
+        call (CDSBook, on the same schedules as price()) and each entry is an
+        array over the ladder.
+
+        Returns: dict with
+        - pv, premium_leg, protection_leg: as in price()
+        - rpv01: risky annuity per unit notional (PV of 1 unit of running spread)
+        - par_spread: spread (bps) at which the two legs are equal
+        - upfront: pv as a fraction of notional (x100 for points upfront)
+        """
+        if maturities is None:
+            legs = self._unit_legs()
+            rpv01, protection = legs.rpv01, legs.protection
+        else:
+            book = CDSBook(self.notional, maturities, self.spread * 10000, self.recovery_rate,
+                           self.discount_curve, self.hazard_rate_curve, self.payment_frequency,
+                           trade_date=self.trade_date, holidays=self.holidays)
+            rpv01, protection = book.unit_legs()
+
+        premium_leg = self.notional * self.spread * rpv01
+        protection_leg = self.notional * (1 - self.recovery_rate) * protection
+        return {
+            "pv": protection_leg - premium_leg,
+            "premium_leg": premium_leg,
+            "protection_leg": protection_leg,
+            "rpv01": rpv01,
+            "par_spread": (1 - self.recovery_rate) * protection / rpv01 * 10000,
+            "upfront": (protection_leg - premium_leg) / self.notional,
+        }
+
+    def par_spread(self, maturities=None):
+        """Par spread in bps (array over `maturities` if given)."""
+        return self.breakdown(maturities)["par_spread"]
+
+    def rpv01(self, maturities=None):
+        """Risky annuity per unit notional (array over `maturities` if given)."""
+        return self.breakdown(maturities)["rpv01"]
+
+    def upfront(self, maturities=None):
+        """Upfront as a fraction of notional (array over `maturities` if given)."""
+        return self.breakdown(maturities)["upfront"]
+
+    def greeks(self, maturities=None):
+        """
+        Closed-form delta, HR01, gamma, IR01 and theta (see CDSBook.greeks)
+        from a single evaluation of the legs; arrays over `maturities` if given.
+        HR01 shifts the hazard rate additively (h + 1bp); it is not the CS01
+        of SensitivityEngine, whose h * exp(-1bp * t) shift has the opposite
+        sign.
+        """
+        book = CDSBook(self.notional, self.maturity if maturities is None else maturities,
+                       self.spread * 10000, self.recovery_rate, self.discount_curve,
+                       self.hazard_rate_curve, self.payment_frequency,
+                       trade_date=self.trade_date, holidays=self.holidays)
+        greeks = book.greeks()
+        if maturities is None:
+            return {name: value[0] for name, value in greeks.items()}
+        return greeks
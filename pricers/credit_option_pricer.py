@@ -2,6 +2,168 @@
 
 import numpy as np
 from scipy.stats import norm
+from pricers.curves import Curve
+
+
+def _is_payer(option_type):
+    option_type = np.char.lower(np.asarray(option_type, dtype=str))
+    if not np.all(np.isin(option_type, ["payer", "receiver"])):
+        raise ValueError("option_type must be 'payer' or 'receiver'")
+    return option_type == "payer"
+
+
+def _black(forward, strike, expiry, volatility, is_payer):
+    """
+    Black value per unit of discounted annuity, broadcast over all inputs.
+    Zero where the volatility or the forward spread is not positive.
+    """
+    valid = (volatility > 0) & (forward > 0)
+    sigma_sqrt_t = np.where(valid, volatility * np.sqrt(expiry), 1.0)
+    log_moneyness = np.log(np.where(valid, forward / strike, 1.0))
+    d1 = (log_moneyness + 0.5 * sigma_sqrt_t**2) / sigma_sqrt_t
+    d2 = d1 - sigma_sqrt_t
+
+    payer = forward * norm.cdf(d1) - strike * norm.cdf(d2)
+    receiver = strike * norm.cdf(-d2) - forward * norm.cdf(-d1)
+    return np.where(valid, np.where(is_payer, payer, receiver), 0.0)
+
+
+def risky_annuity(discount_curve, maturity, cds_maturity):
+    """
+    Simplified risky annuity: PV of 1 per year paid annually over the
+    underlying CDS, sum of DF(maturity + k) for k = 1..int(cds_maturity).
+    Broadcasts over maturity and cds_maturity.
+    """
+    maturity, cds_maturity = np.broadcast_arrays(np.asarray(maturity, dtype=float),
+                                                 np.asarray(cds_maturity, dtype=float))
+    steps = cds_maturity.astype(int)
+    years = np.arange(1, steps.max(initial=0) + 1)
+    dfs = discount_curve(maturity[..., None] + years)
+    return np.sum(np.where(years <= steps[..., None], dfs, 0.0), axis=-1)
+
+
+def price_credit_options(notional, strike, maturity, cds_maturity, spread, volatility,
+                         option_type, discount_curve):
+    """
+    Vectorized CreditOptionPricer.price(): every argument except the
+    discount curve may be an array, and all are broadcast together. Pass
+    strikes[:, None, None], expiries[None, :, None] and tenors[None, None, :]
+    to price a full strike x expiry x underlying-tenor cube in one call.
+
+    Strikes and spreads are in bps, volatilities lognormal, times in years.
+    """
+    strike = np.asarray(strike, dtype=float) / 10000
+    spread = np.asarray(spread, dtype=float) / 10000
+    maturity = np.asarray(maturity, dtype=float)
+    volatility = np.asarray(volatility, dtype=float)
+
+    value = _black(spread, strike, maturity, volatility, _is_payer(option_type))
+    df = discount_curve(maturity)
+    return notional * df * value * risky_annuity(discount_curve, maturity, cds_maturity)
+
+
+def credit_option_greeks(notional, strike, maturity, cds_maturity, spread, volatility,
+                         option_type, discount_curve):
+    """
+    Closed-form Greeks of price_credit_options, broadcast over all inputs.
+
+    Returns: dict of arrays with
+    - delta: Black delta, N(d1) for payers and -N(-d1) for receivers
+    - CS01: value change per +1bp of forward spread
+    - gamma: change in CS01 per +1bp of forward spread
+    - vega: value change per +1 vol point (0.01)
+    - IR01: value change per +1bp parallel shift of zero rates (DF * exp(-1bp * t))
+    - theta: value change over one day (1/365) of time to expiry; the
+      Black part is exact, the curve parts use the discount curve's slope
+    """
+    strike = np.asarray(strike, dtype=float) / 10000
+    forward = np.asarray(spread, dtype=float) / 10000
+    expiry = np.asarray(maturity, dtype=float)
+    volatility = np.asarray(volatility, dtype=float)
+    is_payer = _is_payer(option_type)
+
+    valid = (volatility > 0) & (forward > 0)
+    sqrt_t = np.sqrt(expiry)
+    sigma_sqrt_t = np.where(valid, volatility * sqrt_t, 1.0)
+    d1 = (np.log(np.where(valid, forward / strike, 1.0)) + 0.5 * sigma_sqrt_t**2) / sigma_sqrt_t
+    pdf = np.where(valid, norm.pdf(d1), 0.0)
+    delta = np.where(valid, np.where(is_payer, norm.cdf(d1), -norm.cdf(-d1)), 0.0)
+    value = _black(forward, strike, expiry, volatility, is_payer)
+
+    # Annuity and its sensitivities: A = sum DF(T + k), dA/de = -sum (T + k) DF(T + k)
+    expiry_b, cds_maturity = np.broadcast_arrays(expiry, np.asarray(cds_maturity, dtype=float))
+    steps = cds_maturity.astype(int)
+    years = np.arange(1, steps.max(initial=0) + 1)
+    pay_times = expiry_b[..., None] + years
+    paid = years <= steps[..., None]
+    annuity = np.sum(np.where(paid, discount_curve(pay_times), 0.0), axis=-1)
+    annuity_ir = -np.sum(np.where(paid, pay_times * discount_curve(pay_times), 0.0), axis=-1)
+    h = 1e-4
+    annuity_slope = np.sum(np.where(paid, discount_curve(pay_times + h) - discount_curve(pay_times - h), 0.0),
+                           axis=-1) / (2 * h)
+
+    df = discount_curve(expiry)
+    df_slope = (discount_curve(expiry + h) - discount_curve(expiry - h)) / (2 * h)
+    scale = notional * df * annuity
+
+    black_theta = np.where(valid, forward * pdf * volatility / (2 * np.where(valid, sqrt_t, 1.0)), 0.0)
+    d_value_d_expiry = notional * (df_slope * annuity * value + df * annuity_slope * value + df * annuity * black_theta)
+    return {
+        "delta": delta,
+        "CS01": scale * delta / 10000,
+        "gamma": scale * pdf / (np.where(valid, forward, 1.0) * sigma_sqrt_t) / 10000**2,
+        "vega": scale * forward * pdf * sqrt_t / 100,
+        "IR01": notional * value * (-expiry * df * annuity + df * annuity_ir) / 10000,
+        "theta": -d_value_d_expiry / 365,
+    }
+
+
+def implied_volatility(price, notional, strike, maturity, cds_maturity, spread, option_type,
+                       discount_curve, tol=1e-10, max_iter=100, bounds=(1e-6, 5.0)):
+    """
+    Inverts price_credit_options for the lognormal volatility of every quote
+    at once. Each quote runs Newton on the Black formula with a bisection step
+    whenever Newton would leave the current bracket, so it always converges
+    for prices inside the no-arbitrage range.
+
+    Returns: array of implied vols (nan where the price is outside the range
+    attainable within `bounds`).
+    """
+    strike = np.asarray(strike, dtype=float) / 10000
+    spread = np.asarray(spread, dtype=float) / 10000
+    maturity = np.asarray(maturity, dtype=float)
+    is_payer = _is_payer(option_type)
+
+    scale = notional * discount_curve(maturity) * risky_annuity(discount_curve, maturity, cds_maturity)
+    target, forward, strike, expiry, is_payer = np.broadcast_arrays(
+        np.asarray(price, dtype=float) / scale, spread, strike, maturity, is_payer)
+
+    lo = np.full(target.shape, bounds[0])
+    hi = np.full(target.shape, bounds[1])
+    attainable = ((_black(forward, strike, expiry, lo, is_payer) - tol <= target)
+                  & (target <= _black(forward, strike, expiry, hi, is_payer) + tol))
+
+    sigma = np.clip(np.full(target.shape, 0.3), lo, hi)
+    active = attainable.copy()
+    for _ in range(max_iter):
+        if not active.any():
+            break
+        diff = _black(forward, strike, expiry, sigma, is_payer) - target
+        lo = np.where(diff < 0, sigma, lo)
+        hi = np.where(diff > 0, sigma, hi)
+
+        sqrt_t = np.sqrt(expiry)
+        d1 = (np.log(forward / strike) + 0.5 * sigma**2 * expiry) / (sigma * sqrt_t)
+        vega = forward * norm.pdf(d1) * sqrt_t
+        with np.errstate(divide="ignore", invalid="ignore"):
+            newton = sigma - diff / vega
+        bisect = 0.5 * (lo + hi)
+        step = np.where((newton > lo) & (newton < hi), newton, bisect)
+
+        active &= np.abs(diff) > tol
+        sigma = np.where(active, step, sigma)
+
+    return np.where(attainable, sigma, np.nan)
 
 
 class CreditOptionPricer:
@@ -29,37 +191,44 @@ class CreditOptionPricer:
         if self.volatility <= 0 or self.spread <= 0:
             return 0.0
 
-        T = self.maturity
-        S = self.spread
-        K = self.strike
-        sigma = self.volatility
-        df = self.discount_curve(T)
+        return price_credit_options(self.notional, self.strike * 10000, self.maturity, self.cds_maturity,
+                                    self.spread * 10000, self.volatility, self.option_type,
+                                    self.discount_curve)[()]
 
-        d1 = (np.log(S / K) + 0.5 * sigma**2 * T) / (sigma * np.sqrt(T))
-        d2 = d1 - sigma * np.sqrt(T)
+    def price_cube(self, strikes=None, maturities=None, cds_maturities=None, volatility=None):
+        """
+        Prices this option over a grid in one call.
 
-        if self.option_type == "payer":
-            price = df * (S * norm.cdf(d1) - K * norm.cdf(d2))
-        elif self.option_type == "receiver":
-            price = df * (K * norm.cdf(-d2) - S * norm.cdf(-d1))
-        else:
-            raise ValueError("option_type must be 'payer' or 'receiver'")
+        strikes (bps), maturities (option expiries) and cds_maturities
+        (underlying tenors) default to the pricer's own values; volatility may
+        be a scalar or an array broadcastable to the cube.
+
+        Returns: array of shape (len(strikes), len(maturities), len(cds_maturities))
+        """
+        strikes = np.atleast_1d(self.strike * 10000 if strikes is None else strikes)
+        maturities = np.atleast_1d(self.maturity if maturities is None else maturities)
+        cds_maturities = np.atleast_1d(self.cds_maturity if cds_maturities is None else cds_maturities)
+        volatility = self.volatility if volatility is None else volatility
+        return price_credit_options(self.notional, strikes[:, None, None], maturities[None, :, None],
+                                    cds_maturities[None, None, :], self.spread * 10000, volatility,
+                                    self.option_type, self.discount_curve)
 
-        # Convert to dollar value using risky annuity approximation
-        risky_annuity = self._risky_annuity()
-        return self.notional * price * risky_annuity
+    def greeks(self):
+        """Closed-form delta, CS01, gamma, vega, IR01 and theta (see credit_option_greeks)."""
+        greeks = credit_option_greeks(self.notional, self.strike * 10000, self.maturity, self.cds_maturity,
+                                      self.spread * 10000, self.volatility, self.option_type,
+                                      self.discount_curve)
+        return {name: value[()] for name, value in greeks.items()}
 
-    def _to_interp(self, curve_input):
+    def _to_interp(self, curve_input, kind="discount"):
         if callable(curve_input):
             return curve_input
         else:
             times = sorted(curve_input.keys())
             values = [curve_input[t] for t in times]
-            return interp1d(times, values, kind='linear', fill_value='extrapolate')
+            return Curve(times, values, kind=kind)
 
     def _risky_annuity(self):
         # Simplified risky annuity: PV of 1bp over CDS maturity
         # Approximation: sum of discounted flows annually
-        steps = int(self.cds_maturity)
-        annuity = sum(self.discount_curve(self.maturity + t) for t in range(1, steps + 1))
-        return annuity
+        return risky_annuity(self.discount_curve, self.maturity, self.cds_maturity)
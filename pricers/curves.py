@@ -0,0 +1,604 @@
+# pricers/curves.py
+
+from bisect import bisect_right
+import math
+import numpy as np
+
+
+def _grid(hazard_rate_curves, horizon, num_points):
+    """Uniform grid over [0, horizon] merged with the knots (`.x`) of any curves that have them."""
+    times = [np.linspace(0.0, horizon, num_points + 1)]
+    for curve in hazard_rate_curves:
+        knots = getattr(curve, "x", None)
+        if knots is not None:
+            knots = np.asarray(knots, dtype=float)
+            times.append(knots[(knots > 0) & (knots < horizon)])
+    return np.unique(np.concatenate(times))
+
+
+def _segment_nodes(times, hazards):
+    """
+    Hazard at the start of each segment, its slope over the segment and the
+    cumulative hazard integral at each node. `hazards` is sampled on `times`
+    along its last axis.
+    """
+    dt = np.diff(times)
+    slopes = np.diff(hazards, axis=-1) / dt
+    slopes = np.concatenate([slopes, np.zeros(hazards.shape[:-1] + (1,))], axis=-1)
+    increments = 0.5 * (hazards[..., :-1] + hazards[..., 1:]) * dt
+    cumulative = np.concatenate([np.zeros(hazards.shape[:-1] + (1,)), np.cumsum(increments, axis=-1)], axis=-1)
+    return hazards, slopes, cumulative
+
+
+def _sample(hazard_rate_curve, times):
+    """
+    Segment rates, slopes and cumulative hazard of one curve on `times`.
+
+    Curves that integrate themselves (they expose cumulative_hazard(t), e.g.
+    basis-adjusted curves) are sampled through their integral, which keeps
+    jumps in the hazard rate at grid nodes exact; their hazard at a jump must
+    be the left limit. Plain callables are sampled as hazard rates. Either
+    way the hazard is treated as linear between nodes.
+    """
+    if hasattr(hazard_rate_curve, "cumulative_hazard"):
+        cumulative = np.asarray(hazard_rate_curve.cumulative_hazard(times), dtype=float)
+        dt = np.diff(times)
+        average = np.diff(cumulative) / dt
+        end = np.asarray(hazard_rate_curve(times[1:]), dtype=float)
+        rates = np.append(2 * average - end, end[-1:])
+        slopes = np.append(2 * (end - average) / dt, 0.0)
+        return rates, slopes, cumulative
+    return _segment_nodes(times, np.asarray(hazard_rate_curve(times), dtype=float))
+
+
+# SensitivityEngine samples key-rate bumps on this grid and holds them flat outside it
+BUMP_GRID = np.linspace(0.01, 30.0, 1000)
+
+
+def gaussian_bump_factors(bump, tenors, sigma=0.25):
+    """
+    Key-rate bump factors exp(-bump * t * g(t)) on BUMP_GRID, g a Gaussian of
+    width `sigma` centred at each tenor: one row per tenor.
+    """
+    tenors = np.asarray(tenors, dtype=float).reshape(-1, 1)
+    gauss = np.exp(-0.5 * ((BUMP_GRID - tenors) / sigma)**2)
+    return np.exp(-bump * BUMP_GRID * gauss)
+
+
+def _gaussian_bump(curve, bump, tenor, sigma=0.25):
+    """
+    Key-rate bump used by SensitivityEngine: values * exp(-bump * t * g(t))
+    with g a Gaussian of width `sigma` centred at `tenor`, sampled on
+    BUMP_GRID and held flat outside it.
+    """
+    values = np.asarray(curve(BUMP_GRID), dtype=float)
+    kind = getattr(curve, "kind", "discount")
+    return Curve(BUMP_GRID, values * gaussian_bump_factors(bump, tenor, sigma)[0], kind=kind, extrapolation="flat")
+
+
+def _interpolate(times, values, t, extrapolation="linear"):
+    """
+    Linear interpolation of node values at times `t` (an array). `values`
+    may carry leading axes (one row per curve on shared nodes).
+    """
+    if len(times) <= 8:
+        # Few nodes (e.g. a bootstrapped discount curve): counting the interior
+        # nodes at or before t is cheaper than a binary search per time
+        i = np.zeros(np.shape(t), dtype=np.intp)
+        for node in times[1:-1]:
+            i += t >= node
+    else:
+        i = np.clip(np.searchsorted(times, t, side="right") - 1, 0, len(times) - 2)
+    x0 = times[i]
+    w = (t - x0) / (times[i + 1] - x0)
+    if extrapolation == "flat":
+        w = np.clip(w, 0.0, 1.0)
+    y0 = values[..., i]
+    return y0 + w * (values[..., i + 1] - y0)
+
+
+def _integral(times, values, t, extrapolation="linear"):
+    """
+    ∫₀^t of the linear interpolation of node values (including
+    extrapolation), exact; `values` may carry leading axes as in _interpolate.
+    """
+    slopes = np.diff(values, axis=-1) / np.diff(times)
+    increments = 0.5 * (values[..., :-1] + values[..., 1:]) * np.diff(times)
+    cumulative = np.concatenate([np.zeros(values.shape[:-1] + (1,)), np.cumsum(increments, axis=-1)], axis=-1)
+
+    def from_first_node(t):
+        if extrapolation == "flat":
+            i = np.clip(np.searchsorted(times, t, side="right") - 1, 0, len(times) - 1)
+            padded = np.concatenate([slopes, np.zeros(values.shape[:-1] + (1,))], axis=-1)
+            slope = np.where((t < times[0]) | (i == len(times) - 1), 0.0, padded[..., i])
+        else:
+            i = np.clip(np.searchsorted(times, t, side="right") - 1, 0, len(times) - 2)
+            slope = slopes[..., i]
+        dt = t - times[i]
+        return cumulative[..., i] + values[..., i] * dt + 0.5 * slope * dt**2
+
+    origin = from_first_node(np.zeros(1))[..., 0]
+    return from_first_node(t) - (origin[..., None] if values.ndim > 1 else origin)
+
+
+def key_rate_bumped(curve, factors, t, samples=None):
+    """
+    Values at times `t` of the curve under each row of key-rate `factors`
+    (gaussian_bump_factors rows), as curve.bumped() would give them, in one
+    (rows x len(t)) array without building the bumped curves.
+
+    samples: the curve on BUMP_GRID, if already known
+    """
+    samples = np.asarray(curve(BUMP_GRID), dtype=float) if samples is None else samples
+    return _interpolate(BUMP_GRID, samples * factors, np.asarray(t, dtype=float), "flat")
+
+
+def key_rate_survival(hazard_rate_curve, factors, horizon, t, samples=None, num_points=100):
+    """
+    S(t) under each row of key-rate `factors`: row i matches
+    SurvivalCurve(bumped curve i, horizon, num_points)(t), computed for all
+    rows at once. A HazardCurve keeps its buckets and has its rates scaled
+    (as HazardCurve.bumped); any other curve is bumped on its BUMP_GRID
+    samples (`samples` if already known), as Curve.bumped.
+
+    Returns: array of shape (rows, len(t))
+    """
+    t = np.asarray(t, dtype=float)
+    if isinstance(hazard_rate_curve, HazardCurve):
+        curve = hazard_rate_curve
+        nodes = np.union1d(BUMP_GRID, curve.tenors)
+        scale = curve._factor(nodes) * _interpolate(BUMP_GRID, factors, nodes, "flat")
+        starts = curve._starts
+        exposure = _integral(nodes, scale, starts[1:], "flat") - _integral(nodes, scale, starts[:-1], "flat")
+        cumulative = np.concatenate([np.zeros((len(scale), 1)), np.cumsum(curve.hazard_rates[:-1] * exposure, axis=-1)], axis=-1)
+        bucket = np.minimum(np.searchsorted(curve.tenors, t, side="left"), len(curve.tenors) - 1)
+        partial = _integral(nodes, scale, t, "flat") - _integral(nodes, scale, starts[bucket], "flat")
+        return np.exp(-(cumulative[:, bucket] + curve.hazard_rates[bucket] * partial))
+
+    samples = np.asarray(hazard_rate_curve(BUMP_GRID), dtype=float) if samples is None else samples
+    # SurvivalCurve's grid for a curve with knots on BUMP_GRID
+    times = np.unique(np.concatenate([np.linspace(0.0, horizon, num_points + 1),
+                                      BUMP_GRID[(BUMP_GRID > 0) & (BUMP_GRID < horizon)]]))
+    rates, slopes, cumulative = _segment_nodes(times, _interpolate(BUMP_GRID, samples * factors, times, "flat"))
+    idx = np.clip(np.searchsorted(times, t, side="right") - 1, 0, len(times) - 1)
+    dt = t - times[idx]
+    return np.exp(-(cumulative[:, idx] + rates[:, idx] * dt + 0.5 * slopes[:, idx] * dt**2))
+
+
+class Curve:
+    __slots__ = ("times", "values", "kind", "shift", "extrapolation", "_knots", "_nodes")
+
+    def __init__(self, times, values, kind="discount", shift=0.0, extrapolation="linear"):
+        """
+        Array-backed curve: node values linearly interpolated in time (as
+        interp1d with fill_value='extrapolate'), times a parallel shift
+        factor exp(-shift * t).
+
+        Shifting returns a new Curve over the same node arrays with a
+        different `shift`, so repeated bumps never nest closures, and curves
+        pickle (e.g. for process pools). Calls with a Python float take a
+        scalar path; arrays are evaluated in one vectorized pass.
+
+        Parameters:
+        - times, values: node tenors (years) and values, at least two nodes
+        - kind: "discount" (values are discount factors) or "hazard" (hazard rates)
+        - shift: float, continuous rate shift applied as exp(-shift * t)
+        - extrapolation: "linear" or "flat" beyond the first and last node
+        """
+        if kind not in ("discount", "hazard"):
+            raise ValueError("kind must be 'discount' or 'hazard'")
+        if extrapolation not in ("linear", "flat"):
+            raise ValueError("extrapolation must be 'linear' or 'flat'")
+        times = np.asarray(times, dtype=float)
+        order = np.argsort(times)
+        self.times = times[order]
+        self.values = np.asarray(values, dtype=float)[order]
+        if len(self.times) < 2:
+            raise ValueError("a Curve needs at least two nodes")
+        self.kind = kind
+        self.shift = float(shift)
+        self.extrapolation = extrapolation
+        self._knots = self.times.tolist()
+        self._nodes = self.values.tolist()
+
+    @classmethod
+    def from_zero_rates(cls, times, zero_rates, **kwargs):
+        """Discount curve with DF(t) = exp(-r(t) * t) at the nodes."""
+        times = np.asarray(times, dtype=float)
+        return cls(times, np.exp(-np.asarray(zero_rates, dtype=float) * times), kind="discount", **kwargs)
+
+    @property
+    def x(self):
+        return self.times
+
+    def __call__(self, t):
+        if isinstance(t, (float, int)):
+            knots, nodes = self._knots, self._nodes
+            i = min(max(bisect_right(knots, t) - 1, 0), len(knots) - 2)
+            w = (t - knots[i]) / (knots[i + 1] - knots[i])
+            if self.extrapolation == "flat":
+                w = min(max(w, 0.0), 1.0)
+            value = nodes[i] + w * (nodes[i + 1] - nodes[i])
+            return value * math.exp(-self.shift * t) if self.shift else value
+
+        t = np.asarray(t, dtype=float)
+        value = _interpolate(self.times, self.values, t, self.extrapolation)
+        return value * np.exp(-self.shift * t) if self.shift else value
+
+    def integral(self, t):
+        """
+        ∫₀^t of the curve's node interpolation (including extrapolation),
+        exact for the piecewise-linear curve. Requires shift == 0.
+        """
+        if self.shift:
+            raise ValueError("integral() is only available for unshifted curves")
+        return _integral(self.times, self.values, np.asarray(t, dtype=float), self.extrapolation)
+
+    def discount_factor(self, t):
+        if self.kind != "discount":
+            raise ValueError("discount_factor() needs a discount curve")
+        return self(t)
+
+    def zero_rate(self, t):
+        """Continuously compounded zero rate -ln(DF(t)) / t."""
+        return -np.log(self.discount_factor(t)) / t
+
+    def hazard_rate(self, t):
+        if self.kind != "hazard":
+            raise ValueError("hazard_rate() needs a hazard curve")
+        return self(t)
+
+    def shifted(self, shift):
+        """New curve with values * exp(-shift * t) (the engines' parallel shift)."""
+        return Curve(self.times, self.values, self.kind, self.shift + shift, self.extrapolation)
+
+    def bumped(self, bump_bp, tenor=None, sigma=0.25):
+        """
+        Parallel bump of `bump_bp` (tenor=None), or a Gaussian key-rate bump
+        centred at `tenor`, with SensitivityEngine's conventions.
+        """
+        if tenor is None:
+            return self.shifted(bump_bp / 10000)
+        return _gaussian_bump(self, bump_bp / 10000, tenor, sigma)
+
+    def __reduce__(self):
+        return Curve, (self.times, self.values, self.kind, self.shift, self.extrapolation)
+
+    def __repr__(self):
+        return (f"Curve(kind={self.kind!r}, nodes={len(self.times)}, shift={self.shift!r}, "
+                f"extrapolation={self.extrapolation!r})")
+
+
+class SurvivalCurve:
+    def __init__(self, hazard_rate_curve, horizon=30.0, num_points=100):
+        """
+        Survival curve S(t) = exp(-∫₀^t h(s) ds), built once from a hazard curve.
+
+        The hazard curve is sampled on a grid over [0, horizon] (plus its own
+        knots, `.x`, if it has them) and treated as linear between nodes, so the
+        cumulative hazard is integrated exactly segment by segment and stored on
+        the nodes. S(t) for a whole array of times is then a single lookup.
+        Beyond the horizon the hazard is held flat at its last value.
+
+        Parameters:
+        - hazard_rate_curve: callable t -> hazard rate (vectorized)
+        - horizon: float, last time (in years) the curve needs to cover
+        - num_points: int, number of grid intervals over [0, horizon]
+        """
+        self.hazard_rate_curve = hazard_rate_curve
+        self.horizon = horizon
+
+        self.times = _grid([hazard_rate_curve], horizon, num_points)
+        self.rates, self.slopes, self.cumulative = _sample(hazard_rate_curve, self.times)
+
+    def cumulative_hazard(self, t):
+        """∫₀^t h(s) ds for a scalar or an array of times."""
+        if hasattr(self.hazard_rate_curve, "cumulative_hazard"):
+            return self.hazard_rate_curve.cumulative_hazard(t)
+        t = np.asarray(t, dtype=float)
+        idx = np.clip(np.searchsorted(self.times, t, side="right") - 1, 0, len(self.times) - 1)
+        dt = t - self.times[idx]
+        return self.cumulative[idx] + self.rates[idx] * dt + 0.5 * self.slopes[idx] * dt**2
+
+    def __call__(self, t):
+        return np.exp(-self.cumulative_hazard(t))
+
+
+class SurvivalCurveSet:
+    def __init__(self, hazard_rate_curves, horizon=30.0, num_points=100):
+        """
+        A stack of survival curves sharing one node grid, one row per trade.
+
+        Rows that refer to the same hazard curve object share a single sampled
+        curve, so a book of many trades on a few issuers only integrates each
+        issuer's curve once. Evaluation takes one time per row (or a row of
+        times per row) and returns S(t) for all rows in a single vectorized call.
+
+        Parameters:
+        - hazard_rate_curves: list of callables t -> hazard rate, one per row
+        - horizon: float, last time (in years) the curves need to cover
+        - num_points: int, number of grid intervals over [0, horizon]
+        """
+        unique = {}
+        index = np.empty(len(hazard_rate_curves), dtype=int)
+        for row, curve in enumerate(hazard_rate_curves):
+            index[row] = unique.setdefault(id(curve), (len(unique), curve))[0]
+
+        self.hazard_rate_curves = [curve for _, curve in unique.values()]
+        self.horizon = horizon
+        self.index = index
+
+        self.times = _grid(self.hazard_rate_curves, horizon, num_points)
+        samples = [_sample(curve, self.times) for curve in self.hazard_rate_curves]
+        self.rates, self.slopes, self.cumulative = (np.array(column) for column in zip(*samples))
+
+    def __len__(self):
+        return len(self.index)
+
+    def cumulative_hazard(self, t, rows=None):
+        """
+        ∫₀^t h(s) ds per row.
+
+        `t` is a scalar (one value per row), a 1-D array of times shared by
+        every row, or a 2-D array with one row of times per selected row.
+        `rows` selects a subset of rows (default: all).
+        """
+        rows = np.arange(len(self)) if rows is None else np.asarray(rows)
+        t = np.asarray(t, dtype=float)
+        scalar = t.ndim == 0
+        if t.ndim < 2:
+            t = np.broadcast_to(t, (len(rows), t.size))
+        idx = np.clip(np.searchsorted(self.times, t, side="right") - 1, 0, len(self.times) - 1)
+        dt = t - self.times[idx]
+        # Flat positions into the (curves x nodes) tables: one cheap take per table
+        flat = idx + (self.index[rows] * len(self.times))[:, None]
+        hazard = (self.cumulative.take(flat) + self.rates.take(flat) * dt
+                  + 0.5 * self.slopes.take(flat) * dt**2)
+        return hazard[:, 0] if scalar else hazard
+
+    def __call__(self, t, rows=None):
+        return np.exp(-self.cumulative_hazard(t, rows))
+
+    def hazard_rate(self, t, rows=None):
+        """Hazard rate per row, with the same conventions for `t` and `rows` as cumulative_hazard."""
+        rows = np.arange(len(self)) if rows is None else np.asarray(rows)
+        t = np.asarray(t, dtype=float)
+        scalar = t.ndim == 0
+        if t.ndim < 2:
+            t = np.broadcast_to(t, (len(rows), t.size))
+        idx = np.clip(np.searchsorted(self.times, t, side="left") - 1, 0, len(self.times) - 1)
+        flat = idx + (self.index[rows] * len(self.times))[:, None]
+        hazard = self.rates.take(flat) + self.slopes.take(flat) * (t - self.times[idx])
+        return hazard[:, 0] if scalar else hazard
+
+
+class HazardCurve:
+    def __init__(self, tenors, hazard_rates, shift=0.0, scale=None):
+        """
+        Piecewise-constant hazard curve, as produced by a sequential bootstrap:
+        h(t) = λ_k on (T_{k-1}, T_k], λ_1 from 0 and λ_K beyond the last tenor.
+        At a tenor the curve returns the rate of the bucket ending there.
+
+        Bumps keep the buckets and multiply the rates by a factor m(t):
+        exp(-shift * t) for the engines' parallel shift, or a sampled `scale`
+        Curve for key-rate bumps. The cumulative hazard stays exact either way,
+        so jumps between buckets are never smeared by resampling.
+
+        Parameters:
+        - tenors: increasing bucket end points T_1 < ... < T_K (years)
+        - hazard_rates: λ_1, ..., λ_K
+        - shift: float, parallel shift applied as exp(-shift * t)
+        - scale: optional Curve m(t) multiplying the rates (overrides shift)
+        """
+        self.tenors = np.asarray(tenors, dtype=float)
+        self.hazard_rates = np.asarray(hazard_rates, dtype=float)
+        self.shift = float(shift)
+        self.scale = scale
+        self.kind = "hazard"
+        self.x = self.tenors
+        self.diagnostics = {}
+        starts = np.concatenate([[0.0], self.tenors[:-1]])
+        self._starts = starts
+        self._cumulative = np.concatenate([[0.0], np.cumsum(self.hazard_rates[:-1] * self._exposure(starts[:-1], starts[1:]))])
+
+    def _factor(self, t):
+        t = np.asarray(t, dtype=float)
+        if self.scale is not None:
+            return self.scale(t)
+        return np.exp(-self.shift * t) if self.shift else np.ones_like(t)
+
+    def _exposure(self, start, t):
+        """∫_start^t m(s) ds."""
+        if self.scale is not None:
+            return self.scale.integral(t) - self.scale.integral(start)
+        if not self.shift:
+            return t - start
+        return (np.exp(-self.shift * start) - np.exp(-self.shift * t)) / self.shift
+
+    def __call__(self, t):
+        bucket = np.minimum(np.searchsorted(self.tenors, t, side="left"), len(self.tenors) - 1)
+        rates = self.hazard_rates[bucket]
+        return rates * self._factor(t) if self.shift or self.scale is not None else rates
+
+    def hazard_rate(self, t):
+        return self(t)
+
+    def cumulative_hazard(self, t):
+        """∫₀^t h(s) ds, exact for the piecewise-constant curve."""
+        t = np.asarray(t, dtype=float)
+        bucket = np.minimum(np.searchsorted(self.tenors, t, side="left"), len(self.tenors) - 1)
+        return self._cumulative[bucket] + self.hazard_rates[bucket] * self._exposure(self._starts[bucket], t)
+
+    def shifted(self, shift):
+        """New curve with values * exp(-shift * t) (the engines' parallel shift)."""
+        if self.scale is not None:
+            times = self.scale.times
+            return self.scaled(times, np.exp(-shift * times), self.scale.extrapolation)
+        return HazardCurve(self.tenors, self.hazard_rates, self.shift + shift)
+
+    def scaled(self, times, factors, extrapolation="flat"):
+        """
+        New curve with the rates multiplied by the factors sampled at `times`
+        (linear in between), on top of any existing shift or scale.
+        """
+        factor = Curve(times, factors, kind="hazard", extrapolation=extrapolation)
+        nodes = np.union1d(factor.times, self.tenors)
+        scale = Curve(nodes, self._factor(nodes) * factor(nodes), kind="hazard", extrapolation=extrapolation)
+        return HazardCurve(self.tenors, self.hazard_rates, scale=scale)
+
+    def bumped(self, bump_bp, tenor=None, sigma=0.25):
+        """
+        Parallel bump (tenor=None), or SensitivityEngine's Gaussian key-rate
+        bump applied to the bucket rates through a sampled scale curve.
+        """
+        if tenor is None:
+            return self.shifted(bump_bp / 10000)
+        return self.scaled(BUMP_GRID, gaussian_bump_factors(bump_bp / 10000, tenor, sigma)[0])
+
+
+class HazardCurveSet:
+    def __init__(self, names, tenors, hazard_rates):
+        """
+        Piecewise-constant hazard curves for many reference entities on a
+        common tenor grid, stored as one (names x tenors) array.
+
+        Indexing by name (or row number) returns that entity's HazardCurve,
+        which any pricer accepts; the same object is returned on every lookup,
+        so pricers and the leg cache see a stable curve. CDSBook also accepts
+        the set directly.
+
+        Parameters:
+        - names: reference entity identifiers, one per row
+        - tenors: increasing bucket end points shared by every curve (years)
+        - hazard_rates: array of shape (len(names), len(tenors))
+        """
+        self.names = list(names)
+        self.tenors = np.asarray(tenors, dtype=float)
+        self.hazard_rates = np.asarray(hazard_rates, dtype=float).reshape(len(self.names), len(self.tenors))
+        self.diagnostics = {}
+        self._rows = {name: row for row, name in enumerate(self.names)}
+        if len(self._rows) != len(self.names):
+            raise ValueError("names must be unique")
+        self._curves = {}
+
+        starts = np.concatenate([[0.0], self.tenors[:-1]])
+        self._starts = starts
+        self._cumulative = np.concatenate([np.zeros((len(self.names), 1)),
+                                           np.cumsum(self.hazard_rates[:, :-1] * np.diff(starts), axis=1)], axis=1)
+
+    def __len__(self):
+        return len(self.names)
+
+    def __contains__(self, name):
+        return name in self._rows
+
+    def __iter__(self):
+        return iter(self.names)
+
+    def row(self, name):
+        """Row number of a reference entity."""
+        return self._rows[name]
+
+    def __getitem__(self, name):
+        row = name if isinstance(name, (int, np.integer)) and name not in self._rows else self._rows[name]
+        curve = self._curves.get(row)
+        if curve is None:
+            curve = self._curves[row] = HazardCurve(self.tenors, self.hazard_rates[row])
+        return curve
+
+    def curves(self, names=None):
+        """HazardCurve objects for `names` (default: every entity, in row order)."""
+        return [self[name] for name in (self.names if names is None else names)]
+
+    def _buckets(self, t, rows):
+        rows = np.arange(len(self)) if rows is None else np.asarray(rows)
+        t = np.asarray(t, dtype=float)
+        scalar = t.ndim == 0
+        if t.ndim < 2:
+            t = np.broadcast_to(t, (len(rows), t.size))
+        bucket = np.minimum(np.searchsorted(self.tenors, t, side="left"), len(self.tenors) - 1)
+        return rows[:, None], t, bucket, scalar
+
+    def __call__(self, t, rows=None):
+        """
+        Hazard rate per row. `t` is a scalar (one value per row), a 1-D array
+        shared by every row or a 2-D array with one row of times per selected
+        row; `rows` selects row numbers (default: all).
+        """
+        rows, t, bucket, scalar = self._buckets(t, rows)
+        hazard = self.hazard_rates[rows, bucket]
+        return hazard[:, 0] if scalar else hazard
+
+    def cumulative_hazard(self, t, rows=None):
+        """∫₀^t h(s) ds per row, with the same conventions as __call__."""
+        rows, t, bucket, scalar = self._buckets(t, rows)
+        hazard = self._cumulative[rows, bucket] + self.hazard_rates[rows, bucket] * (t - self._starts[bucket])
+        return hazard[:, 0] if scalar else hazard
+
+    def survival_probability(self, t, rows=None):
+        return np.exp(-self.cumulative_hazard(t, rows))
+
+
+class ScaledHazardCurve:
+    def __init__(self, hazard_rate_curve, tenors, multipliers):
+        """
+        Hazard curve h(t) * a_k on each tenor bucket (T_{k-1}, T_k], with the
+        last multiplier applied beyond the last tenor. Used for index basis
+        adjustments of constituent curves.
+
+        Parameters:
+        - hazard_rate_curve: callable t -> hazard rate (the unadjusted curve)
+        - tenors: increasing bucket end points T_1 < ... < T_K (years)
+        - multipliers: a_1, ..., a_K
+        """
+        self.hazard_rate_curve = hazard_rate_curve
+        self.tenors = np.asarray(tenors, dtype=float)
+        self.multipliers = np.asarray(multipliers, dtype=float)
+        self.x = np.union1d(np.asarray(getattr(hazard_rate_curve, "x", []), dtype=float), self.tenors)
+        self._base = None
+
+    def __call__(self, t):
+        bucket = np.minimum(np.searchsorted(self.tenors, t, side="left"), len(self.tenors) - 1)
+        return self.hazard_rate_curve(t) * self.multipliers[bucket]
+
+    def cumulative_hazard(self, t):
+        """Sum over buckets of a_k times the unadjusted hazard integrated over the bucket up to t."""
+        t = np.asarray(t, dtype=float)
+        if self._base is None or self._base.horizon < np.max(t, initial=0.0):
+            self._base = SurvivalCurve(self.hazard_rate_curve, horizon=max(np.max(t, initial=0.0), self.tenors[-1]))
+        lower = np.concatenate([[0.0], self.tenors[:-1]])
+        upper = np.append(self.tenors[:-1], np.inf)
+        partial = self._base.cumulative_hazard(np.clip(t[..., None], lower, upper)) - self._base.cumulative_hazard(lower)
+        return partial @ self.multipliers
+
+
+class ShiftedHazardCurve:
+    def __init__(self, hazard_rate_curve, tenors, shifts):
+        """
+        Hazard curve h(t) + s_k on each tenor bucket (T_{k-1}, T_k], with the
+        last shift applied beyond the last tenor. Used for simulated bucket
+        hazard moves (analytics.monte_carlo_var).
+
+        Parameters:
+        - hazard_rate_curve: callable t -> hazard rate (the unshifted curve)
+        - tenors: increasing bucket end points T_1 < ... < T_K (years)
+        - shifts: s_1, ..., s_K
+        """
+        self.hazard_rate_curve = hazard_rate_curve
+        self.tenors = np.asarray(tenors, dtype=float)
+        self.shifts = np.asarray(shifts, dtype=float)
+        self.x = np.union1d(np.asarray(getattr(hazard_rate_curve, "x", []), dtype=float), self.tenors)
+        self._base = None
+
+    def __call__(self, t):
+        bucket = np.minimum(np.searchsorted(self.tenors, t, side="left"), len(self.tenors) - 1)
+        return self.hazard_rate_curve(t) + self.shifts[bucket]
+
+    def cumulative_hazard(self, t):
+        """Unshifted cumulative hazard plus s_k times the time spent in each bucket up to t."""
+        t = np.asarray(t, dtype=float)
+        if self._base is None or self._base.horizon < np.max(t, initial=0.0):
+            self._base = SurvivalCurve(self.hazard_rate_curve, horizon=max(np.max(t, initial=0.0), self.tenors[-1]))
+        lower = np.concatenate([[0.0], self.tenors[:-1]])
+        upper = np.append(self.tenors[:-1], np.inf)
+        return self._base.cumulative_hazard(t) + (np.clip(t[..., None], lower, upper) - lower) @ self.shifts
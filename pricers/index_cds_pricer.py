@@ -1,12 +1,18 @@
 import numpy as np
-from scipy.interpolate import interp1d
+from pricers.curves import Curve, SurvivalCurve
+from pricers.leg_cache import LEG_CACHE, unit_legs
+from pricers.schedule import schedule_for
+from pricers.cds_book import CDSBook
 
 class IndexCDSPricer:
     def __init__(self, notional, maturity, index_spread, recovery_rate,
-                 discount_curve, hazard_rate_curve, num_names=125, defaults=0, payment_frequency=0.25):
+                 discount_curve, hazard_rate_curve, num_names=125, defaults=0, payment_frequency=0.25,
+                 constituent_hazard_curves=None, constituent_recoveries=None, constituent_weights=None,
+                 trade_date=None, holidays=()):
         """
         Key Assumptions:
-        Homogeneous Pool: All names in the index have the same hazard rate and recovery rate (simplification).
+        Homogeneous Pool: All names in the index have the same hazard rate and recovery rate (simplification),
+        unless constituent curves are given (see constituent mode below).
         Fixed Index Spread: Index spread is set by the market and known.
         Accrued Losses: Include losses due to defaults up to pricing date.
         Index Factor: Optionally adjust for notional factor if defaults have occurred.
@@ -23,57 +29,111 @@ class IndexCDSPricer:
         - num_names: total number of names in the index
         - defaults: number of defaults that have occurred
         - payment_frequency: float, e.g. 0.25 for quarterly
+        - trade_date: optional date; when given, premiums follow the IMM-dated
+          CDS schedule with ACT/360 accruals (see pricers.schedule.cds_schedule)
+          and curve times are measured from this date
+        - holidays: holiday dates for business-day adjustment of that schedule
+
+        Constituent mode (drops the homogeneous pool assumption):
+        - constituent_hazard_curves: list of hazard curves, one per surviving name.
+          When given, hazard_rate_curve may be None and every name is priced with
+          its own curve in one vectorized (names x time) pass.
+        - constituent_recoveries: per-name recovery rates (default: recovery_rate)
+        - constituent_weights: per-name weights in the index (default: 1 / num_names,
+          so surviving names plus defaults scale exactly as in the homogeneous pool)
         """
         self.notional = notional
         self.maturity = maturity
         self.spread = index_spread / 10000
         self.recovery_rate = recovery_rate
         self.payment_frequency = payment_frequency
+        self.trade_date = trade_date
+        self.holidays = tuple(holidays)
         self.num_names = num_names
         self.defaults = defaults
 
         self.discount_curve = self._to_interp(discount_curve)
-        self.hazard_rate_curve = self._to_interp(hazard_rate_curve)
+        self.hazard_rate_curve = None if hazard_rate_curve is None else self._to_interp(hazard_rate_curve, kind="hazard")
+        self._survival = None
+
+        self.constituent_hazard_curves = None
+        if constituent_hazard_curves is not None:
+            names = len(constituent_hazard_curves)
+            self.constituent_hazard_curves = [self._to_interp(c, kind="hazard") for c in constituent_hazard_curves]
+            self.constituent_recoveries = np.broadcast_to(
+                recovery_rate if constituent_recoveries is None else np.asarray(constituent_recoveries, dtype=float),
+                (names,))
+            self.constituent_weights = np.broadcast_to(
+                1 / num_names if constituent_weights is None else np.asarray(constituent_weights, dtype=float),
+                (names,))
+        self._constituents = None
 
-    def _to_interp(self, curve_input):
+    def _to_interp(self, curve_input, kind="discount"):
         if callable(curve_input):
             return curve_input
         else:
             times = sorted(curve_input.keys())
             values = [curve_input[t] for t in times]
-            return interp1d(times, values, kind='linear', fill_value='extrapolate')
+            return Curve(times, values, kind=kind)
+
+    def _survival_curve(self):
+        """Survival curve for the current hazard curve, rebuilt only when that curve is replaced."""
+        if self._survival is None or self._survival.hazard_rate_curve is not self.hazard_rate_curve:
+            self._survival = SurvivalCurve(self.hazard_rate_curve, horizon=self._schedule().maturity)
+        return self._survival
 
     def _survival_probability(self, t):
-        ts = np.linspace(0, t, 100)
-        hs = self.hazard_rate_curve(ts)
-        return np.exp(-np.trapz(hs, ts))
+        return self._survival_curve()(t)
 
     def _discount_factor(self, t):
         return self.discount_curve(t)
 
-    def _premium_leg(self):
-        times = np.arange(self.payment_frequency, self.maturity + 1e-6, self.payment_frequency)
-        premium_leg = 0.0
-        for t in times:
-            df = self._discount_factor(t)
-            sp = self._survival_probability(t)
-            premium_leg += df * sp * self.payment_frequency
+    def _schedule(self):
+        """Premium schedule: IMM dates with ACT/360 accruals given a trade date, else year fractions (memoized)."""
+        return schedule_for(self.trade_date, self.maturity, self.payment_frequency, self.holidays)
+
+    def _unit_legs(self):
+        """Per-unit leg values for this schedule, shared through the leg cache."""
+        schedule = self._schedule()
+        return LEG_CACHE.get(
+            self.discount_curve, self.hazard_rate_curve, schedule,
+            lambda: unit_legs(self.discount_curve, self._survival_curve(), schedule)
+        )
+
+    def _constituent_breakdown(self):
+        """
+        Per-name legs from one CDSBook over all constituents, each name's
+        notional being its index weight. Rebuilt whenever the discount curve
+        or any constituent curve is replaced, or the recoveries, weights or
+        trade terms change.
+        """
+        curves = (self.discount_curve,) + tuple(self.constituent_hazard_curves)
+        terms = (self.notional, self.maturity, self.spread, self.payment_frequency, self.trade_date, self.holidays,
+                 tuple(np.asarray(self.constituent_recoveries, dtype=float).tolist()),
+                 tuple(np.asarray(self.constituent_weights, dtype=float).tolist()))
+        # Curves are compared by identity; the key holds them, so their ids cannot be recycled
+        cached = self._constituents
+        if (cached is None or len(cached[0]) != len(curves)
+                or any(a is not b for a, b in zip(cached[0], curves)) or cached[1] != terms):
+            book = CDSBook(self.notional * self.constituent_weights, self.maturity, self.spread * 10000,
+                           self.constituent_recoveries, self.discount_curve, self.constituent_hazard_curves,
+                           self.payment_frequency, trade_date=self.trade_date, holidays=self.holidays)
+            self._constituents = (curves, terms, book.breakdown())
+        return self._constituents[2]
+
+    def _premium_leg(self, legs=None):
+        if self.constituent_hazard_curves is not None:
+            return np.sum(self._constituent_breakdown()["premium_leg"])
         scaling = (self.num_names - self.defaults) / self.num_names
-        return self.notional * self.spread * premium_leg * scaling
-
-    def _protection_leg(self):
-        times = np.linspace(0, self.maturity, 100)
-        prot_leg = 0.0
-        for i in range(1, len(times)):
-            t0, t1 = times[i-1], times[i]
-            dt = t1 - t0
-            sp0 = self._survival_probability(t0)
-            sp1 = self._survival_probability(t1)
-            default_prob = sp0 - sp1
-            df = self._discount_factor((t0 + t1) / 2)
-            prot_leg += df * default_prob
+        legs = self._unit_legs() if legs is None else legs
+        return self.notional * self.spread * legs.rpv01 * scaling
+
+    def _protection_leg(self, legs=None):
+        if self.constituent_hazard_curves is not None:
+            return np.sum(self._constituent_breakdown()["protection_leg"])
         scaling = (self.num_names - self.defaults) / self.num_names
-        return self.notional * (1 - self.recovery_rate) * prot_leg * scaling
+        legs = self._unit_legs() if legs is None else legs
+        return self.notional * (1 - self.recovery_rate) * legs.protection * scaling
 
     def _accrued_losses(self):
         """
@@ -81,8 +141,54 @@ class IndexCDSPricer:
         """
         return self.notional * self.defaults / self.num_names * (1 - self.recovery_rate)
 
-    def price(self):
-        prot_leg = self._protection_leg()
-        prem_leg = self._premium_leg()
+    def _price_legs(self, legs):
+        """
+        PV from UnitLegs of the homogeneous pool; legs holding arrays (one
+        entry per curve scenario) give an array of PVs. Not available in
+        constituent mode, whose legs come from the constituent curves.
+        """
+        if self.constituent_hazard_curves is not None:
+            raise ValueError("_price_legs needs the homogeneous pool (no constituent_hazard_curves)")
+        prot_leg = self._protection_leg(legs)
+        prem_leg = self._premium_leg(legs)
         accrued = self._accrued_losses()
         return prot_leg - prem_leg - accrued
+
+    def price(self):
+        if self.constituent_hazard_curves is not None:
+            return self._protection_leg() - self._premium_leg() - self._accrued_losses()
+        return self._price_legs(self._unit_legs())
+
+    def intrinsic_spread(self):
+        """
+        Spread (bps) at which the index legs are equal given the constituent
+        curves: sum of w_i * (1 - R_i) * protection_i over sum of w_i * RPV01_i.
+        """
+        if self.constituent_hazard_curves is None:
+            legs = self._unit_legs()
+            return (1 - self.recovery_rate) * legs.protection / legs.rpv01 * 10000
+        legs = self._constituent_breakdown()
+        return np.sum(legs["protection_leg"]) / np.sum(self.notional * self.constituent_weights * legs["rpv01"]) * 10000
+
+    def constituent_contributions(self):
+        """
+        Per-name contributions in constituent mode.
+
+        Returns: dict of arrays (one entry per name) with
+        - weight, rpv01, par_spread: the name's index weight, risky annuity and par spread (bps)
+        - pv, premium_leg, protection_leg: the name's share of the index legs
+        - spread_contribution: RPV01-weighted par spread; sums to intrinsic_spread()
+        """
+        if self.constituent_hazard_curves is None:
+            raise ValueError("constituent_contributions requires constituent_hazard_curves")
+        legs = self._constituent_breakdown()
+        risky_weights = self.constituent_weights * legs["rpv01"]
+        return {
+            "weight": self.constituent_weights,
+            "rpv01": legs["rpv01"],
+            "par_spread": legs["par_spread"],
+            "pv": legs["pv"],
+            "premium_leg": legs["premium_leg"],
+            "protection_leg": legs["protection_leg"],
+            "spread_contribution": risky_weights / np.sum(risky_weights) * legs["par_spread"],
+        }
@@ -0,0 +1,114 @@
+# pricers/leg_cache.py
+
+from collections import OrderedDict, namedtuple
+import numpy as np
+
+
+UnitLegs = namedtuple("UnitLegs", [
+    "rpv01",                 # sum of DF(t) * S(t) * accrual over payment dates
+    "protection",            # sum of DF(mid) * (S(t0) - S(t1)) over the protection grid
+    "annuity",               # sum of DF(t) * accrual over payment dates (riskless)
+    "discount_factor",       # DF(maturity)
+    "survival_probability",  # S(maturity)
+])
+
+
+def leg_times(schedule):
+    """
+    Times at which the legs read each curve: (discount times, survival times).
+    Both start with the payment times and end with maturity; in between are
+    the protection grid midpoints (discount) or the grid itself (survival).
+    A stacked schedule (see pricers.schedule.stack_schedules) gives one row
+    of times per schedule.
+    """
+    grid = np.linspace(0, schedule.maturity, 100, axis=-1)
+    pay, maturity = schedule.payment_times, np.expand_dims(schedule.maturity, -1)
+    return (np.concatenate([pay, (grid[..., :-1] + grid[..., 1:]) / 2, maturity], axis=-1),
+            np.concatenate([pay, grid, maturity], axis=-1))
+
+
+def legs_from_samples(discount_factors, survival_probabilities, schedule):
+    """
+    UnitLegs from curve values at leg_times(schedule). Leading axes are kept,
+    so a stack of (scenarios x times) samples gives one leg value per scenario.
+    """
+    n = np.shape(schedule.payment_times)[-1]
+    df, sp = discount_factors, survival_probabilities
+    rpv01 = np.sum(df[..., :n] * sp[..., :n] * schedule.accruals, axis=-1)
+    annuity = np.sum(df[..., :n] * schedule.accruals, axis=-1)
+    grid_sp = sp[..., n:-1]
+    protection = np.sum(df[..., n:-1] * (grid_sp[..., :-1] - grid_sp[..., 1:]), axis=-1)
+    return UnitLegs(rpv01, protection, annuity, df[..., -1], sp[..., -1])
+
+
+def unit_legs(discount_curve, survival_curve, schedule):
+    """
+    Per-unit leg values for one set of curves and a premium schedule (see
+    pricers.schedule). Pricers scale these by notional, spread, coupon and
+    recovery.
+    """
+    discount_times, survival_times = leg_times(schedule)
+    return legs_from_samples(np.asarray(discount_curve(discount_times), dtype=float),
+                             np.asarray(survival_curve(survival_times), dtype=float), schedule)
+
+
+class LegCache:
+    def __init__(self, maxsize=4096):
+        """
+        Bounded LRU cache of UnitLegs shared by the pricers.
+
+        Entries are keyed by the identity of the discount and hazard curve
+        objects and of the (memoized) schedule. Replacing a curve on a
+        pricer (as ScenarioEngine and SensitivityEngine do) therefore misses
+        the cache, and stale entries age out. Curves must be replaced, not
+        mutated in place; call invalidate() if a curve is changed in place.
+
+        maxsize: int, number of schedules kept (0 disables caching)
+        """
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self._entries = OrderedDict()
+
+    def get(self, discount_curve, hazard_rate_curve, schedule, compute):
+        """
+        Returns cached UnitLegs for the curves and schedule, calling `compute()` on a miss.
+        """
+        key = (id(discount_curve), id(hazard_rate_curve), id(schedule))
+        entry = self._entries.get(key)
+        # Entries hold the curves and schedule themselves, so an id cannot be reused while cached
+        if entry is not None and entry[0] is discount_curve and entry[1] is hazard_rate_curve and entry[2] is schedule:
+            self.hits += 1
+            self._entries.move_to_end(key)
+            return entry[3]
+
+        self.misses += 1
+        legs = compute()
+        self._entries[key] = (discount_curve, hazard_rate_curve, schedule, legs)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.maxsize:
+            self._entries.popitem(last=False)
+        return legs
+
+    def invalidate(self, curve=None):
+        """
+        Drops every entry built on `curve`, or the whole cache if curve is None.
+        """
+        if curve is None:
+            self._entries.clear()
+            return
+        for key in [k for k, (dc, hc, _, _) in self._entries.items() if dc is curve or hc is curve]:
+            del self._entries[key]
+
+    def stats(self):
+        lookups = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "size": len(self._entries),
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+        }
+
+
+# Shared by CDSPricer, IndexCDSPricer and TRSPricer
+LEG_CACHE = LegCache()
@@ -0,0 +1,185 @@
+# pricers/schedule.py
+
+from collections import namedtuple
+from functools import lru_cache
+import numpy as np
+
+Schedule = namedtuple("Schedule", [
+    "payment_times",  # time of each premium payment (years from the trade date)
+    "accruals",       # accrual fraction of each premium period
+    "maturity",       # time to the end of protection (years from the trade date)
+    "payment_dates",  # datetime64[D] payment dates (None for year-fraction schedules)
+    "accrual_start",  # datetime64[D] start of each accrual period (None for year-fraction schedules)
+    "accrual_end",    # datetime64[D] end of each accrual period (None for year-fraction schedules)
+])
+
+IMM_MONTHS = (3, 6, 9, 12)
+IMM_DAY = 20
+
+
+def _frozen(array):
+    # Schedules are shared between pricers, so their arrays must not be modified
+    array.flags.writeable = False
+    return array
+
+
+@lru_cache(maxsize=4096)
+def year_fraction_schedule(maturity, payment_frequency):
+    """
+    Premium payments every `payment_frequency` years up to `maturity`, each
+    accruing one full period: the pricers' schedule when no trade date is given.
+    """
+    times = np.arange(payment_frequency, maturity + 1e-6, payment_frequency)
+    return Schedule(_frozen(times), _frozen(np.full(len(times), float(payment_frequency))), float(maturity),
+                    None, None, None)
+
+
+def _month_number(months):
+    return months.astype(np.int64) % 12 + 1
+
+
+def next_imm_date(day):
+    """First IMM date (20 Mar/Jun/Sep/Dec) strictly after `day`."""
+    day = np.datetime64(day, "D")
+    month = day.astype("datetime64[M]")
+    candidates = month + np.arange(4)
+    dates = candidates.astype("datetime64[D]") + (IMM_DAY - 1)
+    valid = np.isin(_month_number(candidates), IMM_MONTHS) & (dates > day)
+    return dates[np.argmax(valid)]
+
+
+@lru_cache(maxsize=4096)
+def _cds_schedule(trade_date, maturity, payment_frequency, holidays):
+    trade = np.datetime64(trade_date, "D")
+    step = int(round(12 * payment_frequency))
+    if step <= 0:
+        raise ValueError("payment_frequency must be at least one month")
+
+    # Standard CDS: the tenor runs from the first IMM date after the trade
+    first_imm = next_imm_date(trade)
+    maturity_month = first_imm.astype("datetime64[M]") + int(round(12 * maturity))
+    maturity_date = maturity_month.astype("datetime64[D]") + (IMM_DAY - 1)
+
+    # Period end dates roll back from maturity on the IMM cycle
+    count = (maturity_month - trade.astype("datetime64[M]")).astype(np.int64) // step + 2
+    ends = (maturity_month - step * np.arange(count)[::-1]).astype("datetime64[D]") + (IMM_DAY - 1)
+    ends = ends[ends > trade]
+
+    calendar = np.busdaycalendar(holidays=list(holidays))
+    payment_dates = np.busday_offset(ends, 0, roll="following", busdaycal=calendar)
+
+    # ACT/360 between adjusted dates; the first period accrues from the trade date, the last
+    # runs to the unadjusted maturity inclusive
+    accrual_start = np.concatenate([[trade], payment_dates[:-1]])
+    accrual_end = np.append(payment_dates[:-1], maturity_date + 1)
+    accruals = (accrual_end - accrual_start).astype(np.int64) / 360.0
+    payment_times = (payment_dates - trade).astype(np.int64) / 365.0
+
+    return Schedule(_frozen(payment_times), _frozen(accruals), float((maturity_date - trade).astype(np.int64) / 365.0),
+                    _frozen(payment_dates), _frozen(accrual_start), _frozen(accrual_end))
+
+
+def cds_schedule(trade_date, maturity, payment_frequency=0.25, holidays=()):
+    """
+    IMM-dated CDS premium schedule with ACT/360 accruals.
+
+    Maturity is the IMM date `maturity` years after the first IMM date
+    following the trade date. Payment dates fall on the IMM cycle and are
+    rolled to the following business day (weekends and `holidays`). Times
+    are ACT/365F year fractions from the trade date, so they plug into the
+    discount and hazard curves directly.
+
+    Schedules are memoized on (trade date, maturity, frequency, holidays):
+    every trade on the same dates shares one read-only Schedule.
+
+    Parameters:
+    - trade_date: date, datetime64 or ISO string
+    - maturity: tenor in years (e.g. 5)
+    - payment_frequency: in years, a whole number of months (0.25 = quarterly)
+    - holidays: iterable of holiday dates for business-day adjustment
+
+    Returns: Schedule
+    """
+    holidays = tuple(sorted(str(np.datetime64(h, "D")) for h in holidays))
+    return _cds_schedule(str(np.datetime64(trade_date, "D")), float(maturity), float(payment_frequency), holidays)
+
+
+@lru_cache(maxsize=4096)
+def _bond_schedule(trade_date, maturity, payment_frequency, holidays):
+    trade = np.datetime64(trade_date, "D")
+    step = int(round(12 * payment_frequency))
+    if step <= 0:
+        raise ValueError("payment_frequency must be at least one month")
+
+    # Period ends roll back from maturity on the trade date's day of the month (end of shorter months)
+    trade_month = trade.astype("datetime64[M]")
+    day = (trade - trade_month.astype("datetime64[D]")).astype(np.int64)
+    maturity_month = trade_month + int(round(12 * maturity))
+    months = maturity_month - step * np.arange((maturity_month - trade_month).astype(np.int64) // step + 1)[::-1]
+    month_length = ((months + 1).astype("datetime64[D]") - months.astype("datetime64[D]")).astype(np.int64)
+    ends = months.astype("datetime64[D]") + np.minimum(day, month_length - 1)
+    ends = ends[ends > trade]
+
+    calendar = np.busdaycalendar(holidays=list(holidays))
+    payment_dates = np.busday_offset(ends, 0, roll="following", busdaycal=calendar)
+
+    # ACT/365F between adjusted dates, the first period (a short stub if any) accruing from the trade date
+    accrual_start = np.concatenate([[trade], payment_dates[:-1]])
+    accruals = (payment_dates - accrual_start).astype(np.int64) / 365.0
+    payment_times = (payment_dates - trade).astype(np.int64) / 365.0
+
+    return Schedule(_frozen(payment_times), _frozen(accruals), float(payment_times[-1]),
+                    _frozen(payment_dates), _frozen(accrual_start), _frozen(payment_dates.copy()))
+
+
+def bond_schedule(trade_date, maturity, payment_frequency=0.25, holidays=()):
+    """
+    Bond-style coupon schedule with ACT/365F accruals, for the TRS coupon
+    and financing legs.
+
+    Maturity falls `maturity` years after the trade date, on the same day of
+    the month. Period end dates roll back from it every `payment_frequency`
+    and are moved to the following business day (weekends and `holidays`);
+    a broken first period becomes a short stub from the trade date.
+    Memoized like cds_schedule.
+
+    Returns: Schedule
+    """
+    holidays = tuple(sorted(str(np.datetime64(h, "D")) for h in holidays))
+    return _bond_schedule(str(np.datetime64(trade_date, "D")), float(maturity), float(payment_frequency), holidays)
+
+
+def schedule_for(trade_date, maturity, payment_frequency, holidays=()):
+    """IMM schedule when a trade date is given, else the year-fraction schedule."""
+    if trade_date is None:
+        return year_fraction_schedule(float(maturity), float(payment_frequency))
+    return cds_schedule(trade_date, maturity, payment_frequency, holidays)
+
+
+def stack_schedules(schedules):
+    """
+    Several schedules as one Schedule of padded (schedules x payments)
+    arrays, so leg_cache.leg_times and legs_from_samples evaluate all of
+    them at once. Padding payments have time 0 and zero accrual.
+    """
+    width = max(len(schedule.payment_times) for schedule in schedules)
+    times = np.zeros((len(schedules), width))
+    accruals = np.zeros((len(schedules), width))
+    for row, schedule in enumerate(schedules):
+        times[row, :len(schedule.payment_times)] = schedule.payment_times
+        accruals[row, :len(schedule.accruals)] = schedule.accruals
+    maturities = np.array([schedule.maturity for schedule in schedules], dtype=float)
+    return Schedule(times, accruals, maturities, None, None, None)
+
+
+def age_schedule(schedule, elapsed):
+    """
+    The schedule seen `elapsed` years after its start (one value, or one per
+    row of a stacked schedule): times move closer, payments already made
+    drop out (time 0, zero accrual) and the maturity is floored at 0.
+    """
+    elapsed = np.asarray(elapsed, dtype=float)
+    times = schedule.payment_times - elapsed[..., None]
+    alive = (times > 0) & (schedule.accruals > 0)
+    return Schedule(np.where(alive, times, 0.0), np.where(alive, schedule.accruals, 0.0),
+                    np.maximum(schedule.maturity - elapsed, 0.0), None, None, None)
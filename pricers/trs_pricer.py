@@ -1,12 +1,14 @@
 # pricers/trs_pricer.py
 
-import numpy as np
-from scipy.interpolate import interp1d
+from pricers.curves import Curve, SurvivalCurve
+from pricers.leg_cache import LEG_CACHE, unit_legs
+from pricers.schedule import bond_schedule, year_fraction_schedule
 
 class TRSPricer:
     def __init__(self, notional, maturity, spread, coupon_rate, 
                  recovery_rate, discount_curve, hazard_rate_curve, 
-                 financing_rate=0.03, payment_frequency=0.25):
+                 financing_rate=0.03, payment_frequency=0.25,
+                 trade_date=None, holidays=()):
         """
         Key Assumptions:
         The TRS is on a corporate bond.
@@ -24,6 +26,10 @@ class TRSPricer:
         - hazard_rate_curve: {tenor: hazard rate}
         - financing_rate: annualized rate paid on notional (e.g., 3%)
         - payment_frequency: float (e.g., 0.25 for quarterly)
+        - trade_date: optional date; when given, coupons and financing follow a
+          bond-style schedule with ACT/365F accruals (see
+          pricers.schedule.bond_schedule) and curve times are measured from this date
+        - holidays: holiday dates for business-day adjustment of that schedule
         """
         self.notional = notional
         self.maturity = maturity
@@ -32,63 +38,77 @@ class TRSPricer:
         self.recovery_rate = recovery_rate
         self.financing_rate = financing_rate
         self.payment_frequency = payment_frequency
+        self.trade_date = trade_date
+        self.holidays = tuple(holidays)
 
         self.discount_curve = self._to_interp(discount_curve)
-        self.hazard_rate_curve = self._to_interp(hazard_rate_curve)
+        self.hazard_rate_curve = self._to_interp(hazard_rate_curve, kind="hazard")
+        self._survival = None
 
-    def _to_interp(self, curve_input):
+    def _to_interp(self, curve_input, kind="discount"):
         if callable(curve_input):
             return curve_input
         else:
             times = sorted(curve_input.keys())
             values = [curve_input[t] for t in times]
-            return interp1d(times, values, kind='linear', fill_value='extrapolate')
+            return Curve(times, values, kind=kind)
+
+    def _survival_curve(self):
+        """Survival curve for the current hazard curve, rebuilt only when that curve is replaced."""
+        if self._survival is None or self._survival.hazard_rate_curve is not self.hazard_rate_curve:
+            self._survival = SurvivalCurve(self.hazard_rate_curve, horizon=self._schedule().maturity)
+        return self._survival
 
     def _survival_probability(self, t):
-        ts = np.linspace(0, t, 100)
-        hs = self.hazard_rate_curve(ts)
-        return np.exp(-np.trapz(hs, ts))
+        return self._survival_curve()(t)
 
     def _discount_factor(self, t):
         return self.discount_curve(t)
 
-    def _expected_price(self, t):
-        """Expected bond price at time t"""
-        sp = self._survival_probability(t)
-        return sp + (1 - sp) * self.recovery_rate
+    def _schedule(self):
+        """Coupon and financing schedule: bond dates with ACT/365F accruals given a trade date, else year fractions (memoized)."""
+        if self.trade_date is None:
+            return year_fraction_schedule(float(self.maturity), float(self.payment_frequency))
+        return bond_schedule(self.trade_date, self.maturity, self.payment_frequency, self.holidays)
+
+    def _unit_legs(self):
+        """Per-unit leg values for this schedule, shared through the leg cache."""
+        schedule = self._schedule()
+        return LEG_CACHE.get(
+            self.discount_curve, self.hazard_rate_curve, schedule,
+            lambda: unit_legs(self.discount_curve, self._survival_curve(), schedule)
+        )
 
-    def _total_return_leg(self):
+    def _total_return_leg(self, legs=None):
         """
         Return = Coupon Income + Price Change (expected terminal value - current price)
         """
+        legs = self._unit_legs() if legs is None else legs
+
         # Expected terminal bond value
-        terminal_price = self._expected_price(self.maturity)
+        sp_term = legs.survival_probability
+        terminal_price = sp_term + (1 - sp_term) * self.recovery_rate
 
         # Coupon leg (received)
-        times = np.arange(self.payment_frequency, self.maturity + 1e-6, self.payment_frequency)
-        coupons = 0.0
-        for t in times:
-            df = self._discount_factor(t)
-            sp = self._survival_probability(t)
-            coupons += df * sp * self.coupon_rate * self.payment_frequency
+        coupons = legs.rpv01 * self.coupon_rate
 
         # Terminal value (bond is worth expected_price at maturity)
-        df_term = self._discount_factor(self.maturity)
-        terminal_val = df_term * terminal_price
+        terminal_val = legs.discount_factor * terminal_price
 
         return self.notional * (coupons + terminal_val)
 
-    def _financing_leg(self):
+    def _financing_leg(self, legs=None):
         """
         Pay financing cost + TRS spread
         """
-        times = np.arange(self.payment_frequency, self.maturity + 1e-6, self.payment_frequency)
-        total_cost = 0.0
+        legs = self._unit_legs() if legs is None else legs
         rate = self.financing_rate + self.spread
-        for t in times:
-            df = self._discount_factor(t)
-            total_cost += df * rate * self.payment_frequency
+        total_cost = legs.annuity * rate
         return self.notional * total_cost
 
+    def _price_legs(self, legs):
+        """PV from UnitLegs; legs holding arrays (one entry per curve scenario) give an array of PVs."""
+        return self._total_return_leg(legs) - self._financing_leg(legs)
+
     def price(self):
-        return self._total_return_leg() - self._financing_leg()
+        return self._price_legs(self._unit_legs())
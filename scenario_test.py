@@ -26,3 +26,8 @@ engine.run_scenario("steepening", dc_key_rate_shifts={1: 0.002, 5: 0.01})
 # Print results
 for scenario, data in engine.summarize().items():
     print(f"{scenario}: Price = {data['price']:.2f}, Δ = {data['delta']:.2f}")
+
+# Rates-by-credit stress grid in one pass
+grid = engine.run_grid(dc_shifts=[-0.01, 0.0, 0.01], hc_shifts=[0.0, 0.005, 0.01],
+                       dc_key_rate_shifts={"steepening": {1: 0.002, 5: 0.01}})
+print(grid - engine.results["base"])
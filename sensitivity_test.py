@@ -1,4 +1,6 @@
 from pricers.cds_pricer import CDSPricer
+from pricers.index_cds_pricer import IndexCDSPricer
+from pricers.trs_pricer import TRSPricer
 from analytics.curve_construction import DiscountCurveBuilder, HazardCurveBuilder
 from analytics.sensitivity import SensitivityEngine
 from visualizations.risk_report_plot import plot_risk_report
@@ -26,6 +28,31 @@ kr_sens = engine.compute_key_rate_sensitivities(tenors=[1, 3, 5])
 for tenor, sens in kr_sens.items():
     print(f"Tenor {tenor}y -> IR01: {sens['IR01']:.2f}, CS01: {sens['CS01']:.2f}")
 
+# Batched bumps against one deep-copied reprice per bump
+unbatched = SensitivityEngine(pricer, dc, hc, batched=False)
+print("Unbatched parallel PV01s:", unbatched.compute_pv01())
+kr_unbatched = unbatched.compute_key_rate_sensitivities(tenors=[1, 3, 5])
+for tenor in kr_sens:
+    print(f"Tenor {tenor}y -> IR01 diff: {kr_sens[tenor]['IR01'] - kr_unbatched[tenor]['IR01']:.2e}, "
+          f"CS01 diff: {kr_sens[tenor]['CS01'] - kr_unbatched[tenor]['CS01']:.2e}")
+
+# Same check for the other pricer types, and on callable (non-Curve) curves,
+# which the engine bumps on its sampled grid
+dc_fn, hc_fn = (lambda t: dc(t)), (lambda t: hc(t))
+checks = {
+    "Index": (IndexCDSPricer(1e7, 5, 60, 0.4, dc, hc, num_names=125, defaults=3), dc, hc),
+    "TRS": (TRSPricer(1e7, 5, 100, 0.05, 0.4, dc, hc), dc, hc),
+    "CDS, callable curves": (CDSPricer(1e7, 5, 150, 0.4, dc_fn, hc_fn), dc_fn, hc_fn),
+}
+for name, (check_pricer, check_dc, check_hc) in checks.items():
+    batched = SensitivityEngine(check_pricer, check_dc, check_hc)
+    looped = SensitivityEngine(check_pricer, check_dc, check_hc, batched=False)
+    kr_batched, kr_looped = (e.compute_key_rate_sensitivities(tenors=[1, 3, 5]) for e in (batched, looped))
+    pv01_batched, pv01_looped = batched.compute_pv01(), looped.compute_pv01()
+    diff = max([abs(kr_batched[t][k] - kr_looped[t][k]) for t in kr_batched for k in ("IR01", "CS01")]
+               + [abs(pv01_batched[k] - pv01_looped[k]) for k in ("IR01", "CS01")])
+    print(f"{name}: max |batched - unbatched| = {diff:.2e}")
+
 cs01_by_tenor = {tenor: sens.get("CS01", 0) for tenor, sens in kr_sens.items()}
 ir01_by_tenor = {tenor: sens.get("IR01", 0) for tenor, sens in kr_sens.items()}
 
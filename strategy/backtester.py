@@ -2,10 +2,12 @@ from typing import Callable, Dict, List
 from datetime import date
 from analytics.pnl_tracker import PnLTracker
 from analytics.curve_construction import build_discount_curve_from_yields, build_hazard_curve_from_spreads
+from analytics.curve_cache import CURVE_CACHE
 from copy import deepcopy
 
 class Backtester:
-    def __init__(self, pricer_class, market_data_provider, strategy_fn=None, fixed_kwargs=None):
+    def __init__(self, pricer_class, market_data_provider, strategy_fn=None, fixed_kwargs=None, curve_cache=CURVE_CACHE):
+        self.curve_cache = curve_cache
         self.strategy_fn = strategy_fn
         self.fixed_kwargs = fixed_kwargs or {}
         self.pricer_class = pricer_class
@@ -23,8 +25,9 @@ class Backtester:
             cds_spreads = self.market_data.get_cds_spreads(dt)
 
             # Build market curves
-            discount_curve_fn = build_discount_curve_from_yields(treasury_yields)
-            hazard_curve_fn = build_hazard_curve_from_spreads(cds_spreads, discount_curve_fn)
+            # Dates with unchanged quotes reuse the cached curves
+            discount_curve_fn = build_discount_curve_from_yields(treasury_yields, cache=self.curve_cache)
+            hazard_curve_fn = build_hazard_curve_from_spreads(cds_spreads, discount_curve_fn, cache=self.curve_cache)
 
             # Get strategy parameters
             if self.strategy_fn:
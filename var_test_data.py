@@ -0,0 +1,55 @@
+import numpy as np
+from data.market_data import ArrayMarketDataProvider
+from pricers.cds_pricer import CDSPricer
+from analytics.curve_construction import build_discount_curve_from_yields, build_hazard_curve_from_spreads
+
+# Synthetic market and book shared by the VaR tests
+
+ISSUERS = ["ACME", "GLOBEX"]
+
+
+def simulated_market(factors=False):
+    """
+    Two years of simulated yields (decimal) and CDS spreads (bps) for two
+    issuers. With factors=True the curves are driven by level, slope and
+    curvature moves plus noise instead of one random walk per tenor.
+
+    Returns: ArrayMarketDataProvider
+    """
+    rng = np.random.default_rng(42)
+    dates = np.datetime64("2023-01-02") + np.arange(501)
+    yield_tenors = np.array([0.25, 1, 2, 5, 10, 30])
+    spread_tenors = np.array([1, 3, 5, 7, 10])
+    if not factors:
+        yields = 0.04 + np.linspace(0, 0.01, 6) + np.cumsum(rng.normal(0, 0.0005, (501, 6)), axis=0)
+        levels = np.exp(np.cumsum(rng.normal(0, 0.01, (501, 2)), axis=0))
+        tilts, slope = np.zeros((501, 2)), 0.0
+    else:
+        shapes = np.array([np.ones(6), np.log1p(yield_tenors) / np.log(31), np.exp(-((yield_tenors - 5) / 4) ** 2)])
+        yield_factors = np.cumsum(rng.normal(0, [0.0006, 0.0003, 0.0002], (501, 3)), axis=0)
+        yields = (0.04 + np.linspace(0, 0.01, 6) + yield_factors @ shapes
+                  + np.cumsum(rng.normal(0, 0.00005, (501, 6)), axis=0))
+        levels = np.exp(np.cumsum(rng.normal(0, 0.01, (501, 2)), axis=0))
+        tilts = np.cumsum(rng.normal(0, 0.003, (501, 2)), axis=0)
+        slope = np.linspace(-1, 1, 5)
+    spreads = np.stack([100 * levels[:, 0:1] * (np.linspace(1, 1.6, 5) + tilts[:, 0:1] * slope),
+                        250 * levels[:, 1:2] * (np.linspace(1, 1.4, 5) + tilts[:, 1:2] * slope)], axis=1)
+    return ArrayMarketDataProvider(dates, yield_tenors, yields, spread_tenors, spreads, issuers=ISSUERS)
+
+
+def cds_positions(market_data):
+    """
+    3Y, 5Y and 7Y CDS on each issuer, priced off the last date's curves.
+
+    Returns: (discount curve, positions, issuers, names)
+    """
+    date = market_data.dates[-1]
+    dc = build_discount_curve_from_yields(market_data.get_treasury_yields(date))
+    positions, issuers = [], []
+    for issuer in ISSUERS:
+        hc = build_hazard_curve_from_spreads(market_data.get_cds_spreads(date, issuer), dc)
+        for maturity, notional in ((3, 1e7), (5, -5e6), (7, 2e7)):
+            positions.append(CDSPricer(notional, maturity, 100, 0.4, dc, hc))
+            issuers.append(issuer)
+    names = [f"{issuer} {p.maturity}Y" for issuer, p in zip(issuers, positions)]
+    return dc, positions, issuers, names